@@ -0,0 +1,64 @@
+# ruff: noqa: T201
+"""Benchmark sequential vs concurrent favorite page fetching.
+
+The radio emulator answers every request with a fixed latency. Run with::
+
+    python benchmarks/favorites_fetch.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from py_skytune.emulator import Emulator, EmulatorConfig
+from py_skytune.radio import Radio
+
+
+def run(total: int, latency: float, concurrency: int) -> float:
+    """Time a full favorites listing.
+
+    Args:
+        total: The number of favorites.
+        latency: The per-request latency in seconds.
+        concurrency: The page fetch concurrency.
+
+    Returns:
+        The elapsed time in seconds.
+    """
+    config = EmulatorConfig(favorites=total, capacity=max(total, 200), latency=latency)
+    with Emulator(config=config) as emulator:
+        radio = Radio(max_concurrency=concurrency, catalog_ttl=None)
+        radio.base_url = f"http://{emulator.ip_address}/"
+        # load the catalog first, only the listing is timed
+        _locations = radio.locations
+        start = time.perf_counter()
+        favorites = radio.favorites
+        elapsed = time.perf_counter() - start
+    if len(favorites) != total:
+        msg = f"Expected {total} favorites, got {len(favorites)}"
+        raise RuntimeError(msg)
+    return elapsed
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--counts", type=int, nargs="+", default=[50, 100, 200])
+    parser.add_argument("--latencies", type=float, nargs="+", default=[0.05, 0.15, 0.4])
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    print(f"{'favorites':>10} {'latency':>8} {'sequential':>11} {'concurrent':>11} {'speedup':>8}")
+    for total in args.counts:
+        for latency in args.latencies:
+            sequential = run(total, latency, 1)
+            concurrent = run(total, latency, args.concurrency)
+            print(
+                f"{total:>10} {latency:>8.2f} {sequential:>10.2f}s {concurrent:>10.2f}s"
+                f" {sequential / concurrent:>7.1f}x",
+            )
+
+
+if __name__ == "__main__":
+    main()
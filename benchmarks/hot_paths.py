@@ -0,0 +1,318 @@
+# ruff: noqa: T201
+"""Benchmark the client's hot paths and report machine-readable results.
+
+Run with::
+
+    python benchmarks/hot_paths.py --output bench.json
+    python benchmarks/hot_paths.py --compare bench.json
+
+With --compare the run exits non-zero when any benchmark's best time is
+slower than the baseline by more than --threshold.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+import timeit
+
+from pathlib import Path
+from typing import Callable
+
+from parse_favorites import CATALOG, synthetic_page
+
+from py_skytune.base import RadioBase
+from py_skytune.emulator import Emulator, EmulatorConfig, catalog_text
+from py_skytune.favorites import Favorite
+from py_skytune.plan import plan_moves
+from py_skytune.radio import Radio
+from py_skytune.resolver import GenreResolver, LocationResolver
+
+
+def measure(name: str, func: Callable[[], object], repeat: int, **params: object) -> dict:
+    """Time a callable.
+
+    The number of calls per round is picked so a round takes at least 20ms.
+
+    Args:
+        name: The benchmark name.
+        func: The callable.
+        repeat: The number of rounds.
+        **params: The benchmark parameters, recorded with the result.
+
+    Returns:
+        The result, times are seconds per call.
+    """
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    number = max(1, number // 10)
+    rounds = [elapsed / number for elapsed in timer.repeat(repeat=repeat, number=number)]
+    return {
+        "name": name,
+        "params": params,
+        "min": min(rounds),
+        "median": statistics.median(rounds),
+        "mean": statistics.fmean(rounds),
+        "rounds": repeat,
+        "calls_per_round": number,
+    }
+
+
+def loaded_radio(catalog: str) -> RadioBase:
+    """Get a radio with the catalog loaded.
+
+    Args:
+        catalog: The get_CG.php payload.
+
+    Returns:
+        The radio.
+    """
+    radio = RadioBase()
+    radio._load_catalog(catalog)
+    return radio
+
+
+def bench_parse(repeat: int) -> list[dict]:
+    """Benchmark favList.php parsing."""
+    radio = loaded_radio(CATALOG)
+    results = []
+    for count in (10, 100, 1000):
+        page = synthetic_page(count)
+        results.append(
+            measure(
+                "parse_favorite_page",
+                lambda p=page: radio._parse_favorite_page(p),
+                repeat,
+                favorites=count,
+            ),
+        )
+    return results
+
+
+def bench_catalog(repeat: int) -> list[dict]:
+    """Benchmark loading the location and genre catalog."""
+    text = catalog_text().replace("];", "]").replace("'", '"')
+    locations_str, genres_str = text.split("mGenreList = ")
+
+    def load_locations() -> None:
+        RadioBase()._load_locations(locations_str)
+
+    def load_genres() -> None:
+        RadioBase()._load_genres(genres_str)
+
+    return [
+        measure("load_locations", load_locations, repeat),
+        measure("load_genres", load_genres, repeat),
+    ]
+
+
+def bench_lookups(repeat: int) -> list[dict]:
+    """Benchmark Genres and Locations lookups."""
+    radio = loaded_radio(catalog_text())
+    locations = [
+        entry
+        for region in radio._locations.regions
+        for country in region.countries
+        for entry in (country, *country.states_provinces)
+    ]
+    genres = [entry for genre in radio._genres.genres for entry in (genre, *genre.subgenres)]
+
+    def locations_by_uid() -> None:
+        for entry in locations:
+            radio._locations.find_by_uid(entry.uid)
+
+    def locations_by_name() -> None:
+        for entry in locations:
+            radio._locations.find_by_name(entry.name)
+
+    def genres_by_uid() -> None:
+        for entry in genres:
+            radio._genres.find_by_uid(entry.uid)
+
+    def genres_by_name() -> None:
+        for entry in genres:
+            radio._genres.find_by_name(entry.name)
+
+    return [
+        measure("locations_find_by_uid", locations_by_uid, repeat, lookups=len(locations)),
+        measure("locations_find_by_name", locations_by_name, repeat, lookups=len(locations)),
+        measure("genres_find_by_uid", genres_by_uid, repeat, lookups=len(genres)),
+        measure("genres_find_by_name", genres_by_name, repeat, lookups=len(genres)),
+    ]
+
+
+def bench_resolver(repeat: int) -> list[dict]:
+    """Benchmark mapping RadioBrowser stations to locations and genres."""
+    radio = loaded_radio(catalog_text())
+    with Emulator(config=EmulatorConfig(favorites=0, stations=5000, seed=0)) as emulator:
+        stations = list(emulator.stations.values())
+
+    def build() -> None:
+        LocationResolver(radio._locations)
+
+    def resolve_cold() -> None:
+        LocationResolver(radio._locations).resolve_many(stations)
+
+    def resolve_genres_cold() -> None:
+        GenreResolver(radio._genres).resolve_many(stations)
+
+    return [
+        measure("resolver_build", build, repeat),
+        measure("resolve_locations", resolve_cold, repeat, stations=len(stations)),
+        measure("resolve_genres", resolve_genres_cold, repeat, stations=len(stations)),
+    ]
+
+
+def make_favorites(count: int) -> list[Favorite]:
+    """Build favorites with distinct names.
+
+    Args:
+        count: The number of favorites.
+
+    Returns:
+        The favorites, numbered in order.
+    """
+    return [
+        Favorite(
+            name=f"Station {idx:04d}",
+            url=f"http://stream.example.com/{idx}",
+            skytune_maintained=False,
+            location="Switzerland",
+            genre="Various",
+            uid=idx + 1,
+        )
+        for idx in range(count)
+    ]
+
+
+def bench_sort_plan(repeat: int) -> list[dict]:
+    """Benchmark sort_favorites move planning."""
+    rng = random.Random(0)
+    results = []
+    for count in (200, 1000):
+        shuffled = make_favorites(count)
+        rng.shuffle(shuffled)
+        nearly_sorted = make_favorites(count)
+        for _ in range(count // 20):
+            nearly_sorted.insert(rng.randrange(count), nearly_sorted.pop(rng.randrange(count)))
+        for order, favorites in (("shuffled", shuffled), ("nearly_sorted", nearly_sorted)):
+            results.append(
+                measure(
+                    "plan_sort",
+                    lambda f=favorites: plan_moves(f, sorted(f, key=lambda fav: fav.name.lower())),
+                    repeat,
+                    favorites=count,
+                    order=order,
+                ),
+            )
+    return results
+
+
+def bench_serialization(repeat: int) -> list[dict]:
+    """Benchmark favorites export and import file handling."""
+    radio = Radio(catalog_ttl=None)
+    radio._favorites = make_favorites(200)
+    exported = radio.export_favorites()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "favorites.json"
+        path.write_text(exported, encoding="utf-8")
+
+        def read() -> None:
+            [Favorite(**fav) for fav in radio._read_favorites_file(str(path))]
+
+        return [
+            measure("export_favorites", radio.export_favorites, repeat, favorites=200),
+            measure("import_favorites_read", read, repeat, favorites=200),
+        ]
+
+
+BENCHMARKS = {
+    "parse": bench_parse,
+    "catalog": bench_catalog,
+    "lookups": bench_lookups,
+    "resolver": bench_resolver,
+    "sort_plan": bench_sort_plan,
+    "serialization": bench_serialization,
+}
+
+
+def key(result: dict) -> str:
+    """Get the identity of a result for comparisons.
+
+    Args:
+        result: The result.
+
+    Returns:
+        The name and sorted parameters.
+    """
+    return json.dumps([result["name"], result["params"]], sort_keys=True)
+
+
+def compare(results: list[dict], baseline_file: str, threshold: float) -> list[str]:
+    """Compare results with a baseline run.
+
+    Args:
+        results: This run's results.
+        baseline_file: The baseline JSON file.
+        threshold: The allowed slowdown ratio.
+
+    Returns:
+        A description of every regression.
+    """
+    baseline = {
+        key(result): result
+        for result in json.loads(Path(baseline_file).read_text(encoding="utf-8"))["results"]
+    }
+    regressions = []
+    for result in results:
+        before = baseline.get(key(result))
+        if before is None:
+            continue
+        ratio = result["min"] / before["min"]
+        if ratio > threshold:
+            regressions.append(f"{result['name']} {result['params']}: {ratio:.2f}x slower")
+    return regressions
+
+
+def main() -> None:
+    """Run the benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), default=list(BENCHMARKS))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="Write the results to a JSON file")
+    parser.add_argument("--compare", help="A baseline JSON file to check for regressions")
+    parser.add_argument("--threshold", type=float, default=1.25)
+    args = parser.parse_args()
+
+    results = []
+    for name in args.only:
+        results.extend(BENCHMARKS[name](args.repeat))
+    report = {
+        "timestamp": time.time(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+    output = json.dumps(report, indent=4)
+    if args.output:
+        Path(args.output).write_text(output, encoding="utf-8")
+    else:
+        print(output)
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.threshold)
+        for regression in regressions:
+            print(regression, file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
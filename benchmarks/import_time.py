@@ -0,0 +1,128 @@
+# ruff: noqa: T201
+"""Check the CLI's import time against a startup budget.
+
+Each scenario imports what one kind of CLI run needs in a fresh interpreter
+with ``python -X importtime``, best of --repeat runs. The run exits non-zero
+when a scenario loads a module it should not, such as tkinter for
+``skytune play``, or when the play scenario is over --budget milliseconds.
+Run with::
+
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --budget 150 --top 15
+"""
+
+from __future__ import annotations
+
+import argparse
+import subprocess
+import sys
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """The imports of one kind of CLI run."""
+
+    name: str
+    modules: tuple[str, ...]
+    forbidden: frozenset[str]
+
+
+SCENARIOS = (
+    # argument parsing, usage errors and commands sent to a running daemon
+    Scenario("cli", ("py_skytune.cli",), frozenset({"tkinter", "requests", "pyradios", "httpx"})),
+    # every command talking to the radio, such as play and favorites
+    Scenario(
+        "play",
+        ("py_skytune.cli", "py_skytune.radio"),
+        frozenset({"tkinter", "pyradios", "httpx"}),
+    ),
+    # the UI, for reference
+    Scenario("ui", ("py_skytune.cli", "py_skytune.ui"), frozenset()),
+)
+BUDGETED = "play"
+
+
+@dataclass
+class Run:
+    """The imports of one interpreter."""
+
+    # module: (self, cumulative) microseconds
+    times: dict[str, tuple[int, int]]
+    # the modules imported directly, not by another module
+    top_level: list[str]
+
+    def total(self: Run, startup: set[str]) -> int:
+        """Get the microseconds spent importing, without the interpreter startup.
+
+        Args:
+            startup: The top level modules of an empty run.
+
+        Returns:
+            The microseconds.
+        """
+        return sum(self.times[name][1] for name in self.top_level if name not in startup)
+
+
+def import_times(modules: tuple[str, ...]) -> Run:
+    """Import modules in a fresh interpreter.
+
+    Args:
+        modules: The modules to import.
+
+    Returns:
+        The run.
+    """
+    code = "; ".join(f"import {module}" for module in modules) or "pass"
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    run = Run(times={}, top_level=[])
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, cumulative, name = line.removeprefix("import time:").split("|")
+        # nested imports are indented by two spaces per level
+        if not name[1:].startswith(" "):
+            run.top_level.append(name.strip())
+        run.times[name.strip()] = (int(own), int(cumulative))
+    return run
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=175.0, help="Milliseconds for play")
+    parser.add_argument("--top", type=int, default=10, help="Slowest imports to list")
+    args = parser.parse_args()
+
+    startup = set(import_times(()).top_level)
+    failures = []
+    for scenario in SCENARIOS:
+        runs = [import_times(scenario.modules) for _ in range(args.repeat)]
+        totals = [run.total(startup) for run in runs]
+        best = runs[totals.index(min(totals))].times
+        total = min(totals) / 1000
+        print(f"{scenario.name:<8} {total:>8.1f} ms  {len(best)} modules")
+        slowest = sorted(best.items(), key=lambda item: item[1][0], reverse=True)
+        for name, (own, _cumulative) in slowest[: args.top]:
+            print(f"{'':<8} {own / 1000:>8.1f} ms  {name}")
+        loaded = sorted(name for name in scenario.forbidden if name in best)
+        if loaded:
+            failures.append(f"{scenario.name} loads {', '.join(loaded)}")
+        if scenario.name == BUDGETED and total > args.budget:
+            failures.append(f"{scenario.name} takes {total:.1f} ms, over {args.budget:.0f} ms")
+
+    for failure in failures:
+        print(failure, file=sys.stderr)
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+# ruff: noqa: T201
+"""Measure the memory of many radios holding large favorite lists.
+
+Every radio loads the emulator's catalog and imports its favorites from an
+exported JSON file, so each location and genre name starts out as a fresh
+copy. The slotted, interned classes are compared with plain dataclasses of
+the same fields. Run with::
+
+    python benchmarks/memory.py --radios 10 --favorites 1000
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import random
+import sys
+import tracemalloc
+
+from dataclasses import fields, make_dataclass
+from typing import Callable
+
+from py_skytune.base import RadioBase
+from py_skytune.emulator import GENRES, REGIONS, catalog_text
+from py_skytune.favorites import Favorite
+from py_skytune.genre import Genre, SubGenre
+from py_skytune.locations import Country, Region, StateProvince
+
+
+CLASSES = (Favorite, Region, Country, StateProvince, Genre, SubGenre)
+
+
+def plain(cls: type) -> type:
+    """Build a plain dataclass with the fields of a slotted one.
+
+    Args:
+        cls: The slotted dataclass.
+
+    Returns:
+        The same fields, with a per-instance __dict__.
+    """
+    return make_dataclass(f"Plain{cls.__name__}", [(f.name, f.type) for f in fields(cls)])
+
+
+def exported(count: int, seed: int) -> str:
+    """Build an exported favorites file.
+
+    Args:
+        count: The number of favorites.
+        seed: The random seed.
+
+    Returns:
+        The JSON export.
+    """
+    rng = random.Random(seed)
+    locations = [country for countries in REGIONS.values() for country in countries]
+    genres = [sub for subs in GENRES.values() for sub in subs]
+    return json.dumps(
+        [
+            {
+                "name": f"Station {idx:05d}",
+                "url": f"http://stream.example.com/{seed}/{idx}",
+                "skytune_maintained": False,
+                "location": rng.choice(locations),
+                "genre": rng.choice(genres),
+            }
+            for idx in range(count)
+        ],
+    )
+
+
+def traced(build: Callable[[], object]) -> int:
+    """Measure the memory held by what a callable builds.
+
+    Args:
+        build: Builds the objects, which are kept alive while measuring.
+
+    Returns:
+        The allocated bytes still held.
+    """
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    kept = build()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    held = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    del kept
+    return held
+
+
+def instance_size(obj: object) -> int:
+    """Get the size of an instance and its __dict__, not of the field values.
+
+    Args:
+        obj: The instance.
+
+    Returns:
+        The size in bytes.
+    """
+    size = sys.getsizeof(obj)
+    if hasattr(obj, "__dict__"):
+        size += sys.getsizeof(obj.__dict__)
+    return size
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--radios", type=int, default=10)
+    parser.add_argument("--favorites", type=int, default=1000)
+    args = parser.parse_args()
+
+    catalog = catalog_text()
+    exports = [exported(args.favorites, seed) for seed in range(args.radios)]
+    plain_favorite = plain(Favorite)
+
+    def radios() -> list[RadioBase]:
+        loaded = []
+        for export in exports:
+            radio = RadioBase()
+            radio._load_catalog(catalog)
+            radio._favorites = [Favorite(**fav) for fav in json.loads(export)]
+            loaded.append(radio)
+        return loaded
+
+    def catalogs() -> list[RadioBase]:
+        loaded = []
+        for _export in exports:
+            radio = RadioBase()
+            radio._load_catalog(catalog)
+            loaded.append(radio)
+        return loaded
+
+    def plain_favorites() -> list[list[object]]:
+        return [[plain_favorite(**fav, uid=-1) for fav in json.loads(export)] for export in exports]
+
+    total = args.radios * args.favorites
+    catalog_bytes = traced(catalogs)
+    radio_bytes = traced(radios)
+    favorite_bytes = radio_bytes - catalog_bytes
+    plain_bytes = traced(plain_favorites)
+    print(f"{args.radios} radios, {total} favorites")
+    print(f"{'catalogs':<22} {catalog_bytes / 1024:>10.0f} KiB")
+    print(
+        f"{'favorites':<22} {favorite_bytes / 1024:>10.0f} KiB"
+        f" {favorite_bytes / total:>8.0f} B/favorite",
+    )
+    print(
+        f"{'plain favorites':<22} {plain_bytes / 1024:>10.0f} KiB"
+        f" {plain_bytes / total:>8.0f} B/favorite",
+    )
+    print(f"{'saved':<22} {(plain_bytes - favorite_bytes) / 1024:>10.0f} KiB")
+
+    # accessing __dict__ materializes it, the plain column is an upper bound
+    print(f"\n{'instance':<16} {'slotted':>8} {'plain':>8}")
+    radio = RadioBase()
+    radio._load_catalog(catalog)
+    country = radio._locations.regions[-1].countries[0]
+    genre = radio._genres.genres[0]
+    samples = {
+        Favorite: Favorite(
+            name="name",
+            url="url",
+            skytune_maintained=False,
+            location="location",
+            genre="genre",
+        ),
+        Region: country.region,
+        Country: country,
+        StateProvince: next(
+            state
+            for region in radio._locations.regions
+            for country in region.countries
+            for state in country.states_provinces
+        ),
+        Genre: genre,
+        SubGenre: genre.subgenres[0],
+    }
+    for cls in CLASSES:
+        sample = samples[cls]
+        copy = plain(cls)(**{f.name: getattr(sample, f.name) for f in fields(cls)})
+        print(f"{cls.__name__:<16} {instance_size(sample):>7}B {instance_size(copy):>7}B")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# ruff: noqa: T201
+"""Benchmark the single-pass favList.php parser against the line parser.
+
+Both parsers run on synthetic pages with long station names and must
+return identical favorites. Run with::
+
+    python benchmarks/parse_favorites.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import timeit
+
+from py_skytune.base import RadioBase
+
+
+CATALOG = (
+    "mCountryList = [[0,-1,-1,-1,'All'],[1,1,-1,-1,'Europe'],[2,1,1,-1,'Switzerland'],"
+    "[3,1,2,-1,'United Kingdom'],[4,2,-1,-1,'North America'],[5,2,1,-1,'United States'],"
+    "[6,2,1,1,'Washington']];\n"
+    "mGenreList = [[1,-1,'Various'],[2,-1,'Pop'],[2,1,'Top 40'],[3,-1,'Holiday &amp; Seasonal']];\n"
+)
+LOCATIONS = ("1,1,-1", "1,2,-1", "2,1,-1", "2,1,1", "-1,-1,-1")
+GENRES = ("1,-1", "2,-1", "2,1", "3,-1", "-1,-1")
+
+
+def synthetic_page(count: int, seed: int = 0) -> str:
+    """Build a favList.php page.
+
+    Args:
+        count: The number of favorites on the page.
+        seed: The random seed.
+
+    Returns:
+        The page body.
+    """
+    rng = random.Random(seed)
+    lines = [
+        "var myFavChannelList = new Array();",
+        f"favListInfo = {{curPage:0, total:{count}, favCapacity:{count}, itemsPerPage:{count},"
+        f" chIndex:-1, rowIdx:-1, curPageCount:{count}}};",
+    ]
+    for idx in range(count):
+        words = " ".join(
+            rng.choice(("Radio", "FM", "Classic", "Hits", "&amp;", "(HD)", "100.3"))
+            for _ in range(rng.randint(3, 30))
+        )
+        lines.append(
+            f'myFavChannelList.push(["{words} {idx}","http://stream{idx}.example.com/live?'
+            f'mount=high&amp;codec=aac",{rng.randint(0, 1)},'
+            f"[[{rng.choice(LOCATIONS)}],[{rng.choice(GENRES)}]]]);",
+        )
+    return "\n".join(lines) + "\n"
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--counts", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    radio = RadioBase()
+    radio._load_catalog(CATALOG)
+
+    print(f"{'favorites':>10} {'lines':>10} {'single pass':>12} {'speedup':>8}")
+    for count in args.counts:
+        page = synthetic_page(count)
+        if radio._parse_favorite_page(page) != radio._parse_favorite_page_lines(page):
+            msg = f"Parsers disagree on a {count} favorite page"
+            raise RuntimeError(msg)
+        lines = min(
+            timeit.repeat(
+                lambda page=page: radio._parse_favorite_page_lines(page),
+                number=1,
+                repeat=args.repeat,
+            ),
+        )
+        single = min(
+            timeit.repeat(
+                lambda page=page: radio._parse_favorite_page(page),
+                number=1,
+                repeat=args.repeat,
+            ),
+        )
+        print(
+            f"{count:>10} {lines * 1000:>8.2f}ms {single * 1000:>10.2f}ms"
+            f" {lines / single:>7.1f}x",
+        )
+
+
+if __name__ == "__main__":
+    main()
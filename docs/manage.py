@@ -26,8 +26,7 @@ stations = [
     "19823255-193f-11ea-a620-52543be04c81",  # Soma FM Jolly Ol' Soul
 ]
 
-for station in stations:
-    fav = radio.add_by_rb_uuid(station)
+for fav in radio.add_by_rb_uuids(stations):
     print(fav.uid, fav.name, fav.location, fav.genre, fav.url)
 
 radio.add_favorite(
@@ -0,0 +1,616 @@
+"""The asyncio radio."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import itertools
+import logging
+import math
+import time
+
+from collections import deque
+from typing import TYPE_CHECKING, Any, Callable
+
+import httpx
+
+from .base import RadioBase
+from .exceptions import RadioNotFoundError, RadioResponseError, SkytuneError
+from .favorites import Favorite
+from .stats import RequestEvent
+from .watch import NowPlaying, PollInterval
+
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator, AsyncIterator
+    from types import TracebackType
+
+    from .favorites import FavDetails
+    from .genre import Genres
+    from .locations import Locations
+    from .plan import MovePlan
+
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncRadio(RadioBase):
+    """The AsyncRadio class.
+
+    The asyncio counterpart of `Radio`, requests are coroutines on a shared
+    `httpx.AsyncClient` rather than threads.
+    """
+
+    def __init__(
+        self: AsyncRadio,
+        ip_address: str | None = None,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> None:
+        """Initialize the AsyncRadio class.
+
+        Args:
+            ip_address: The IP address of the radio.
+            **kwargs: Passed to `RadioBase`, such as max_concurrency or catalog_ttl.
+        """
+        super().__init__(ip_address=ip_address, **kwargs)
+        if ip_address:
+            self.base_url = f"http://{ip_address}/"
+        self.client = httpx.AsyncClient(
+            timeout=httpx.Timeout(
+                self.transport.read_timeout,
+                connect=self.transport.connect_timeout,
+            ),
+            limits=httpx.Limits(
+                max_connections=self.transport.pool_maxsize,
+                max_keepalive_connections=self.transport.pool_maxsize,
+                keepalive_expiry=self.transport.keepalive_expiry,
+            ),
+        )
+        self._catalog_lock = asyncio.Lock()
+        self.poll_interval = PollInterval()
+        self.now_playing: NowPlaying | None = None
+        self._watchers: set[asyncio.Queue[NowPlaying]] = set()
+        self._watch_task: asyncio.Task[None] | None = None
+        self._watch_wake = asyncio.Event()
+
+    async def __aenter__(self: AsyncRadio) -> AsyncRadio:
+        """Enter the async context."""
+        return self
+
+    async def __aexit__(
+        self: AsyncRadio,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Exit the async context."""
+        await self.aclose()
+
+    async def aclose(self: AsyncRadio) -> None:
+        """Stop watching and close the underlying client."""
+        if self._watch_task is not None:
+            self._watch_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._watch_task
+        await self.client.aclose()
+
+    async def _base_url(self: AsyncRadio) -> str:
+        """Get the base URL, discovering the radio if needed."""
+        if not hasattr(self, "base_url"):
+            found = await asyncio.to_thread(self.find)
+            if not found:
+                msg = "Could not find a radio"
+                raise RadioNotFoundError(msg)
+        return self.base_url
+
+    async def _send(
+        self: AsyncRadio,
+        method: str,
+        url: str,
+        attempt: int,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> tuple[httpx.Response | None, httpx.HTTPError | None, RequestEvent]:
+        """Send a single request attempt.
+
+        Args:
+            method: The HTTP method.
+            url: The URL, relative to the radio.
+            attempt: The attempt number, starting at 1.
+            **kwargs: Passed to the client.
+
+        Returns:
+            The response or the error, and the attempt's request event.
+        """
+        base_url = await self._base_url()
+        start = time.perf_counter()
+        try:
+            res = await self.client.request(method, f"{base_url}{url}", **kwargs)
+        except httpx.HTTPError as exc:
+            event = RequestEvent(
+                endpoint=url,
+                method=method,
+                elapsed=time.perf_counter() - start,
+                attempt=attempt,
+                error=type(exc).__name__,
+            )
+            return None, exc, event
+        event = RequestEvent(
+            endpoint=url,
+            method=method,
+            elapsed=time.perf_counter() - start,
+            status=res.status_code,
+            bytes_sent=len(str(res.request.url)) + len(res.request.content),
+            bytes_received=len(res.content),
+            attempt=attempt,
+            error=f"HTTP {res.status_code}" if res.is_error else None,
+        )
+        return res, None, event
+
+    def _retryable(
+        self: AsyncRadio,
+        res: httpx.Response | None,
+        exc: httpx.HTTPError | None,
+        idempotent: bool,
+    ) -> bool:
+        """Check whether a failed attempt may be retried.
+
+        Args:
+            res: The response, if any.
+            exc: The error, if any.
+            idempotent: Whether the request is read-only.
+
+        Returns:
+            Whether to retry.
+        """
+        if exc is None:
+            statuses = self.transport.retry_statuses
+            return idempotent and res is not None and res.status_code in statuses
+        if idempotent:
+            return isinstance(exc, httpx.TransportError)
+        return isinstance(exc, (httpx.ConnectError, httpx.ConnectTimeout))
+
+    async def _request(
+        self: AsyncRadio,
+        method: str,
+        url: str,
+        idempotent: bool = True,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> httpx.Response:
+        """Send a request, retrying failures as the transport allows.
+
+        Args:
+            method: The HTTP method.
+            url: The URL, relative to the radio.
+            idempotent: Whether the request is read-only and safe to resend.
+            **kwargs: Passed to the client.
+
+        Returns:
+            The response.
+
+        Raises:
+            RadioConnectionError: When the radio could not be reached.
+            RadioTimeoutError: When the radio did not answer in time.
+            RadioResponseError: When the radio answered with an HTTP error.
+        """
+        started = time.monotonic()
+        attempts = 0
+        while True:
+            attempts += 1
+            res, exc, event = await self._send(method, url, attempts, **kwargs)
+            delay = None
+            if event.error is not None and self._retryable(res, exc, idempotent):
+                delay = self.transport.retry_delay(attempts, started)
+            event.retrying = delay is not None
+            self.request_stats.record(event)
+            if delay is None:
+                break
+            logger.warning(
+                "%s %s failed (%s), retrying in %.2fs", method, url, event.error, delay,
+            )
+            await asyncio.sleep(delay)
+        # an attempt without a response failed with exc
+        if res is None:
+            raise self._give_up(
+                url,
+                attempts,
+                str(exc) or type(exc).__name__,
+                timeout=isinstance(exc, httpx.TimeoutException),
+                idempotent=idempotent,
+            ) from exc
+        if res.is_error:
+            if not idempotent:
+                self._favorites = None
+            msg = f"{url} returned HTTP {res.status_code}"
+            raise RadioResponseError(msg, url=url, status=res.status_code)
+        return res
+
+    async def _get(
+        self: AsyncRadio,
+        url: str,
+        params: dict,
+        idempotent: bool = True,
+    ) -> httpx.Response:
+        """Get the URL."""
+        return await self._request("GET", url, idempotent=idempotent, params=params)
+
+    async def _post(self: AsyncRadio, url: str, data: dict, params: dict) -> httpx.Response:
+        """Post the URL."""
+        return await self._request("POST", url, idempotent=False, data=data, params=params)
+
+    async def _load_locations_genres(self: AsyncRadio) -> None:
+        """Get the locations and genres once."""
+        async with self._catalog_lock:
+            if self._locations.regions or self._load_cached_catalog():
+                return
+            res = await self._get(url="php/get_CG.php", params={})
+            self._load_catalog(res.text)
+            self._store_catalog(res.text)
+
+    async def _parse_page(self: AsyncRadio, page: str) -> tuple[list[Favorite], FavDetails]:
+        """Parse a favorites page, refetching a cached catalog it does not match.
+
+        See `Radio._parse_page`.
+
+        Args:
+            page: The favList.php page.
+
+        Returns:
+            The favorites and the page details.
+        """
+        try:
+            return self._parse_favorite_page(page)
+        except ValueError:
+            if not self._catalog_cached:
+                raise
+        async with self._catalog_lock:
+            # another page may have refetched it already
+            if self._catalog_cached:
+                logger.warning("The cached catalog does not match the favorites, refetching")
+                res = await self._get(url="php/get_CG.php", params={})
+                self._reload_catalog(res.text)
+        return self._parse_favorite_page(page)
+
+    async def _get_favorite_page(self: AsyncRadio, page: int) -> list[Favorite]:
+        """Get a single page of favorites.
+
+        Args:
+            page: The page number.
+
+        Returns:
+            The favorites on the page.
+        """
+        logger.debug("Getting favorites: page %s", page)
+        res = await self._get(url="php/favList.php", params={"PG": page, "EX": 0})
+        favorites, _ = await self._parse_page(res.text)
+        return favorites
+
+    async def _get_favorites(self: AsyncRadio) -> None:
+        """Get the favorites."""
+        self._favorites = None
+        async for _favorite in self.iter_favorites():
+            pass
+
+    async def iter_favorites(self: AsyncRadio) -> AsyncGenerator[Favorite, None]:
+        """Iterate over the favorites as each page arrives.
+
+        Up to `max_concurrency` pages after the first are fetched ahead and
+        yielded in page order, breaking out early cancels the rest. The
+        favorites are cached once every page has been read.
+
+        Yields:
+            The favorites, in radio order.
+        """
+        if self._favorites is not None:
+            for favorite in self._favorites:
+                yield favorite
+            return
+        # closing this generator early closes the pages', cancelling their fetches now
+        pages = self._iter_pages(*await self._get_first_page())
+        async with contextlib.aclosing(pages):
+            async for favorite in pages:
+                yield favorite
+
+    async def _get_first_page(self: AsyncRadio) -> tuple[list[Favorite], FavDetails]:
+        """Get page 0, which carries the favorites details.
+
+        Returns:
+            The favorites on the page and the details.
+        """
+        await self._load_locations_genres()
+        logger.debug("Getting favorites: page %s", "0")
+        res = await self._get(url="php/favList.php", params={"PG": 0, "EX": 0})
+        return await self._parse_page(res.text)
+
+    async def _iter_pages(
+        self: AsyncRadio,
+        favorites: list[Favorite],
+        fav_details: FavDetails,
+    ) -> AsyncGenerator[Favorite, None]:
+        """Iterate over page 0 and fetch the other pages, see `iter_favorites`.
+
+        Args:
+            favorites: The favorites on page 0.
+            fav_details: The page 0 details.
+
+        Yields:
+            The favorites, in radio order.
+        """
+        collected: list[Favorite] = []
+        for favorite in favorites:
+            collected.append(favorite)
+            favorite.uid = len(collected)
+            yield favorite
+        if len(favorites) < fav_details.total:
+            total_pages = math.ceil(fav_details.total / fav_details.items_per_page)
+            pages = iter(range(1, total_pages))
+            workers = max(1, self.max_concurrency)
+            pending = deque(
+                asyncio.ensure_future(self._get_favorite_page(page))
+                for page in itertools.islice(pages, workers)
+            )
+            try:
+                while pending:
+                    page_favorites = await pending.popleft()
+                    next_page = next(pages, None)
+                    if next_page is not None:
+                        pending.append(asyncio.ensure_future(self._get_favorite_page(next_page)))
+                    for favorite in page_favorites:
+                        collected.append(favorite)
+                        favorite.uid = len(collected)
+                        yield favorite
+            finally:
+                for task in pending:
+                    task.cancel()
+                # let the cancelled pages finish, so none is destroyed pending
+                await asyncio.gather(*pending, return_exceptions=True)
+        self._cache_favorites(collected, fav_details)
+
+    async def _verify(self: AsyncRadio, index: int | None) -> None:
+        """Refetch the page a change touched when verification is on.
+
+        Args:
+            index: The first index the change touched.
+        """
+        page = self._page_of(index)
+        if page is not None:
+            self._check_page(page, await self._get_favorite_page(page))
+
+    async def add_favorite(
+        self: AsyncRadio,
+        name: str,
+        url: str,
+        location: str,
+        genre: str,
+        refresh: bool = True,
+    ) -> Favorite | None:
+        """Add a channel.
+
+        Args:
+            name: The name of the channel.
+            url: The URL of the channel.
+            location: The location of the channel.
+            genre: The genre of the channel.
+            refresh: Whether to load the favorites when they are not cached yet.
+
+        Returns:
+            The new or updated favorite, None when it is not in the favorites after the add.
+        """
+        await self._load_locations_genres()
+        _location = self._locations.find_by_name(location)
+        _genre = self._genres.find_by_name(genre)
+        data = {
+            "EX": 0,
+            "chName": name,
+            "chUrl": url,
+            "chCountry": f"{_location.uid[0]};{_location.uid[1]};{_location.uid[2]}",
+            "chGenre": f"{_genre.uid[0]};{_genre.uid[1]}",
+        }
+        _res = await self._post(url="addCh.cgi", data=data, params={})
+        if self._favorites is not None:
+            favorite = Favorite(
+                name=name,
+                url=url,
+                skytune_maintained=False,
+                location=_location.name,
+                genre=_genre.name,
+            )
+            index = self._apply_add(favorite)
+            if index is not None:
+                await self._verify(index)
+                return favorite
+        if refresh:
+            favorites = await self.favorites()
+            try:
+                return next(fav for fav in favorites if fav.name == name and fav.url == url)
+            except StopIteration:
+                logger.exception("Could not find favorite: %s %s", name, url)
+                return None
+        return None
+
+    async def delete_favorite(
+        self: AsyncRadio,
+        favorite_id: int,
+        refresh: bool = True,
+    ) -> list[Favorite]:
+        """Delete a channel.
+
+        Args:
+            favorite_id: The favorite to delete.
+            refresh: Whether to load the favorites when they are not cached yet.
+
+        Returns:
+            The favorites.
+        """
+        _res = await self._get(
+            url="delCh.cgi",
+            params={"CI": favorite_id - 1},
+            idempotent=False,
+        )
+        await self._verify(self._apply_delete(favorite_id))
+        self._poke_watch()
+        if not refresh and self._favorites is None:
+            return []
+        return await self.favorites()
+
+    async def play_favorite(self: AsyncRadio, favorite_id: int) -> dict[str, str]:
+        """Play a favorite.
+
+        Args:
+            favorite_id: The favorite to play.
+
+        Returns:
+            The currently playing details.
+        """
+        _res = await self._get(url="doApi.cgi", params={"AI": 16, "CI": favorite_id - 1})
+        self._poke_watch()
+        return await self.playing()
+
+    async def plan_sort(self: AsyncRadio, reverse: bool = False) -> MovePlan:
+        """Plan a sort of the favorites without moving anything.
+
+        Args:
+            reverse: Whether to sort in descending order.
+
+        Returns:
+            The moves a sort would send.
+        """
+        return self._sort_plan(await self.favorites(), reverse=reverse)
+
+    async def sort_favorites(
+        self: AsyncRadio,
+        reverse: bool = False,
+        callback: Callable[[str], None] | None = None,
+    ) -> list[Favorite]:
+        """Sort the favorites.
+
+        Args:
+            reverse: Whether to sort in descending order.
+            callback: Called with a status message for every move.
+
+        Returns:
+            The sorted favorites.
+        """
+        plan = await self.plan_sort(reverse=reverse)
+        for move in plan.moves:
+            status = str(move)
+            if callback is not None:
+                callback(status)
+            logger.debug(status)
+            await self._post(url="moveCh.cgi", data={}, params=move.params)
+            await self._verify(self._apply_move(move.source, move.destination))
+        return await self.favorites()
+
+    async def check_favorites(self: AsyncRadio) -> bool:
+        """Check the cached favorites against page 0, in one request.
+
+        The other pages are only refetched when page 0 shows a change, see
+        `_favorites_current`.
+
+        Returns:
+            Whether the cache was current, False when it was refetched or empty.
+        """
+        if self._favorites is None:
+            await self._get_favorites()
+            return False
+        page, details = await self._get_first_page()
+        if self._favorites_current(page, details):
+            return True
+        self._favorites = None
+        async for _favorite in self._iter_pages(page, details):
+            pass
+        return False
+
+    async def favorites(self: AsyncRadio, max_age: float | None = None) -> list[Favorite]:
+        """Get the favorites, checking the cache when it is older than `max_age`.
+
+        Args:
+            max_age: Seconds since the last fetch or check, None trusts the cache forever.
+
+        Returns:
+            The favorites.
+        """
+        if self._favorites_stale(max_age):
+            await self.check_favorites()
+        if self._favorites is None:
+            await self._get_favorites()
+        if self._favorites is None:
+            msg = "Could not get favorites"
+            raise ValueError(msg)
+        return self._favorites
+
+    async def genres(self: AsyncRadio) -> Genres:
+        """Get the genres.
+
+        Returns:
+            The genres.
+        """
+        await self._load_locations_genres()
+        return self._genres
+
+    async def locations(self: AsyncRadio) -> Locations:
+        """Get the locations.
+
+        Returns:
+            The locations.
+        """
+        await self._load_locations_genres()
+        return self._locations
+
+    def _poke_watch(self: AsyncRadio) -> None:
+        """Poll the now playing status now and fast again, when watched."""
+        self.poll_interval.reset()
+        self._watch_wake.set()
+
+    async def _watch(self: AsyncRadio) -> None:
+        """Poll the now playing status for the watchers, see `watch_playing`."""
+        while True:
+            self._watch_wake.clear()
+            try:
+                playing = NowPlaying.from_json(await self.playing())
+            except (SkytuneError, ValueError) as exc:
+                logger.warning("Could not get now playing: %s", exc)
+                self.poll_interval.slow_down()
+            else:
+                if playing == self.now_playing:
+                    self.poll_interval.slow_down()
+                else:
+                    self.now_playing = playing
+                    self.poll_interval.reset()
+                    for changes in self._watchers:
+                        changes.put_nowait(playing)
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._watch_wake.wait(), self.poll_interval.current)
+
+    async def watch_playing(self: AsyncRadio) -> AsyncIterator[NowPlaying]:
+        """Iterate over the now playing changes.
+
+        However many iterators are open, the radio is polled by one task, at
+        the adaptive `poll_interval`. The task stops with the last iterator.
+
+        Yields:
+            The current status first when known, then every change of the
+            status or the name.
+        """
+        changes: asyncio.Queue[NowPlaying] = asyncio.Queue()
+        self._watchers.add(changes)
+        if self._watch_task is None or self._watch_task.done():
+            self._watch_task = asyncio.create_task(self._watch())
+        try:
+            if self.now_playing is not None:
+                yield self.now_playing
+            while True:
+                yield await changes.get()
+        finally:
+            self._watchers.discard(changes)
+            if not self._watchers and self._watch_task is not None:
+                self._watch_task.cancel()
+                self._watch_task = None
+
+    async def playing(self: AsyncRadio) -> dict[str, str]:
+        """Get the currently playing favorite.
+
+        Returns:
+            The currently playing details.
+        """
+        res = await self._get(url="php/playing.php", params={})
+        return res.json()
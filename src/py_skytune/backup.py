@@ -0,0 +1,282 @@
+"""Read and write exported favorites files, one favorite at a time."""
+
+from __future__ import annotations
+
+import contextlib
+import csv
+import itertools
+import json
+import sys
+import textwrap
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from typing import TextIO
+
+    from .favorites import Favorite
+
+
+FIELDS = ("name", "url", "skytune_maintained", "location", "genre")
+FORMATS = ("json", "ndjson", "csv")
+SUFFIXES = {".json": "json", ".ndjson": "ndjson", ".jsonl": "ndjson", ".csv": "csv"}
+STDIO = "-"
+TRUE = frozenset({"1", "true", "yes"})
+FALSE = frozenset({"", "0", "false", "no"})
+
+
+@dataclass(frozen=True, slots=True)
+class RowError:
+    """A favorite that could not be read or imported."""
+
+    line: int
+    message: str
+
+    def __str__(self: RowError) -> str:
+        """Return the string representation."""
+        return f"line {self.line}: {self.message}"
+
+
+@dataclass(slots=True)
+class ImportReport:
+    """The outcome of an import."""
+
+    added: int = 0
+    skipped: int = 0
+    errors: list[RowError] = field(default_factory=list)
+
+    def __str__(self: ImportReport) -> str:
+        """Return the string representation."""
+        return f"{self.added} added, {self.skipped} skipped, {len(self.errors)} failed"
+
+
+def format_for(path: str) -> str | None:
+    """Get the format of a favorites file from its suffix.
+
+    Args:
+        path: The file path.
+
+    Returns:
+        The format, or None when the suffix is unknown or the path is "-".
+    """
+    if path == STDIO:
+        return None
+    return SUFFIXES.get(Path(path).suffix.lower())
+
+
+def check_format(serialization: str) -> None:
+    """Check a format is supported.
+
+    Args:
+        serialization: The format.
+
+    Raises:
+        RuntimeError: When it is not.
+    """
+    if serialization not in FORMATS:
+        msg = f"Unsupported format: {serialization}"
+        raise RuntimeError(msg)
+
+
+@contextlib.contextmanager
+def open_favorites(path: str, mode: str = "r") -> Iterator[TextIO]:
+    """Open a favorites file, "-" is stdin or stdout and is left open.
+
+    Args:
+        path: The file path.
+        mode: "r" or "w".
+
+    Yields:
+        The text stream.
+
+    Raises:
+        RuntimeError: When reading a file that does not exist.
+    """
+    if path == STDIO:
+        yield sys.stdin if mode == "r" else sys.stdout
+        return
+    file = Path(path)
+    if mode == "r" and not file.exists():
+        msg = f"File does not exist: {path}"
+        raise RuntimeError(msg)
+    # csv handles the line endings itself
+    with file.open("w" if mode == "w" else "r", encoding="utf-8", newline="") as stream:
+        yield stream
+
+
+def write_favorites(
+    favorites: Iterable[Favorite],
+    stream: TextIO,
+    serialization: str = "ndjson",
+) -> int:
+    """Write favorites to a stream as they arrive.
+
+    The JSON format is the indented list `export_favorites` always wrote;
+    NDJSON writes one object per line and CSV a header and one row per favorite.
+
+    Args:
+        favorites: The favorites.
+        stream: The text stream.
+        serialization: One of `FORMATS`.
+
+    Returns:
+        The number of favorites written.
+    """
+    check_format(serialization)
+    count = 0
+    if serialization == "csv":
+        writer = csv.DictWriter(stream, fieldnames=FIELDS, lineterminator="\n")
+        writer.writeheader()
+        for favorite in favorites:
+            writer.writerow(favorite.json())
+            count += 1
+    elif serialization == "ndjson":
+        for favorite in favorites:
+            stream.write(json.dumps(favorite.json()) + "\n")
+            count += 1
+    else:
+        stream.write("[")
+        for favorite in favorites:
+            entry = textwrap.indent(json.dumps(favorite.json(), indent=4), "    ")
+            stream.write(f"{',' if count else ''}\n{entry}")
+            count += 1
+        stream.write("\n]" if count else "]")
+    return count
+
+
+def _boolean(value: Any) -> bool:  # noqa: ANN401
+    """Read a skytune_maintained value, CSV ones are strings.
+
+    Args:
+        value: The value.
+
+    Returns:
+        The boolean.
+
+    Raises:
+        ValueError: When the value is not a boolean.
+    """
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().casefold()
+    if text in TRUE:
+        return True
+    if text in FALSE:
+        return False
+    msg = f"Not a boolean skytune_maintained: {value!r}"
+    raise ValueError(msg)
+
+
+def _validate(row: Any) -> dict[str, Any]:  # noqa: ANN401
+    """Check an exported favorite.
+
+    Args:
+        row: The parsed favorite.
+
+    Returns:
+        The favorite's fields, other keys are dropped.
+
+    Raises:
+        ValueError: When a field is missing or empty.
+    """
+    if not isinstance(row, dict):
+        msg = f"Not an object: {row!r}"
+        raise ValueError(msg)  # noqa: TRY004
+    missing = [name for name in FIELDS if row.get(name) is None]
+    if missing:
+        msg = f"Missing {', '.join(missing)}"
+        raise ValueError(msg)
+    empty = [name for name in ("name", "url") if not str(row[name]).strip()]
+    if empty:
+        msg = f"Empty {', '.join(empty)}"
+        raise ValueError(msg)
+    fields: dict[str, Any] = {name: str(row[name]) for name in FIELDS}
+    fields["skytune_maintained"] = _boolean(row["skytune_maintained"])
+    return fields
+
+
+def _row(line: int, row: Any) -> dict[str, Any] | RowError:  # noqa: ANN401
+    """Check an exported favorite, without raising.
+
+    Args:
+        line: The line or list position.
+        row: The parsed favorite.
+
+    Returns:
+        The favorite's fields or the error.
+    """
+    try:
+        return _validate(row)
+    except ValueError as exc:
+        return RowError(line, str(exc))
+
+
+def _sniff(lines: Iterator[str]) -> tuple[str, Iterator[str]]:
+    """Guess the format of a favorites file from its first non-blank line.
+
+    Args:
+        lines: The lines.
+
+    Returns:
+        The format and the lines, the ones read included.
+    """
+    head = []
+    for line in lines:
+        head.append(line)
+        if line.strip():
+            break
+    first = head[-1].lstrip()[:1] if head else ""
+    return {"[": "json", "{": "ndjson"}.get(first, "csv"), itertools.chain(head, lines)
+
+
+def read_favorites(
+    stream: TextIO,
+    serialization: str | None = None,
+) -> Iterator[tuple[int, dict[str, Any] | RowError]]:
+    """Read favorites from a stream, one at a time.
+
+    NDJSON and CSV are read line by line. A JSON list is one document, so it
+    is parsed whole before the first favorite. The format is sniffed from the
+    first line when not given. A bad favorite is yielded as a `RowError`.
+
+    Args:
+        stream: The text stream.
+        serialization: One of `FORMATS`, or None to sniff it.
+
+    Yields:
+        The line, or list position for JSON, and the favorite's fields or the error.
+    """
+    lines: Iterator[str] = iter(stream)
+    if serialization is None:
+        serialization, lines = _sniff(lines)
+    check_format(serialization)
+
+    if serialization == "csv":
+        reader = csv.DictReader(lines)
+        for row in reader:
+            yield reader.line_num, _row(reader.line_num, row)
+    elif serialization == "ndjson":
+        for line_num, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as exc:
+                yield line_num, RowError(line_num, f"Invalid JSON: {exc}")
+                continue
+            yield line_num, _row(line_num, row)
+    else:
+        try:
+            rows = json.loads("".join(lines))
+        except ValueError as exc:
+            yield 1, RowError(1, f"Invalid JSON: {exc}")
+            return
+        if not isinstance(rows, list):
+            yield 1, RowError(1, "Not a list of favorites")
+            return
+        for position, row in enumerate(rows, start=1):
+            yield position, _row(position, row)
@@ -0,0 +1,641 @@
+"""Functionality shared by the blocking and the asyncio radio clients."""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sys
+import time
+
+from typing import Any, Callable
+
+from .cache import AddressCache, CatalogCache, fingerprint
+from .discovery import FIND_TIMEOUT, first_of, probe, resolve, ssdp_search
+from .exceptions import RadioConnectionError, RadioTimeoutError
+from .favorites import RE_CHANNEL, RE_CHANNEL_PUSH, RE_FAV, FavDetails, Favorite
+from .genre import Genre, Genres, SubGenre
+from .locations import Country, Locations, Region, StateProvince
+from .plan import MovePlan, plan_moves
+from .resolver import GenreResolver, LocationResolver
+from .stats import RequestEvent, RequestStats
+from .transport import Transport
+
+
+logger = logging.getLogger(__name__)
+
+# seconds discover_all listens for SSDP replies
+DISCOVER_WINDOW = 3.0
+
+
+class RadioBase:
+    """Discovery, state and parsing common to every radio client.
+
+    Subclasses provide the transport, the parsing here never touches the network.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self: RadioBase,
+        ip_address: str | None = None,
+        max_concurrency: int = 4,
+        catalog_ttl: float | None = 24 * 60 * 60,
+        catalog_key: str | None = None,
+        refresh_catalog: bool = False,
+        verify_changes: bool = False,
+        transport: Transport | None = None,
+    ) -> None:
+        """Initialize the radio state.
+
+        Args:
+            ip_address: The IP address of the radio.
+            max_concurrency: The maximum number of favorite pages fetched at once.
+            catalog_ttl: Seconds the on-disk catalog cache stays valid, None disables it.
+            catalog_key: The catalog cache key, such as the serial, defaults to the IP address.
+            refresh_catalog: Whether to bypass the on-disk catalog cache.
+            verify_changes: Whether to refetch the page a change touched and compare it
+                with the locally updated favorites.
+            transport: The timeouts, retries and connection pooling, see `Transport`.
+        """
+        self.ip_address = ip_address
+        self.max_concurrency = max_concurrency
+        self.catalog_ttl = catalog_ttl
+        self.catalog_key = catalog_key
+        self.refresh_catalog = refresh_catalog
+        self.verify_changes = verify_changes
+        self.transport = transport or Transport()
+        self.base_url: str
+        self._favorites: list[Favorite] | None = None
+        self._fav_details: FavDetails | None = None
+        # when the cached favorites were last fetched or checked, time.monotonic()
+        self._favorites_checked: float | None = None
+        self.request_stats = RequestStats()
+        self._genres: Genres = Genres(genres=[])
+        self._locations: Locations = Locations(regions=[])
+        self._location_resolver: LocationResolver | None = None
+        self._genre_resolver: GenreResolver | None = None
+        # whether the catalog came from the on-disk cache and may be out of date
+        self._catalog_cached = False
+        # where find caches the last discovered address, None disables it
+        self.address_cache: AddressCache | None = AddressCache()
+
+    def find(self: RadioBase, timeout: float = FIND_TIMEOUT) -> bool:
+        """Find a radio.
+
+        The constructor address and SKYTUNE_IP_ADDRESS are used as is. Otherwise
+        the last address found, probed, a DNS lookup of "skytune" and an SSDP
+        search run at once and the first answer wins; it is cached for next time.
+
+        Args:
+            timeout: Seconds to wait for the discovery.
+
+        Returns:
+            Whether a radio was found.
+        """
+        if not self.ip_address:
+            self.ip_address = os.environ.get("SKYTUNE_IP_ADDRESS")
+            if self.ip_address:
+                logger.debug("Using SKYTUNE_IP_ADDRESS: %s", self.ip_address)
+        if self.ip_address:
+            self.base_url = f"http://{self.ip_address}/"
+            return True
+
+        strategies: dict[str, Callable[[], str | None]] = {}
+        cached = self.address_cache.load() if self.address_cache is not None else None
+        if cached is not None:
+            strategies["cache"] = lambda: cached if probe(cached) else None
+        strategies["dns"] = resolve
+        strategies["ssdp"] = lambda: next(iter(ssdp_search(first=True)), None)
+        found = first_of(strategies, timeout=timeout)
+        if found is None:
+            return False
+        strategy, self.ip_address = found
+        logger.debug("Using %s: %s", strategy, self.ip_address)
+        if self.address_cache is not None and self.ip_address != cached:
+            self.address_cache.save(self.ip_address)
+        self.base_url = f"http://{self.ip_address}/"
+        return True
+
+    @classmethod
+    def discover_all(
+        cls: type[RadioBase],
+        window: float = DISCOVER_WINDOW,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> list[RadioBase]:
+        """Find every radio answering an SSDP search.
+
+        This blocks for the whole window, also for the asyncio client.
+
+        Args:
+            window: Seconds to collect replies.
+            **kwargs: Passed to each radio's constructor.
+
+        Returns:
+            A radio per responder, in reply order.
+        """
+        radios = []
+        for address in ssdp_search(window=window):
+            radio = cls(ip_address=address, **kwargs)
+            radio.find()
+            radios.append(radio)
+        return radios
+
+    def _give_up(
+        self: RadioBase,
+        url: str,
+        attempts: int,
+        error: str,
+        timeout: bool,
+        idempotent: bool,
+    ) -> RadioConnectionError:
+        """Build the error for a request that failed every attempt.
+
+        A change that may have reached the radio leaves the cached favorites
+        unknown, so they are dropped and refetched on next use.
+
+        Args:
+            url: The URL, relative to the radio.
+            attempts: The number of attempts made.
+            error: The last error.
+            timeout: Whether the last error was a timeout.
+            idempotent: Whether the request was read-only.
+
+        Returns:
+            The error to raise.
+        """
+        if not idempotent:
+            self._favorites = None
+        msg = f"Giving up on {url} after {attempts} attempt(s): {error}"
+        logger.error(msg)
+        if timeout:
+            return RadioTimeoutError(msg, url=url, attempts=attempts)
+        return RadioConnectionError(msg, url=url, attempts=attempts)
+
+    def stats(self: RadioBase) -> dict[str, dict[str, float]]:
+        """Get the request statistics.
+
+        Returns:
+            Per endpoint request, error and retry counts, bytes transferred and
+            p50/p95/p99 latencies in seconds.
+        """
+        return self.request_stats.snapshot()
+
+    def add_request_hook(self: RadioBase, hook: Callable[[RequestEvent], None]) -> None:
+        """Call a function after every request attempt to the radio.
+
+        Args:
+            hook: Called with the `RequestEvent`.
+        """
+        self.request_stats.add_hook(hook)
+
+    def _parse_favorite_page(self: RadioBase, page: str) -> tuple[list[Favorite], FavDetails]:
+        """Parse the favorite page in a single pass over the body.
+
+        The catalog must already be loaded. The results match
+        `_parse_favorite_page_lines`.
+
+        Args:
+            page: The favList.php page.
+
+        Returns:
+            The favorites and the page details.
+        """
+        start = page.find("\nfavListInfo = ") + 1
+        end = page.find("\n", start)
+        fav_list_line = page[start:end] if end != -1 else page[start:]
+        match = RE_FAV.match(fav_list_line) if start else None
+        if not match:
+            err = f"Could not parse favListInfo: {fav_list_line}"
+            raise ValueError(err)
+        fav_details = FavDetails(**{k: int(v) for k, v in match.groupdict().items()})
+
+        # the same few locations and genres repeat, resolve each raw value once
+        names = {"-1,-1,-1": "Unknown", "-1,-1": "Unknown"}
+        favorites = []
+        for match in RE_CHANNEL_PUSH.finditer(page):
+            name, sep, url = match["name_url"].rpartition('","')
+            if not sep:
+                err = f"Could not parse myFavChannelList: {match[0]}"
+                raise ValueError(err)
+            location_str, genre_str = self._catalog_names(match["location"], match["genre"], names)
+            favorites.append(
+                Favorite(
+                    name=name,
+                    url=url,
+                    skytune_maintained=match["skytune_maintained"] != "0",
+                    location=location_str,
+                    genre=genre_str,
+                ),
+            )
+        if len(favorites) != page.count("\nmyFavChannelList.push"):
+            err = "Could not parse myFavChannelList"
+            raise ValueError(err)
+        return favorites, fav_details
+
+    def _catalog_names(
+        self: RadioBase,
+        location: str,
+        genre: str,
+        names: dict[str, str],
+    ) -> tuple[str, str]:
+        """Get the location and genre names of a favorite.
+
+        Args:
+            location: The raw location uid, such as "1,2,-1".
+            genre: The raw genre uid, such as "2,-1".
+            names: The names already resolved on the page, by raw uid, updated here.
+                A location has one more part than a genre, so they share it.
+
+        Returns:
+            The location and genre names.
+        """
+        location_str = names.get(location)
+        if location_str is None:
+            l1, l2, l3 = (int(x) for x in location.split(",", maxsplit=2))
+            location_str = names[location] = self._locations.find_by_uid((l1, l2, l3)).name
+        genre_str = names.get(genre)
+        if genre_str is None:
+            g1, g2 = (int(x) for x in genre.split(",", maxsplit=1))
+            genre_str = names[genre] = self._genres.find_by_uid((g1, g2)).name
+        return location_str, genre_str
+
+    def _parse_favorite_page_lines(
+        self: RadioBase,
+        page: str,
+    ) -> tuple[list[Favorite], FavDetails]:
+        """Parse the favorite page line by line.
+
+        The original parser, kept as the reference `_parse_favorite_page` is
+        benchmarked and checked against.
+
+        Args:
+            page: The favList.php page.
+
+        Returns:
+            The favorites and the page details.
+        """
+        # pylint: disable=too-many-locals
+        lines = page.split("\n")
+        # remove initial favListInfo
+        lines = lines[1:-1]
+        fav_list_line = next(line for line in lines if line.startswith("favListInfo = "))
+        match = RE_FAV.match(fav_list_line)
+        if not match:
+            err = f"Could not parse favListInfo: {fav_list_line}"
+            raise ValueError(err)
+        fav_details = FavDetails(**{k: int(v) for k, v in match.groupdict().items()})
+        favorites = []
+        for line in lines:
+            if line.startswith("myFavChannelList.push"):
+                match = RE_CHANNEL.match(line)
+                if not match:
+                    err = f"Could not parse myFavChannelList: {line}"
+                    raise ValueError(err)
+                favorite = match.groupdict()
+                l1, l2, l3 = tuple(int(x) for x in favorite["location"].split(",", maxsplit=2))
+                location = (l1, l2, l3)
+                location_str = (
+                    "Unknown"
+                    if location == (-1, -1, -1)
+                    else self._locations.find_by_uid(location).name
+                )
+                g1, g2 = tuple(int(x) for x in favorite["genre"].split(",", maxsplit=1))
+                genre = (g1, g2)
+                genre_str = "Unknown" if genre == (-1, -1) else self._genres.find_by_uid(genre).name
+                skytune_maintained = bool(int(favorite["skytune_maintained"]))
+
+                favorites.append(
+                    Favorite(
+                        name=favorite["name"],
+                        url=favorite["url"],
+                        skytune_maintained=skytune_maintained,
+                        location=location_str,
+                        genre=genre_str,
+                    ),
+                )
+        return favorites, fav_details
+
+    def _load_locations(self: RadioBase, locations_str: str) -> None:
+        """Get the locations."""
+        locations_str = locations_str.replace("mCountryList = ", "")
+        locations_loaded = json.loads(locations_str)
+        # names are interned so favorites share the catalog's copy, see Favorite
+        current_country = None
+        for location in locations_loaded:
+            if location[1:4] == [-1, -1, -1]:
+                pass
+            elif location[2:4] == [-1, -1]:
+                logger.debug("Found region: %s", location[4])
+                self._locations.regions.append(Region(name=sys.intern(location[4]), countries=[]))
+            elif location[3] == -1:
+                logger.debug("Found country: %s", location[4])
+                current_country = Country(
+                    name=sys.intern(location[4]),
+                    region=self._locations.regions[-1],
+                    states_provinces=[],
+                    uid=tuple(location[1:4]),
+                )
+                self._locations.regions[-1].countries.append(current_country)
+            elif location[3] != -1:
+                logger.debug("Found state/province: %s", location[4])
+                if current_country is None:
+                    msg = f"Found state/province without country: {location}"
+                    raise ValueError(msg)
+                sp = StateProvince(
+                    country=current_country,
+                    name=sys.intern(location[4]),
+                    region=self._locations.regions[-1],
+                    uid=tuple(location[1:4]),
+                )
+                current_country.states_provinces.append(sp)
+            else:
+                msg = f"Unknown location type: {location}"
+                raise ValueError(msg)
+        self._locations.build_index()
+        self._location_resolver = None
+
+    def _load_genres(self: RadioBase, genres_str: str) -> None:
+        """Get the genres.
+
+        Args:
+            genres_str: The genres string.
+        """
+        genres_loaded = json.loads(genres_str)
+        parents: dict[int, Genre] = {}
+        for genre in genres_loaded:
+            if genre[1] == -1:
+                logger.debug("Found genre: %s", genre[2])
+                parent = Genre(name=sys.intern(genre[2]), uid=tuple(genre[0:2]), subgenres=[])
+                parents.setdefault(genre[0], parent)
+                self._genres.genres.append(parent)
+            elif genre[1] != -1:
+                logger.debug("Found subgenre: %s", genre[2])
+                parent_genre = parents.get(genre[0])
+                if parent_genre is None:
+                    msg = f"Found subgenre without genre: {genre}"
+                    raise ValueError(msg)
+                subgenre = SubGenre(
+                    genre=parent_genre,
+                    name=sys.intern(genre[2]),
+                    uid=tuple(genre[0:2]),
+                )
+                parent_genre.subgenres.append(subgenre)
+            else:
+                msg = f"Unknown genre type: {genre}"
+                raise ValueError(msg)
+        self._genres.build_index()
+        self._genre_resolver = None
+
+    def _load_catalog(self: RadioBase, text: str) -> None:
+        """Load the locations and genres from a get_CG.php response.
+
+        Args:
+            text: The get_CG.php response body.
+        """
+        text = text.replace("];", "]").replace("'", '"')
+        parts = text.split("mGenreList = ")
+        self._load_locations(parts[0])
+        self._load_genres(parts[1])
+
+    def _catalog_cache(self: RadioBase) -> CatalogCache | None:
+        """Get the on-disk catalog cache for this radio.
+
+        Returns:
+            The cache, or None when disabled or the radio has no key yet.
+        """
+        key = self.catalog_key or self.ip_address
+        if not key or not self.catalog_ttl:
+            return None
+        return CatalogCache(key=key, ttl=self.catalog_ttl)
+
+    def _load_cached_catalog(self: RadioBase) -> bool:
+        """Load the catalog from the on-disk cache.
+
+        Returns:
+            Whether the catalog was loaded.
+        """
+        cache = None if self.refresh_catalog else self._catalog_cache()
+        text = cache.load() if cache else None
+        if text is None:
+            return False
+        try:
+            self._load_catalog(text)
+        except (ValueError, IndexError):
+            logger.warning("Could not parse the cached catalog, refetching")
+            self._clear_catalog()
+            return False
+        self._catalog_cached = True
+        return True
+
+    def _clear_catalog(self: RadioBase) -> None:
+        """Forget the loaded locations and genres."""
+        self._genres = Genres(genres=[])
+        self._locations = Locations(regions=[])
+        self._location_resolver = None
+        self._genre_resolver = None
+
+    def _reload_catalog(self: RadioBase, text: str) -> None:
+        """Replace a cached catalog with a freshly fetched one.
+
+        Args:
+            text: The get_CG.php response body.
+        """
+        self._clear_catalog()
+        self._load_catalog(text)
+        self._store_catalog(text)
+        # cleared last, a thread failing on the half loaded catalog then waits for it
+        self._catalog_cached = False
+
+    def _store_catalog(self: RadioBase, text: str) -> None:
+        """Save a freshly fetched catalog to the on-disk cache.
+
+        Args:
+            text: The get_CG.php response body.
+        """
+        cache = self._catalog_cache()
+        if cache is not None:
+            cache.save(text)
+
+    def _renumber(self: RadioBase, start: int) -> None:
+        """Renumber the cached favorites from an index onwards.
+
+        Args:
+            start: The first index to renumber.
+        """
+        if self._favorites is None:
+            return
+        for idx in range(start, len(self._favorites)):
+            self._favorites[idx].uid = idx + 1
+
+    def _apply_add(self: RadioBase, favorite: Favorite) -> int | None:
+        """Append an added favorite to the cached favorites.
+
+        The radio ignores an add when its list is full. When the cache says it
+        is, whether the add landed is unknown, so the cache is dropped instead.
+
+        Args:
+            favorite: The favorite the radio appended.
+
+        Returns:
+            The index of the favorite, or None when nothing is cached.
+        """
+        if self._favorites is None:
+            return None
+        if self._fav_details is not None and len(self._favorites) >= self._fav_details.capacity:
+            logger.warning("Added %s to full favorites, refetching them", favorite.name)
+            self._favorites = None
+            return None
+        self._favorites.append(favorite)
+        favorite.uid = len(self._favorites)
+        return favorite.uid - 1
+
+    def _apply_delete(self: RadioBase, favorite_id: int) -> int | None:
+        """Remove a deleted favorite from the cached favorites.
+
+        Args:
+            favorite_id: The uid of the deleted favorite.
+
+        Returns:
+            The index the favorite was at, or None when nothing is cached.
+        """
+        if self._favorites is None:
+            return None
+        index = favorite_id - 1
+        self._favorites.pop(index)
+        self._renumber(index)
+        return index
+
+    def _apply_move(self: RadioBase, source: int, destination: int) -> int | None:
+        """Move a favorite in the cached favorites as moveCh.cgi does.
+
+        Args:
+            source: The zero based index moved from.
+            destination: The zero based index moved to.
+
+        Returns:
+            The first index that changed, or None when nothing is cached.
+        """
+        if self._favorites is None:
+            return None
+        self._favorites.insert(destination, self._favorites.pop(source))
+        start = min(source, destination)
+        self._renumber(start)
+        return start
+
+    def _cache_favorites(self: RadioBase, favorites: list[Favorite], details: FavDetails) -> None:
+        """Cache the favorites once every page has been read.
+
+        Args:
+            favorites: The favorites.
+            details: The page 0 details.
+        """
+        self._fav_details = details
+        self._favorites = favorites
+        self._favorites_checked = time.monotonic()
+
+    def _favorites_stale(self: RadioBase, max_age: float | None) -> bool:
+        """Check whether the cached favorites are due a check.
+
+        Args:
+            max_age: Seconds since the last fetch or check, None never expires.
+
+        Returns:
+            Whether they are cached and older than `max_age`.
+        """
+        if self._favorites is None or max_age is None:
+            return False
+        if self._favorites_checked is None:
+            return True
+        return time.monotonic() - self._favorites_checked > max_age
+
+    @staticmethod
+    def _page_fingerprint(favorites: list[Favorite]) -> str:
+        """Hash the entries of a favorites page.
+
+        Args:
+            favorites: The favorites on the page.
+
+        Returns:
+            The content hash.
+        """
+        return fingerprint(
+            "\n".join(
+                f"{fav.name}\t{fav.url}\t{fav.skytune_maintained}\t{fav.location}\t{fav.genre}"
+                for fav in favorites
+            ),
+        )
+
+    def _favorites_current(self: RadioBase, page: list[Favorite], details: FavDetails) -> bool:
+        """Compare a fresh page 0 with the cached favorites.
+
+        The total, the capacity and a hash of the page 0 entries must match the
+        cache, which local changes keep up to date. chIndex is the channel
+        playing, so it is kept current but is no sign of an edit. An edit that
+        only moves favorites within later pages goes unnoticed.
+
+        Args:
+            page: The favorites on page 0.
+            details: The page 0 details.
+
+        Returns:
+            Whether the cache is current, its check time is reset when it is.
+        """
+        if self._favorites is None or self._fav_details is None:
+            return False
+        cached = self._favorites[: details.items_per_page]
+        if (
+            details.total != len(self._favorites)
+            or details.capacity != self._fav_details.capacity
+            or details.items_per_page != self._fav_details.items_per_page
+            or self._page_fingerprint(page) != self._page_fingerprint(cached)
+        ):
+            logger.info("Favorites changed on the radio, refetching")
+            return False
+        self._fav_details = details
+        self._favorites_checked = time.monotonic()
+        return True
+
+    def _page_of(self: RadioBase, index: int | None) -> int | None:
+        """Get the favList.php page to verify after a change.
+
+        Args:
+            index: The first index the change touched.
+
+        Returns:
+            The page, or None when verification is off or impossible.
+        """
+        if not self.verify_changes or index is None or self._fav_details is None:
+            return None
+        return index // self._fav_details.items_per_page
+
+    def _check_page(self: RadioBase, page: int, favorites: list[Favorite]) -> None:
+        """Compare a refetched page with the cached favorites.
+
+        The cache is dropped when they differ, so the next access refetches.
+
+        Args:
+            page: The page number.
+            favorites: The favorites the radio returned for the page.
+        """
+        if self._favorites is None or self._fav_details is None:
+            return
+        start = page * self._fav_details.items_per_page
+        cached = self._favorites[start : start + self._fav_details.items_per_page]
+        if [(fav.name, fav.url) for fav in cached] != [(fav.name, fav.url) for fav in favorites]:
+            logger.warning("Favorites page %s differs from the local cache, refetching", page)
+            self._favorites = None
+
+    @staticmethod
+    def _sort_plan(favorites: list[Favorite], reverse: bool) -> MovePlan:
+        """Plan the moves that sort the favorites by name.
+
+        Args:
+            favorites: The favorites in radio order.
+            reverse: Whether to sort in descending order.
+
+        Returns:
+            The move plan.
+        """
+        sorted_favorites = sorted(favorites, key=lambda fav: fav.name.lower())
+        if reverse:
+            sorted_favorites.reverse()
+        return plan_moves(favorites, sorted_favorites)
@@ -0,0 +1,230 @@
+"""On-disk caches."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+
+from dataclasses import dataclass, field
+from pathlib import Path
+
+
+logger = logging.getLogger(__name__)
+
+CACHE_VERSION = 1
+
+
+def cache_dir() -> Path:
+    """Get the py-skytune cache directory.
+
+    Returns:
+        The directory, under XDG_CACHE_HOME or ~/.cache.
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "py-skytune"
+
+
+def fingerprint(text: str) -> str:
+    """Get the content fingerprint of a payload.
+
+    Args:
+        text: The payload.
+
+    Returns:
+        The sha256 hex digest.
+    """
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def write_atomic(path: Path, content: str) -> None:
+    """Write a file so readers never see a partial write.
+
+    Args:
+        path: The file.
+        content: The content.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f"{path.suffix}.{os.getpid()}.tmp")
+    tmp.write_text(content, encoding="utf-8")
+    tmp.replace(path)
+
+
+@dataclass
+class CatalogCache:
+    """The location and genre catalog of one radio, as served by get_CG.php.
+
+    Entries are keyed by the radio's IP address or serial and expire after
+    `ttl` seconds. Nothing checks an entry against the radio: a catalog changed
+    by a firmware update is used until it expires or is bypassed with
+    `refresh_catalog` (``--refresh-catalog``). Only favorites pointing at a uid
+    missing from it trigger an early refetch, entries renamed or reordered under
+    existing uids are not noticed. The stored checksum must match the payload,
+    so a truncated or edited file is refetched rather than parsed.
+    """
+
+    key: str
+    ttl: float = 24 * 60 * 60
+    directory: Path = field(default_factory=cache_dir)
+
+    @property
+    def path(self: CatalogCache) -> Path:
+        """Get the cache file."""
+        safe_key = re.sub(r"[^A-Za-z0-9_.-]", "_", self.key)
+        return self.directory / f"catalog-{safe_key}.json"
+
+    def load(self: CatalogCache) -> str | None:
+        """Load the cached catalog.
+
+        Returns:
+            The get_CG.php payload, or None when missing, stale or invalid.
+        """
+        try:
+            entry = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        try:
+            if entry["version"] != CACHE_VERSION:
+                return None
+            if time.time() - entry["fetched"] > self.ttl:
+                logger.debug("Catalog cache expired: %s", self.path)
+                return None
+            if fingerprint(entry["catalog"]) != entry["checksum"]:
+                logger.warning("Catalog cache checksum mismatch: %s", self.path)
+                return None
+        except (KeyError, TypeError):
+            return None
+        logger.debug("Using catalog cache: %s", self.path)
+        return entry["catalog"]
+
+    def save(self: CatalogCache, catalog: str) -> None:
+        """Save the catalog.
+
+        Args:
+            catalog: The get_CG.php payload.
+        """
+        entry = {
+            "version": CACHE_VERSION,
+            "key": self.key,
+            "fetched": time.time(),
+            "checksum": fingerprint(catalog),
+            "catalog": catalog,
+        }
+        try:
+            write_atomic(self.path, json.dumps(entry))
+        except OSError:
+            logger.exception("Could not write catalog cache: %s", self.path)
+
+
+@dataclass
+class StationCache:
+    """RadioBrowser station metadata, keyed by station uuid.
+
+    Every station expires `ttl` seconds after it was fetched, expired
+    stations are dropped on the next save.
+    """
+
+    ttl: float = 24 * 60 * 60
+    directory: Path = field(default_factory=cache_dir)
+
+    @property
+    def path(self: StationCache) -> Path:
+        """Get the cache file."""
+        return self.directory / "stations.json"
+
+    def _entries(self: StationCache) -> dict[str, dict]:
+        """Read the unexpired entries.
+
+        Returns:
+            The entries keyed by station uuid.
+        """
+        try:
+            content = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(content, dict) or content.get("version") != CACHE_VERSION:
+            return {}
+        now = time.time()
+        try:
+            return {
+                uuid: entry
+                for uuid, entry in content["stations"].items()
+                if now - entry["fetched"] <= self.ttl
+            }
+        except (AttributeError, KeyError, TypeError):
+            return {}
+
+    def load(self: StationCache, uuids: list[str]) -> dict[str, dict]:
+        """Load cached stations.
+
+        Args:
+            uuids: The station uuids.
+
+        Returns:
+            The cached, unexpired stations keyed by uuid, missing ones are left out.
+        """
+        entries = self._entries()
+        return {uuid: entries[uuid]["station"] for uuid in uuids if uuid in entries}
+
+    def save(self: StationCache, stations: list[dict]) -> None:
+        """Add stations to the cache.
+
+        Args:
+            stations: The RadioBrowser station records.
+        """
+        if not stations:
+            return
+        entries = self._entries()
+        now = time.time()
+        for station in stations:
+            entries[station["stationuuid"]] = {"fetched": now, "station": station}
+        content = {"version": CACHE_VERSION, "stations": entries}
+        try:
+            write_atomic(self.path, json.dumps(content))
+        except OSError:
+            logger.exception("Could not write station cache: %s", self.path)
+
+
+@dataclass
+class AddressCache:
+    """The address a radio was last discovered at.
+
+    The address does not expire, `Radio.find` probes it before use.
+    """
+
+    directory: Path = field(default_factory=cache_dir)
+
+    @property
+    def path(self: AddressCache) -> Path:
+        """Get the cache file."""
+        return self.directory / "address.json"
+
+    def load(self: AddressCache) -> str | None:
+        """Load the cached address.
+
+        Returns:
+            The address, or None when missing or invalid.
+        """
+        try:
+            content = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if not isinstance(content, dict) or content.get("version") != CACHE_VERSION:
+            return None
+        address = content.get("address")
+        return address if isinstance(address, str) and address else None
+
+    def save(self: AddressCache, address: str) -> None:
+        """Save the address.
+
+        Args:
+            address: The radio's address.
+        """
+        content = {"version": CACHE_VERSION, "address": address, "found": time.time()}
+        try:
+            write_atomic(self.path, json.dumps(content))
+        except OSError:
+            logger.exception("Could not write address cache: %s", self.path)
@@ -4,18 +4,44 @@
 from __future__ import annotations
 
 import argparse
+import contextlib
+import os
+import sys
+import time
 
-from py_skytune.radio import Radio
-from py_skytune.ui import Ui
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable
+
+from py_skytune.backup import FORMATS, STDIO, format_for, open_favorites
+from py_skytune.daemon import DaemonClient, run_command
+from py_skytune.exceptions import SkytuneError
+
+
+if TYPE_CHECKING:
+    from py_skytune.radio import Radio
 
 
 class Cli:
     """The CLI entrypoint for tunein."""
 
-    def __init__(self: Cli, radio: Radio) -> None:
-        """Initialize the CLI entrypoint."""
+    def __init__(self: Cli, radio: Radio | None = None) -> None:
+        """Initialize the CLI entrypoint.
+
+        Args:
+            radio: The radio, created on first use when not given.
+        """
         self._args: argparse.Namespace
         self._radio = radio
+        self._client: DaemonClient | None = None
+
+    @property
+    def radio(self: Cli) -> Radio:
+        """Get the radio, importing the client only when a command runs here."""
+        if self._radio is None:
+            from py_skytune.radio import Radio  # pylint: disable=import-outside-toplevel
+
+            self._radio = Radio()
+        return self._radio
 
     def parse_args(self: Cli) -> None:
         """Parse the command line arguments."""
@@ -23,6 +49,17 @@ class Cli:
             description="py-skytune command line interface",
         )
 
+        parser.add_argument(
+            "--stats",
+            action="store_true",
+            help="Print per-endpoint request statistics on exit, the daemon's when one runs",
+        )
+        parser.add_argument(
+            "--refresh-catalog",
+            action="store_true",
+            help="Refetch the location and genre catalog instead of using the cache",
+        )
+
         subparsers = parser.add_subparsers(
             title="Commands",
             dest="subcommand",
@@ -34,6 +71,17 @@ class Cli:
             help="Print current favorites",
         )
 
+        discover = subparsers.add_parser(
+            "discover",
+            help="Print the address of every radio answering an SSDP search",
+        )
+        discover.add_argument(
+            "--window",
+            type=float,
+            default=3.0,
+            help="Seconds to collect replies",
+        )
+
         play = subparsers.add_parser(
             "play",
             help="Play a favorite",
@@ -44,25 +92,247 @@ class Cli:
             nargs="?",
         )
 
+        subparsers.add_parser(
+            "playing",
+            help="Print the now playing status",
+        )
+
+        subparsers.add_parser(
+            "watch",
+            help="Print the now playing status whenever it changes",
+        )
+
+        daemon = subparsers.add_parser(
+            "daemon",
+            help="Keep warm radios and answer the other commands over a Unix socket",
+        )
+        daemon.add_argument(
+            "--max-age",
+            type=float,
+            default=5.0,
+            help="Seconds cached favorites are trusted before checking page 0 for edits",
+        )
+
+        sort = subparsers.add_parser(
+            "sort",
+            help="Sort the favorites by name",
+        )
+        sort.add_argument(
+            "--reverse",
+            action="store_true",
+            help="Sort in descending order",
+        )
+        sort.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Print the planned moves without moving anything",
+        )
+
+        sync = subparsers.add_parser(
+            "sync",
+            help="Sync the favorites with an exported favorites file",
+        )
+        sync.add_argument(
+            "file",
+            help="The source of truth file",
+        )
+        sync.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Print the planned changes without sending them",
+        )
+
+        export = subparsers.add_parser(
+            "export",
+            help="Export the favorites as each page arrives",
+        )
+        export.add_argument(
+            "file",
+            help="The file to write, '-' for stdout",
+            nargs="?",
+            default=STDIO,
+        )
+        export.add_argument(
+            "--format",
+            choices=FORMATS,
+            help="The format, from the file suffix by default, ndjson for stdout",
+        )
+
+        import_ = subparsers.add_parser(
+            "import",
+            help="Import favorites, adding each one as it is read",
+        )
+        import_.add_argument(
+            "file",
+            help="The file to read, '-' for stdin",
+        )
+        import_.add_argument(
+            "--format",
+            choices=FORMATS,
+            help="The format, from the file suffix or the first line by default",
+        )
+
         self._args = parser.parse_args()
 
     def run(self: Cli) -> None:
         """Run the CLI."""
-        if not self._args.subcommand:
-            ui = Ui()
-            ui.run()
-        if self._args.subcommand == "favorites":
-            favorites = self._radio.favorites
-            for fav in favorites:
-                print(fav.uid, fav.name, fav.location, fav.genre, fav.url)
-        elif self._args.subcommand == "play":
-            playing = self._radio.play_favorite(int(self._args.favorite))
-            print(playing)
+        try:
+            self._run()
+            # a reader that went away shows up here for buffered output
+            sys.stdout.flush()
+        except SkytuneError as exc:
+            print(f"Error: {exc}", file=sys.stderr)
+            sys.exit(1)
+        except BrokenPipeError:
+            # piped into head or similar, stop quietly and keep the exit flush from failing
+            devnull = os.open(os.devnull, os.O_WRONLY)
+            os.dup2(devnull, sys.stdout.fileno())
+            sys.exit(1)
+        finally:
+            if self._args.stats and (self._client is not None or self._radio is not None):
+                print(self._call("stats"), file=sys.stderr)
+            if self._client is not None:
+                self._client.close()
+
+    def _call(self: Cli, command: str, **args: Any) -> Any:  # noqa: ANN401
+        """Run a command in the daemon when one is running, else on the radio here.
+
+        Args:
+            command: The command, see `py_skytune.daemon.COMMANDS`.
+            **args: The command's keyword arguments.
+
+        Returns:
+            The command's result.
+        """
+        if self._client is not None:
+            address = os.environ.get("SKYTUNE_IP_ADDRESS")
+            return self._client.call(command, address=address, **args)
+        return run_command(self.radio, command, args)
+
+    def _use_daemon(self: Cli) -> bool:
+        """Check whether the command can run in the daemon, and connect to it.
+
+        Returns:
+            Whether a daemon will run the command.
+        """
+        if self._args.subcommand not in ("favorites", "play", "playing", "sort", "sync"):
+            return False
+        # the daemon keeps its catalog, and cannot read this process' stdin
+        if self._args.refresh_catalog:
+            return False
+        if self._args.subcommand == "sync" and self._args.file == STDIO:
+            return False
+        self._client = DaemonClient.connect()
+        return self._client is not None
+
+    def _run(self: Cli) -> None:
+        """Run the selected command."""
+        command = self._args.subcommand or "ui"
+        handlers: dict[str, Callable[[], None]] = {
+            "daemon": self._daemon,
+            "discover": self._discover,
+            "export": self._export,
+            "favorites": self._favorites,
+            "import": self._import,
+            "play": self._play,
+            "playing": self._playing,
+            "sort": self._sort,
+            "sync": self._sync,
+            "ui": self._ui,
+            "watch": self._watch,
+        }
+        if command not in ("daemon", "discover", "ui") and not self._use_daemon():
+            self.radio.refresh_catalog = self._args.refresh_catalog
+            if not self.radio.find():
+                print("Radio not found")
+                sys.exit(1)
+        handlers[command]()
+
+    def _ui(self: Cli) -> None:
+        """Run the UI, when no command is given."""
+        # tkinter is only loaded for the UI, see benchmarks/import_time.py
+        from py_skytune.ui import Ui  # pylint: disable=import-outside-toplevel
+
+        ui = Ui()
+        ui.run()
+
+    def _daemon(self: Cli) -> None:
+        """Serve the other commands until interrupted."""
+        from py_skytune.daemon import Daemon  # pylint: disable=import-outside-toplevel
+
+        with contextlib.suppress(KeyboardInterrupt):
+            Daemon(max_age=self._args.max_age).serve()
+
+    def _discover(self: Cli) -> None:
+        """Print the address of every radio found."""
+        for radio in self.radio.discover_all(window=self._args.window):
+            print(radio.ip_address)
+
+    def _favorites(self: Cli) -> None:
+        """Print the favorites."""
+        for row in self._call("favorites"):
+            print(*row, flush=True)
+
+    def _play(self: Cli) -> None:
+        """Play a favorite."""
+        playing = self._call("play", favorite=int(self._args.favorite))
+        print(playing)
+
+    def _playing(self: Cli) -> None:
+        """Print the now playing status."""
+        print(self._call("playing"))
+
+    def _sort(self: Cli) -> None:
+        """Sort the favorites, or print the planned moves."""
+        result = self._call("sort", reverse=self._args.reverse, dry_run=self._args.dry_run)
+        for move in result["moves"]:
+            print(move)
+        print(f"{result['move_count']} move(s) for {result['total']} favorites")
+        for row in result["favorites"] or []:
+            print(*row)
+
+    def _watch(self: Cli) -> None:
+        """Print the now playing status whenever it changes."""
+        try:
+            for playing in self.radio.watcher.events():
+                print(f"{time.strftime('%H:%M:%S')} {playing}", flush=True)
+        except KeyboardInterrupt:
+            self.radio.watcher.stop()
+
+    def _sync(self: Cli) -> None:
+        """Sync the favorites with a file."""
+        # the daemon resolves paths from its own working directory
+        file = self._args.file
+        if file != STDIO:
+            file = str(Path(file).resolve())
+        print(self._call("sync", file=file, dry_run=self._args.dry_run))
+
+    def _export(self: Cli) -> None:
+        """Export the favorites."""
+        serialization = self._args.format or format_for(self._args.file)
+        if serialization is None:
+            serialization = "ndjson" if self._args.file == STDIO else "json"
+        with open_favorites(self._args.file, "w") as stream:
+            count = self.radio.export_to(stream, serialization=serialization)
+        print(f"Exported {count} favorites", file=sys.stderr)
+
+    def _import(self: Cli) -> None:
+        """Import favorites."""
+        with open_favorites(self._args.file) as stream:
+            report = self.radio.import_from(
+                stream,
+                serialization=self._args.format or format_for(self._args.file),
+            )
+        for error in report.errors:
+            print(f"Error: {error}", file=sys.stderr)
+        print(report, file=sys.stderr)
+        if report.errors:
+            sys.exit(1)
 
 
 def main() -> None:
     """Run the CLI."""
-    cli = Cli(radio=Radio())
+    cli = Cli()
     cli.parse_args()
     cli.run()
 
@@ -0,0 +1,363 @@
+"""A long-lived process keeping warm radios for thin CLI clients.
+
+`skytune daemon` keeps a `Radio` per address, with its session, catalog,
+favorites and now playing watcher, and answers newline delimited JSON
+requests on a Unix socket. The CLI sends its commands there when a daemon is
+running and runs them itself otherwise, with the same functions, so both
+print the same. The client side never imports the radio or requests.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import logging
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+
+from collections.abc import Iterator
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable
+
+from .cache import cache_dir
+from .exceptions import RadioNotFoundError, SkytuneError
+from .watch import NowPlaying
+
+
+if TYPE_CHECKING:
+    from types import FrameType
+
+    from .favorites import Favorite
+    from .radio import Radio
+
+
+logger = logging.getLogger(__name__)
+
+CONNECT_TIMEOUT = 0.5
+# seconds the daemon trusts cached favorites before checking page 0 again
+FAVORITES_MAX_AGE = 5.0
+# the commands reading the favorites, checked first so front panel edits show
+FAVORITES_COMMANDS = frozenset({"favorites", "sort", "sync"})
+
+
+def socket_path() -> Path:
+    """Get the daemon socket.
+
+    Returns:
+        SKYTUNE_SOCKET when set, else py-skytune.sock in XDG_RUNTIME_DIR or the cache directory.
+    """
+    if "SKYTUNE_SOCKET" in os.environ:
+        return Path(os.environ["SKYTUNE_SOCKET"])
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    return (Path(runtime) if runtime else cache_dir()) / "py-skytune.sock"
+
+
+def favorite_row(favorite: Favorite) -> list[Any]:
+    """Get the printed fields of a favorite.
+
+    Args:
+        favorite: The favorite.
+
+    Returns:
+        The uid, name, location, genre and URL.
+    """
+    return [favorite.uid, favorite.name, favorite.location, favorite.genre, favorite.url]
+
+
+def _favorites(radio: Radio) -> Iterator[list[Any]]:
+    """List the favorites, as each page arrives."""
+    return (favorite_row(favorite) for favorite in radio.iter_favorites())
+
+
+def _play(radio: Radio, favorite: int) -> Any:  # noqa: ANN401
+    """Play a favorite and get the playing.php payload."""
+    return radio.play_favorite(favorite)
+
+
+def _playing(radio: Radio) -> str:
+    """Get the now playing status, from the watcher when it is running."""
+    playing = radio.watcher.current or NowPlaying.from_json(radio.playing)
+    return str(playing)
+
+
+def _sort(radio: Radio, reverse: bool = False, dry_run: bool = False) -> dict[str, Any]:
+    """Plan and run a sort."""
+    plan = radio.plan_sort(reverse=reverse)
+    result: dict[str, Any] = {
+        "moves": [str(move) for move in plan.moves],
+        "move_count": plan.move_count,
+        "total": len(plan.target),
+        "favorites": None,
+    }
+    if not dry_run:
+        favorites = radio.sort_favorites(reverse=reverse)
+        result["favorites"] = [favorite_row(favorite) for favorite in favorites]
+    return result
+
+
+def _sync(radio: Radio, file: str, dry_run: bool = False) -> str:
+    """Sync with a favorites file, the path must be absolute for the daemon."""
+    return str(radio.sync_favorites(file, dry_run=dry_run))
+
+
+def _stats(radio: Radio) -> str:
+    """Get the request statistics."""
+    return radio.request_stats.summary()
+
+
+COMMANDS: dict[str, Callable[..., Any]] = {
+    "favorites": _favorites,
+    "play": _play,
+    "playing": _playing,
+    "sort": _sort,
+    "stats": _stats,
+    "sync": _sync,
+}
+
+
+def run_command(radio: Radio, command: str, args: dict[str, Any]) -> Any:  # noqa: ANN401
+    """Run a CLI command on a radio.
+
+    Args:
+        radio: The radio, already found.
+        command: One of `COMMANDS`.
+        args: The command's keyword arguments.
+
+    Returns:
+        The JSON serializable result, "favorites" returns an iterator.
+
+    Raises:
+        ValueError: When the command is unknown.
+    """
+    try:
+        handler = COMMANDS[command]
+    except KeyError:
+        msg = f"Unknown command: {command}"
+        raise ValueError(msg) from None
+    return handler(radio, **args)
+
+
+class DaemonClient:
+    """A connection to a running daemon."""
+
+    def __init__(self: DaemonClient, path: Path | None = None) -> None:
+        """Connect to the daemon.
+
+        Args:
+            path: The socket, see `socket_path`.
+
+        Raises:
+            OSError: When no daemon is listening.
+        """
+        self.path = path or socket_path()
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            self._sock.settimeout(CONNECT_TIMEOUT)
+            self._sock.connect(str(self.path))
+            # commands such as a sort take as long as they take
+            self._sock.settimeout(None)
+        except OSError:
+            self._sock.close()
+            raise
+        self._file = self._sock.makefile("rwb")
+
+    @classmethod
+    def connect(cls: type[DaemonClient], path: Path | None = None) -> DaemonClient | None:
+        """Connect to the daemon, when one is running.
+
+        Args:
+            path: The socket, see `socket_path`.
+
+        Returns:
+            The client, or None.
+        """
+        try:
+            return cls(path)
+        except OSError:
+            return None
+
+    def call(
+        self: DaemonClient,
+        command: str,
+        address: str | None = None,
+        **args: Any,  # noqa: ANN401
+    ) -> Any:  # noqa: ANN401
+        """Run a command in the daemon.
+
+        Args:
+            command: One of `COMMANDS`, or "ping".
+            address: The radio's address, None uses the one the daemon finds.
+            **args: The command's keyword arguments.
+
+        Returns:
+            The command's result.
+
+        Raises:
+            SkytuneError: When the command fails or the daemon goes away.
+        """
+        request = {"command": command, "address": address, "args": args}
+        try:
+            self._file.write(json.dumps(request).encode() + b"\n")
+            self._file.flush()
+            line = self._file.readline()
+        except OSError as exc:
+            msg = f"Lost the daemon at {self.path}: {exc}"
+            raise SkytuneError(msg) from exc
+        if not line:
+            msg = f"The daemon at {self.path} closed the connection"
+            raise SkytuneError(msg)
+        response = json.loads(line)
+        if not response["ok"]:
+            raise SkytuneError(response["error"])
+        return response["result"]
+
+    def close(self: DaemonClient) -> None:
+        """Close the connection."""
+        self._file.close()
+        self._sock.close()
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    """Answer the requests of one client connection."""
+
+    server: _Server
+
+    def handle(self: _Handler) -> None:
+        """Answer each request line."""
+        for line in self.rfile:
+            self.wfile.write(self.server.daemon.respond(line))
+            self.wfile.flush()
+
+
+class _Server(socketserver.ThreadingUnixStreamServer):
+    """The socket server, with a reference to the daemon."""
+
+    daemon_threads = True
+
+    def __init__(self: _Server, path: Path, daemon: Daemon) -> None:
+        """Listen on the socket.
+
+        Args:
+            path: The socket.
+            daemon: The daemon answering requests.
+        """
+        self.daemon = daemon
+        super().__init__(str(path), _Handler)
+
+
+class Daemon:
+    """Keep warm radios and answer CLI commands on a Unix socket.
+
+    Commands run one at a time, the radios' caches are not shared between
+    threads. Each radio's now playing watcher runs in the background.
+    """
+
+    def __init__(
+        self: Daemon,
+        path: Path | None = None,
+        max_age: float | None = FAVORITES_MAX_AGE,
+    ) -> None:
+        """Initialize the daemon.
+
+        Args:
+            path: The socket, see `socket_path`.
+            max_age: Seconds cached favorites are trusted, see `Radio.get_favorites`.
+        """
+        self.path = path or socket_path()
+        self.max_age = max_age
+        self._radios: dict[str | None, Radio] = {}
+        self._lock = threading.Lock()
+
+    def radio(self: Daemon, address: str | None) -> Radio:
+        """Get the warm radio for an address, finding it on first use.
+
+        Args:
+            address: The address, None finds one as `Radio.find` does.
+
+        Returns:
+            The radio.
+
+        Raises:
+            RadioNotFoundError: When no radio is found.
+        """
+        radio = self._radios.get(address)
+        if radio is not None:
+            return radio
+        from .radio import Radio  # pylint: disable=import-outside-toplevel
+
+        radio = Radio(ip_address=address)
+        if not radio.find():
+            msg = "Could not find a radio"
+            raise RadioNotFoundError(msg)
+        logger.info("Keeping radio %s", radio.ip_address)
+        radio.watcher.start()
+        self._radios[address] = radio
+        return radio
+
+    def respond(self: Daemon, line: bytes) -> bytes:
+        """Answer one request.
+
+        Args:
+            line: The JSON request.
+
+        Returns:
+            The JSON response line.
+        """
+        try:
+            request = json.loads(line)
+            command = request["command"]
+            if command == "ping":
+                result: Any = "pong"
+            else:
+                with self._lock:
+                    radio = self.radio(request.get("address"))
+                    if command in FAVORITES_COMMANDS:
+                        radio.get_favorites(max_age=self.max_age)
+                    result = run_command(radio, command, request.get("args") or {})
+                    if isinstance(result, Iterator):
+                        result = list(result)
+            response = {"ok": True, "result": result}
+        except Exception as exc:  # noqa: BLE001
+            # one bad request never takes the daemon down
+            logger.warning("Request failed: %s", exc)
+            response = {"ok": False, "error": str(exc), "type": type(exc).__name__}
+        return json.dumps(response).encode() + b"\n"
+
+    def serve(self: Daemon) -> None:
+        """Answer requests until interrupted or terminated.
+
+        Raises:
+            SkytuneError: When another daemon is listening on the socket.
+        """
+        client = DaemonClient.connect(self.path)
+        if client is not None:
+            client.close()
+            msg = f"A daemon is already running at {self.path}"
+            raise SkytuneError(msg)
+        with contextlib.suppress(FileNotFoundError):
+            self.path.unlink()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        def terminate(_signum: int, _frame: FrameType | None) -> None:
+            sys.exit(0)
+
+        signal.signal(signal.SIGTERM, terminate)
+        # the socket is created owner only, no other user can ever connect
+        umask = os.umask(0o177)
+        try:
+            server = _Server(self.path, self)
+        finally:
+            os.umask(umask)
+        try:
+            logger.info("Listening on %s", self.path)
+            server.serve_forever()
+        finally:
+            server.server_close()
+            with contextlib.suppress(FileNotFoundError):
+                self.path.unlink()
+            for radio in self._radios.values():
+                radio.watcher.stop(timeout=1)
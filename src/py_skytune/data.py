@@ -61,4 +61,184 @@ US_STATES = {
 COUNTRY_MAP = {
     "The United States of America": "United States",
     "The United Kingdom Of Great Britain And Northern Ireland": "United Kingdom",
+    "Bolivia (Plurinational State Of)": "Bolivia",
+    "Brunei Darussalam": "Brunei",
+    "Côte D'Ivoire": "Ivory Coast",
+    "Czechia": "Czech Republic",
+    "Iran (Islamic Republic Of)": "Iran",
+    "Lao People's Democratic Republic": "Laos",
+    "Republic Of Korea": "South Korea",
+    "Republic Of Moldova": "Moldova",
+    "Syrian Arab Republic": "Syria",
+    "Taiwan, Republic Of China": "Taiwan",
+    "The Netherlands": "Netherlands",
+    "The Republic Of North Macedonia": "North Macedonia",
+    "The Russian Federation": "Russia",
+    "Türkiye": "Turkey",
+    "United Republic Of Tanzania": "Tanzania",
+    "Venezuela (Bolivarian Republic Of)": "Venezuela",
+    "Viet Nam": "Vietnam",
+    "UK": "United Kingdom",
+    "USA": "United States",
+}
+
+# ISO 3166-1 alpha-2 codes, as in RadioBrowser's countrycode
+COUNTRY_CODES = {
+    "AD": "Andorra",
+    "AE": "United Arab Emirates",
+    "AF": "Afghanistan",
+    "AL": "Albania",
+    "AM": "Armenia",
+    "AO": "Angola",
+    "AR": "Argentina",
+    "AT": "Austria",
+    "AU": "Australia",
+    "AZ": "Azerbaijan",
+    "BA": "Bosnia and Herzegovina",
+    "BB": "Barbados",
+    "BD": "Bangladesh",
+    "BE": "Belgium",
+    "BG": "Bulgaria",
+    "BH": "Bahrain",
+    "BO": "Bolivia",
+    "BR": "Brazil",
+    "BS": "Bahamas",
+    "BY": "Belarus",
+    "BZ": "Belize",
+    "CA": "Canada",
+    "CD": "Congo",
+    "CH": "Switzerland",
+    "CI": "Ivory Coast",
+    "CL": "Chile",
+    "CM": "Cameroon",
+    "CN": "China",
+    "CO": "Colombia",
+    "CR": "Costa Rica",
+    "CU": "Cuba",
+    "CY": "Cyprus",
+    "CZ": "Czech Republic",
+    "DE": "Germany",
+    "DK": "Denmark",
+    "DO": "Dominican Republic",
+    "DZ": "Algeria",
+    "EC": "Ecuador",
+    "EE": "Estonia",
+    "EG": "Egypt",
+    "ES": "Spain",
+    "ET": "Ethiopia",
+    "FI": "Finland",
+    "FJ": "Fiji",
+    "FR": "France",
+    "GB": "United Kingdom",
+    "GE": "Georgia",
+    "GH": "Ghana",
+    "GR": "Greece",
+    "GT": "Guatemala",
+    "HK": "Hong Kong",
+    "HN": "Honduras",
+    "HR": "Croatia",
+    "HT": "Haiti",
+    "HU": "Hungary",
+    "ID": "Indonesia",
+    "IE": "Ireland",
+    "IL": "Israel",
+    "IN": "India",
+    "IQ": "Iraq",
+    "IR": "Iran",
+    "IS": "Iceland",
+    "IT": "Italy",
+    "JM": "Jamaica",
+    "JO": "Jordan",
+    "JP": "Japan",
+    "KE": "Kenya",
+    "KR": "South Korea",
+    "KW": "Kuwait",
+    "KZ": "Kazakhstan",
+    "LB": "Lebanon",
+    "LK": "Sri Lanka",
+    "LT": "Lithuania",
+    "LU": "Luxembourg",
+    "LV": "Latvia",
+    "MA": "Morocco",
+    "MC": "Monaco",
+    "MD": "Moldova",
+    "ME": "Montenegro",
+    "MK": "North Macedonia",
+    "MT": "Malta",
+    "MU": "Mauritius",
+    "MX": "Mexico",
+    "MY": "Malaysia",
+    "NG": "Nigeria",
+    "NI": "Nicaragua",
+    "NL": "Netherlands",
+    "NO": "Norway",
+    "NP": "Nepal",
+    "NZ": "New Zealand",
+    "OM": "Oman",
+    "PA": "Panama",
+    "PE": "Peru",
+    "PH": "Philippines",
+    "PK": "Pakistan",
+    "PL": "Poland",
+    "PR": "Puerto Rico",
+    "PT": "Portugal",
+    "PY": "Paraguay",
+    "QA": "Qatar",
+    "RO": "Romania",
+    "RS": "Serbia",
+    "RU": "Russia",
+    "SA": "Saudi Arabia",
+    "SE": "Sweden",
+    "SG": "Singapore",
+    "SI": "Slovenia",
+    "SK": "Slovakia",
+    "SN": "Senegal",
+    "SV": "El Salvador",
+    "SY": "Syria",
+    "TH": "Thailand",
+    "TN": "Tunisia",
+    "TR": "Turkey",
+    "TT": "Trinidad and Tobago",
+    "TW": "Taiwan",
+    "TZ": "Tanzania",
+    "UA": "Ukraine",
+    "UG": "Uganda",
+    "US": "United States",
+    "UY": "Uruguay",
+    "VE": "Venezuela",
+    "VN": "Vietnam",
+    "ZA": "South Africa",
+    "ZM": "Zambia",
+    "ZW": "Zimbabwe",
+}
+
+# RadioBrowser tags spelled differently from the radio's genre names
+GENRE_TAGS = {
+    "00s": "2000s",
+    "60's": "60s",
+    "70's": "70s",
+    "80's": "80s",
+    "90's": "90s",
+    "adult contemporary": "Adult Contemporary",
+    "ac": "Adult Contemporary",
+    "chill": "Chillout",
+    "chill out": "Chillout",
+    "christmas music": "Christmas",
+    "classic hits": "Oldies",
+    "dnb": "Drum and Bass",
+    "edm": "Dance",
+    "electronica": "Electronic",
+    "hiphop": "Hip Hop",
+    "hip hop": "Hip Hop",
+    "holiday": "Holiday & Seasonal",
+    "indie rock": "Indie",
+    "lounge": "Chillout",
+    "news talk": "News & Talk",
+    "pop music": "Pop",
+    "r and b": "R&B",
+    "rnb": "R&B",
+    "rap music": "Rap",
+    "schlager": "Pop",
+    "top hits": "Top 40",
+    "xmas": "Christmas",
 }
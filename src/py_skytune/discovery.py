@@ -0,0 +1,164 @@
+"""Find radios on the local network.
+
+Discovery only uses sockets, so it is shared by the blocking and the
+asyncio clients.
+"""
+
+from __future__ import annotations
+
+import logging
+import queue
+import socket
+import threading
+import time
+
+from typing import TYPE_CHECKING, Callable
+
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+
+logger = logging.getLogger(__name__)
+
+DNS_NAME = "skytune"
+SSDP_ADDRESS = ("239.255.255.250", 1900)
+SSDP_TARGET = "urn:schemas-upnp-org:device:InternetRadio:1"
+# seconds find waits for an SSDP reply, and for every strategy
+SSDP_WINDOW = 1.0
+FIND_TIMEOUT = 2.0
+PROBE_TIMEOUT = 0.5
+HTTP_PORT = 80
+
+
+def split_address(address: str) -> tuple[str, int]:
+    """Split an address such as "192.168.1.9" or "127.0.0.1:8080".
+
+    Args:
+        address: The address.
+
+    Returns:
+        The host and the port, 80 when not given.
+    """
+    host, _, port = address.rpartition(":")
+    if host and port.isdigit():
+        return host, int(port)
+    return address, HTTP_PORT
+
+
+def probe(address: str, timeout: float = PROBE_TIMEOUT) -> bool:
+    """Check a radio's web server accepts connections.
+
+    Args:
+        address: The address.
+        timeout: Seconds to wait for the connection.
+
+    Returns:
+        Whether it does.
+    """
+    try:
+        with socket.create_connection(split_address(address), timeout=timeout):
+            return True
+    except OSError:
+        return False
+
+
+def resolve(name: str = DNS_NAME) -> str | None:
+    """Look up a radio by name and probe it.
+
+    Args:
+        name: The DNS name.
+
+    Returns:
+        The address, or None when the name does not resolve or nothing answers.
+    """
+    try:
+        address = socket.gethostbyname(name)
+    except OSError:
+        return None
+    return address if probe(address) else None
+
+
+def ssdp_search(
+    window: float = SSDP_WINDOW,
+    first: bool = False,
+    target: tuple[str, int] = SSDP_ADDRESS,
+) -> list[str]:
+    """Collect the radios answering an SSDP M-SEARCH.
+
+    Args:
+        window: Seconds to listen for replies.
+        first: Whether to stop at the first reply.
+        target: Where to send the search, the SSDP multicast group by default.
+
+    Returns:
+        The addresses that replied, in reply order.
+    """
+    message = (
+        "M-SEARCH * HTTP/1.1\r\n"
+        f"HOST:{target[0]}:{target[1]}\r\n"
+        f"ST:{SSDP_TARGET}\r\n"
+        f"MX:{max(1, int(window))}\r\n"
+        'MAN:"ssdp:discover"\r\n'
+        "\r\n"
+    )
+    addresses: list[str] = []
+    deadline = time.monotonic() + window
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sock.sendto(message.encode(), target)
+        while (remaining := deadline - time.monotonic()) > 0:
+            sock.settimeout(remaining)
+            try:
+                _data, addr = sock.recvfrom(8192)
+            except socket.timeout:
+                break
+            if addr[0] not in addresses:
+                logger.debug("SSDP reply from %s", addr[0])
+                addresses.append(addr[0])
+            if first:
+                break
+    return addresses
+
+
+def first_of(
+    strategies: Mapping[str, Callable[[], str | None]],
+    timeout: float = FIND_TIMEOUT,
+) -> tuple[str, str] | None:
+    """Run discovery strategies at once and take the first answer.
+
+    Every strategy runs in a daemon thread, so a slow one, such as a DNS
+    lookup, is abandoned rather than waited for.
+
+    Args:
+        strategies: The strategies by name, each returns an address or None.
+        timeout: Seconds to wait for an answer.
+
+    Returns:
+        The name of the strategy that answered first and its address, or None.
+    """
+    answers: queue.Queue[tuple[str, str | None]] = queue.Queue()
+
+    def run(name: str, strategy: Callable[[], str | None]) -> None:
+        try:
+            address = strategy()
+        except OSError as exc:
+            logger.debug("Discovery by %s failed: %s", name, exc)
+            address = None
+        answers.put((name, address))
+
+    for name, strategy in strategies.items():
+        threading.Thread(
+            target=run,
+            args=(name, strategy),
+            name=f"skytune-find-{name}",
+            daemon=True,
+        ).start()
+    deadline = time.monotonic() + timeout
+    for _strategy in strategies:
+        try:
+            name, address = answers.get(timeout=max(0.0, deadline - time.monotonic()))
+        except queue.Empty:
+            break
+        if address:
+            return name, address
+    return None
@@ -0,0 +1,525 @@
+# ruff: noqa: T201
+"""A local Skytune radio emulator for benchmarks and load tests.
+
+The emulator serves the same endpoints the radio's embedded web server
+does, in the formats `Radio` parses, with configurable latency, jitter and
+error injection::
+
+    python -m py_skytune.emulator --favorites 200 --latency 0.2 --port 8080
+    SKYTUNE_IP_ADDRESS=127.0.0.1:8080 skytune favorites
+
+It also stands in for the RadioBrowser station lookup, point
+`Radio(rb_base_url=...)` at it.
+"""
+
+from __future__ import annotations
+
+import argparse
+import html
+import json
+import random
+import threading
+import time
+import uuid
+
+from collections import Counter
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING
+from urllib.parse import parse_qs, urlparse
+
+from .data import COUNTRY_CODES, US_STATES
+
+
+if TYPE_CHECKING:
+    from types import TracebackType
+
+
+REGIONS = {
+    "Africa": ("Egypt", "Ghana", "Kenya", "Morocco", "Nigeria", "South Africa", "Tanzania"),
+    "Asia": (
+        "China", "Hong Kong", "India", "Indonesia", "Israel", "Japan", "Malaysia",
+        "Philippines", "Singapore", "South Korea", "Taiwan", "Thailand", "Turkey", "Vietnam",
+    ),
+    "Europe": (
+        "Austria", "Belgium", "Croatia", "Czech Republic", "Denmark", "Finland", "France",
+        "Georgia", "Germany", "Greece", "Hungary", "Ireland", "Italy", "Netherlands", "Norway",
+        "Poland", "Portugal", "Romania", "Russia", "Spain", "Sweden", "Switzerland", "Ukraine",
+        "United Kingdom",
+    ),
+    "North America": ("Canada", "Mexico", "United States"),
+    "Oceania": ("Australia", "Fiji", "New Zealand"),
+    "South America": ("Argentina", "Brazil", "Chile", "Colombia", "Peru", "Venezuela"),
+}
+
+STATES_PROVINCES = {
+    "Australia": (
+        "New South Wales", "Queensland", "South Australia", "Tasmania", "Victoria",
+        "Western Australia",
+    ),
+    "Canada": (
+        "Alberta", "British Columbia", "Manitoba", "New Brunswick", "Nova Scotia", "Ontario",
+        "Quebec", "Saskatchewan",
+    ),
+    "United States": tuple(US_STATES),
+}
+
+GENRES = {
+    "Alternative": ("College", "Indie", "Punk"),
+    "Blues": ("Chicago Blues", "Delta Blues"),
+    "Classical": ("Baroque", "Opera", "Symphony"),
+    "Country": ("Bluegrass", "Classic Country", "Country Hits"),
+    "Dance": ("Disco", "House", "Techno", "Trance"),
+    "Electronic": ("Ambient", "Chillout", "Downtempo", "Drum and Bass"),
+    "Folk": ("Celtic", "Singer-Songwriter"),
+    "Hip Hop": ("Old School", "Rap"),
+    "Holiday & Seasonal": ("Christmas", "Halloween"),
+    "Jazz": ("Bebop", "Smooth Jazz", "Swing"),
+    "Latin": ("Reggaeton", "Salsa", "Tango"),
+    "News & Talk": ("News", "Sports", "Talk"),
+    "Oldies": ("50s", "60s", "70s", "80s", "90s"),
+    "Pop": ("Adult Contemporary", "Top 40"),
+    "R&B": ("Motown", "Soul"),
+    "Reggae": ("Dub", "Ska"),
+    "Rock": ("Classic Rock", "Hard Rock", "Metal", "Progressive Rock"),
+    "Various": (),
+    "World": ("African", "Asian", "European"),
+}
+
+DEFAULT_LOCATION = (
+    list(REGIONS).index("Europe") + 1,
+    REGIONS["Europe"].index("Switzerland") + 1,
+    -1,
+)
+DEFAULT_GENRE = (list(GENRES).index("Various") + 1, -1)
+CODES = {name: code for code, name in COUNTRY_CODES.items()}
+
+
+def catalog_text() -> str:
+    """Build the get_CG.php payload.
+
+    Returns:
+        The mCountryList and mGenreList javascript.
+    """
+    locations: list[list[int | str]] = [[0, -1, -1, -1, "All"]]
+    for region_idx, (region, countries) in enumerate(REGIONS.items(), start=1):
+        locations.append([len(locations), region_idx, -1, -1, region])
+        for country_idx, country in enumerate(countries, start=1):
+            locations.append([len(locations), region_idx, country_idx, -1, country])
+            for sp_idx, state_province in enumerate(STATES_PROVINCES.get(country, ()), start=1):
+                locations.append([len(locations), region_idx, country_idx, sp_idx, state_province])
+    genres: list[list[int | str]] = []
+    for genre_idx, (genre, subgenres) in enumerate(GENRES.items(), start=1):
+        genres.append([genre_idx, -1, genre])
+        genres.extend(
+            [genre_idx, subgenre_idx, subgenre]
+            for subgenre_idx, subgenre in enumerate(subgenres, start=1)
+        )
+    # the radio quotes with single quotes, which the client swaps back
+    return (
+        f"mCountryList = {json.dumps(locations, separators=(',', ':'))};\n"
+        f"mGenreList = {json.dumps(genres, separators=(',', ':'))};\n"
+    ).replace('"', "'")
+
+
+@dataclass
+class EmulatorConfig:
+    """The emulator settings.
+
+    Attributes:
+        favorites: The number of favorites to start with.
+        capacity: The maximum number of favorites.
+        items_per_page: The favorites per favList.php page.
+        latency: The base per-request latency in seconds.
+        jitter: The maximum random latency added or removed, in seconds.
+        error_rate: The share of requests answered with `error_status`.
+        error_status: The HTTP status for injected errors.
+        drop_rate: The share of requests whose connection is closed unanswered.
+        seed: The random seed, for repeatable runs.
+        stations: The number of RadioBrowser stations to serve.
+    """
+
+    favorites: int = 20
+    capacity: int = 200
+    items_per_page: int = 10
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    error_status: int = 500
+    drop_rate: float = 0.0
+    seed: int | None = None
+    stations: int = 0
+
+
+@dataclass
+class EmulatedFavorite:
+    """A favorite as the radio stores it."""
+
+    name: str
+    url: str
+    skytune_maintained: bool
+    location: tuple[int, int, int]
+    genre: tuple[int, int]
+
+    def push(self: EmulatedFavorite) -> str:
+        """Get the myFavChannelList.push line."""
+        location = ",".join(str(part) for part in self.location)
+        genre = ",".join(str(part) for part in self.genre)
+        return (
+            f'myFavChannelList.push(["{html.escape(self.name)}","{html.escape(self.url)}",'
+            f"{int(self.skytune_maintained)},[[{location}],[{genre}]]]);"
+        )
+
+
+class Emulator:
+    """An emulated Skytune radio on a local HTTP server.
+
+    Use it as a context manager, then point a `Radio` at `ip_address`.
+    """
+
+    def __init__(
+        self: Emulator,
+        config: EmulatorConfig | None = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        """Initialize the emulator.
+
+        Args:
+            config: The emulator settings.
+            host: The address to listen on.
+            port: The port to listen on, 0 picks a free one.
+        """
+        self.config = config or EmulatorConfig()
+        self.catalog = catalog_text()
+        self.requests: Counter[str] = Counter()
+        self.playing: int = -1
+        self._lock = threading.Lock()
+        self._random = random.Random(self.config.seed)
+        self.favorites = [
+            EmulatedFavorite(
+                name=f"Station {idx:04d}",
+                url=f"http://stream.example.com/{idx}",
+                skytune_maintained=False,
+                location=DEFAULT_LOCATION,
+                genre=DEFAULT_GENRE,
+            )
+            for idx in range(self.config.favorites)
+        ]
+        self.stations = {
+            station["stationuuid"]: station
+            for station in (self._station(idx) for idx in range(self.config.stations))
+        }
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    def __enter__(self: Emulator) -> Emulator:
+        """Start serving."""
+        self.start()
+        return self
+
+    def __exit__(
+        self: Emulator,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Stop serving."""
+        self.stop()
+
+    @property
+    def ip_address(self: Emulator) -> str:
+        """Get the host:port to hand to `Radio`."""
+        host, port = self._server.server_address[:2]
+        if isinstance(host, bytes):
+            host = host.decode()
+        return f"{host}:{port}"
+
+    def start(self: Emulator) -> None:
+        """Serve in a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self: Emulator) -> None:
+        """Stop serving and close the socket."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def serve_forever(self: Emulator) -> None:
+        """Serve in the current thread."""
+        self._server.serve_forever()
+
+    def page(self: Emulator, page: int) -> str:
+        """Build a favList.php page.
+
+        Args:
+            page: The page number.
+
+        Returns:
+            The page body.
+        """
+        per_page = self.config.items_per_page
+        with self._lock:
+            total = len(self.favorites)
+            items = self.favorites[page * per_page : (page + 1) * per_page]
+            playing = self.playing
+        lines = [
+            "var myFavChannelList = new Array();",
+            f"favListInfo = {{curPage:{page}, total:{total}, favCapacity:{self.config.capacity},"
+            f" itemsPerPage:{per_page}, chIndex:{playing}, rowIdx:-1,"
+            f" curPageCount:{len(items)}}};",
+        ]
+        lines.extend(favorite.push() for favorite in items)
+        return "\n".join(lines) + "\n"
+
+    def _station(self: Emulator, idx: int) -> dict[str, str]:
+        """Build a RadioBrowser station record.
+
+        US stations carry a state, spelled out or abbreviated as on RadioBrowser.
+
+        Args:
+            idx: The station number.
+
+        Returns:
+            The station record.
+        """
+        country = self._random.choice([name for names in REGIONS.values() for name in names])
+        state = ""
+        if country == "United States":
+            name, abbr = self._random.choice(list(US_STATES.items()))
+            state = self._random.choice((name, abbr))
+        genre = self._random.choice(list(GENRES))
+        url = f"http://stream.example.com/rb/{idx}"
+        return {
+            "stationuuid": str(uuid.UUID(int=self._random.getrandbits(128), version=4)),
+            "name": f"RadioBrowser {idx:04d}",
+            "url": url,
+            "url_resolved": url,
+            "country": country,
+            "countrycode": CODES.get(country, ""),
+            "state": state,
+            "tags": ",".join(tag.lower() for tag in (genre, *GENRES[genre][:1])),
+        }
+
+    def lookup(self: Emulator, uuids: str) -> list[dict[str, str]]:
+        """Handle RadioBrowser's json/stations/byuuid.
+
+        Args:
+            uuids: The comma separated station uuids.
+
+        Returns:
+            The stations found.
+        """
+        return [self.stations[key] for key in uuids.split(",") if key in self.stations]
+
+    def now_playing(self: Emulator) -> dict[str, str]:
+        """Build the playing.php payload.
+
+        Returns:
+            The status and the name of the playing favorite.
+        """
+        with self._lock:
+            if 0 <= self.playing < len(self.favorites):
+                return {"chStatus": "Status: playing", "name": self.favorites[self.playing].name}
+        return {"chStatus": "Status: stopped", "name": ""}
+
+    def add(self: Emulator, form: dict[str, str]) -> None:
+        """Handle addCh.cgi.
+
+        Args:
+            form: The posted form.
+        """
+        location = tuple(int(part) for part in form["chCountry"].split(";"))
+        genre = tuple(int(part) for part in form["chGenre"].split(";"))
+        with self._lock:
+            if len(self.favorites) >= self.config.capacity:
+                return
+            self.favorites.append(
+                EmulatedFavorite(
+                    name=form["chName"],
+                    url=form["chUrl"],
+                    skytune_maintained=False,
+                    location=(location[0], location[1], location[2]),
+                    genre=(genre[0], genre[1]),
+                ),
+            )
+
+    def delete(self: Emulator, index: int) -> None:
+        """Handle delCh.cgi.
+
+        Args:
+            index: The zero based favorite index.
+        """
+        with self._lock:
+            if 0 <= index < len(self.favorites):
+                self.favorites.pop(index)
+                if index == self.playing:
+                    self.playing = -1
+                elif index < self.playing:
+                    self.playing -= 1
+
+    def move(self: Emulator, source: int, destination: int) -> None:
+        """Handle moveCh.cgi.
+
+        Args:
+            source: The zero based index to move from.
+            destination: The zero based index to move to.
+        """
+        with self._lock:
+            if 0 <= source < len(self.favorites) and 0 <= destination < len(self.favorites):
+                self.favorites.insert(destination, self.favorites.pop(source))
+
+    def play(self: Emulator, index: int) -> None:
+        """Handle doApi.cgi.
+
+        Args:
+            index: The zero based favorite index.
+        """
+        with self._lock:
+            self.playing = index if 0 <= index < len(self.favorites) else -1
+
+    def _delay(self: Emulator) -> None:
+        """Sleep for the configured latency and jitter."""
+        with self._lock:
+            jitter = self._random.uniform(-self.config.jitter, self.config.jitter)
+        delay = max(0.0, self.config.latency + jitter)
+        if delay:
+            time.sleep(delay)
+
+    def _fault(self: Emulator) -> str | None:
+        """Pick an injected fault for a request.
+
+        Returns:
+            "drop", "error" or None.
+        """
+        with self._lock:
+            roll = self._random.random()
+        if roll < self.config.drop_rate:
+            return "drop"
+        if roll < self.config.drop_rate + self.config.error_rate:
+            return "error"
+        return None
+
+    def _handler(self: Emulator) -> type[BaseHTTPRequestHandler]:
+        """Build the request handler bound to this emulator."""
+        emulator = self
+
+        class Handler(BaseHTTPRequestHandler):
+            """The emulated radio's request handler."""
+
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self: Handler) -> None:
+                """Answer a GET request."""
+                self._dispatch({})
+
+            def do_POST(self: Handler) -> None:
+                """Answer a POST request."""
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length).decode()
+                form = {key: values[0] for key, values in parse_qs(body).items()}
+                self._dispatch(form)
+
+            def _dispatch(self: Handler, form: dict[str, str]) -> None:
+                parsed = urlparse(self.path)
+                query = {key: values[0] for key, values in parse_qs(parsed.query).items()}
+                path = parsed.path.lstrip("/")
+                with emulator._lock:
+                    emulator.requests[path] += 1
+                emulator._delay()
+                fault = emulator._fault()
+                if fault == "drop":
+                    self.close_connection = True
+                    return
+                if fault == "error":
+                    self._reply(emulator.config.error_status, "error")
+                    return
+                content_type = "text/html"
+                if path == "php/favList.php":
+                    body = emulator.page(int(query.get("PG", 0)))
+                elif path == "php/get_CG.php":
+                    body = emulator.catalog
+                elif path == "php/playing.php":
+                    body = json.dumps(emulator.now_playing())
+                    content_type = "application/json"
+                elif path == "addCh.cgi":
+                    emulator.add(form)
+                    body = "OK"
+                elif path == "delCh.cgi":
+                    emulator.delete(int(query["CI"]))
+                    body = "OK"
+                elif path == "moveCh.cgi":
+                    emulator.move(int(query["CI"]), int(query["DI"]))
+                    body = "OK"
+                elif path == "doApi.cgi":
+                    emulator.play(int(query["CI"]))
+                    body = "OK"
+                elif path.startswith("json/stations/byuuid"):
+                    uuids = path.removeprefix("json/stations/byuuid").strip("/")
+                    uuids = uuids or form.get("uuids") or query.get("uuids", "")
+                    body = json.dumps(emulator.lookup(uuids))
+                    content_type = "application/json"
+                else:
+                    self._reply(404, "not found")
+                    return
+                self._reply(200, body, content_type)
+
+            def _reply(
+                self: Handler,
+                status: int,
+                body: str,
+                content_type: str = "text/html",
+            ) -> None:
+                payload = body.encode()
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self: Handler, *args: object) -> None:
+                """Silence the request log."""
+
+        return Handler
+
+
+def main() -> None:
+    """Run the emulator from the command line."""
+    parser = argparse.ArgumentParser(description="Emulate a Skytune radio")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--favorites", type=int, default=20)
+    parser.add_argument("--capacity", type=int, default=200)
+    parser.add_argument("--items-per-page", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds per request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Seconds of random latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of 500 replies")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="Share of dropped replies")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--stations", type=int, default=0, help="RadioBrowser stations to serve")
+    args = parser.parse_args()
+
+    config = EmulatorConfig(
+        favorites=args.favorites,
+        capacity=args.capacity,
+        items_per_page=args.items_per_page,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        drop_rate=args.drop_rate,
+        seed=args.seed,
+        stations=args.stations,
+    )
+    emulator = Emulator(config=config, host=args.host, port=args.port)
+    print(f"Emulating a Skytune radio at {emulator.ip_address}")
+    for station_uuid in emulator.stations:
+        print(f"RadioBrowser station {station_uuid}")
+    try:
+        emulator.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""The exceptions raised by the radio clients."""
+
+from __future__ import annotations
+
+
+class SkytuneError(RuntimeError):
+    """The base of every py-skytune error."""
+
+
+class RadioNotFoundError(SkytuneError):
+    """No radio could be discovered."""
+
+
+class RadioConnectionError(SkytuneError):
+    """The radio could not be reached, retries included.
+
+    Attributes:
+        url: The URL, relative to the radio.
+        attempts: The number of attempts made.
+    """
+
+    def __init__(self: RadioConnectionError, msg: str, url: str, attempts: int) -> None:
+        """Initialize the error.
+
+        Args:
+            msg: The error message.
+            url: The URL, relative to the radio.
+            attempts: The number of attempts made.
+        """
+        super().__init__(msg)
+        self.url = url
+        self.attempts = attempts
+
+
+class RadioTimeoutError(RadioConnectionError):
+    """The radio did not answer in time, retries included."""
+
+
+class RadioResponseError(SkytuneError):
+    """The radio answered with an HTTP error status.
+
+    Attributes:
+        url: The URL, relative to the radio.
+        status: The HTTP status.
+    """
+
+    def __init__(self: RadioResponseError, msg: str, url: str, status: int) -> None:
+        """Initialize the error.
+
+        Args:
+            msg: The error message.
+            url: The URL, relative to the radio.
+            status: The HTTP status.
+        """
+        super().__init__(msg)
+        self.url = url
+        self.status = status
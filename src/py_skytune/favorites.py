@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import html
 import re
+import sys
 
 from dataclasses import dataclass
 
@@ -38,8 +39,24 @@ RE_CHANNEL = re.compile(
     re.VERBOSE,
 )
 
+# A whole myFavChannelList.push line, name and url stay joined so the only
+# backtracking is over the short fixed tail; split them with rpartition.
+RE_CHANNEL_PUSH = re.compile(
+    r"""
+    ^myFavChannelList\.push\(\["
+    (?P<name_url>.*)",
+    (?P<skytune_maintained>\d),
+    \[
+    \[(?P<location>-?\d+,-?\d+,-?\d+)\],
+    \[(?P<genre>-?\d+,-?\d+)\]
+    \]
+    \]\);
+""",
+    re.VERBOSE | re.MULTILINE,
+)
 
-@dataclass
+
+@dataclass(slots=True)
 class FavDetails:
     """The FavDetails class."""
 
@@ -57,9 +74,13 @@ class FavDetails:
         return {"capacity": self.capacity, "used": self.total, "free": self.capacity - self.total}
 
 
-@dataclass
+@dataclass(slots=True)
 class Favorite:
-    """The Favorite class."""
+    """The Favorite class.
+
+    Favorites are slotted and their location and genre names are interned, so
+    thousands of favorites share one copy of each catalog name.
+    """
 
     name: str
     url: str
@@ -73,6 +94,8 @@ class Favorite:
         # the skytune api may return html encoded chars
         self.name = html.unescape(self.name)
         self.url = html.unescape(self.url)
+        self.location = sys.intern(self.location)
+        self.genre = sys.intern(self.genre)
 
     def json(self: Favorite) -> dict[str, str]:
         """Get the JSON representation."""
@@ -2,17 +2,75 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
+from .utils import normalize_name
 
-@dataclass
+
+@dataclass(slots=True)
 class Genres:
-    """All the genres."""
+    """All the genres.
+
+    Lookups are served from indexes built by `build_index`, the tree is only
+    walked for entries added after the last build.
+    """
 
     genres: list[Genre]
+    _by_uid: dict[tuple[int, int], Genre | SubGenre] = field(
+        default_factory=dict,
+        init=False,
+        repr=False,
+        compare=False,
+    )
+    _by_name: dict[str, Genre | SubGenre] = field(
+        default_factory=dict,
+        init=False,
+        repr=False,
+        compare=False,
+    )
+    _by_normalized_name: dict[str, Genre | SubGenre] = field(
+        default_factory=dict,
+        init=False,
+        repr=False,
+        compare=False,
+    )
+
+    def build_index(self: Genres) -> None:
+        """Index every genre and subgenre by uid and name.
+
+        The first entry in tree order wins when names collide, matching the scans.
+        """
+        self._by_uid.clear()
+        self._by_name.clear()
+        self._by_normalized_name.clear()
+        for genre in self.genres:
+            entries: tuple[Genre | SubGenre, ...] = (genre, *genre.subgenres)
+            for entry in entries:
+                self._by_uid.setdefault(entry.uid, entry)
+                self._by_name.setdefault(entry.name, entry)
+                self._by_normalized_name.setdefault(normalize_name(entry.name), entry)
 
     def find_by_uid(self: Genres, uid: tuple[int, int]) -> Genre | SubGenre:
         """Find a genre by its uid."""
+        try:
+            return self._by_uid[uid]
+        except KeyError:
+            return self._scan_by_uid(uid)
+
+    def find_by_name(self: Genres, name: str) -> Genre | SubGenre:
+        """Find a genre by its name, falling back to a case-insensitive match."""
+        try:
+            return self._by_name[name]
+        except KeyError:
+            pass
+        try:
+            return self._by_normalized_name[normalize_name(name)]
+        except (AttributeError, KeyError):
+            # a name that is not a string, such as None, reaches the scan's ValueError
+            return self._scan_by_name(name)
+
+    def _scan_by_uid(self: Genres, uid: tuple[int, int]) -> Genre | SubGenre:
+        """Find a genre by its uid, walking the tree."""
         for genre in self.genres:
             if genre.uid == uid:
                 return genre
@@ -22,8 +80,8 @@ class Genres:
         msg = f"Could not find genre with uid {uid}"
         raise ValueError(msg)
 
-    def find_by_name(self: Genres, name: str) -> Genre | SubGenre:
-        """Find a genre by its name."""
+    def _scan_by_name(self: Genres, name: str) -> Genre | SubGenre:
+        """Find a genre by its name, walking the tree."""
         for genre in self.genres:
             if genre.name == name:
                 return genre
@@ -34,7 +92,7 @@ class Genres:
         raise ValueError(msg)
 
 
-@dataclass
+@dataclass(slots=True)
 class Genre:
     """The genre class."""
 
@@ -47,7 +105,7 @@ class Genre:
         return self.name
 
 
-@dataclass
+@dataclass(slots=True)
 class SubGenre:
     """The SubGenre class."""
 
@@ -2,17 +2,76 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
+from .utils import normalize_name
 
-@dataclass
+
+@dataclass(slots=True)
 class Locations:
-    """The Loactions class."""
+    """The Loactions class.
+
+    Lookups are served from indexes built by `build_index`, the tree is only
+    walked for entries added after the last build.
+    """
 
     regions: list[Region]
+    _by_uid: dict[tuple[int, int, int], Country | StateProvince] = field(
+        default_factory=dict,
+        init=False,
+        repr=False,
+        compare=False,
+    )
+    _by_name: dict[str, Country | StateProvince] = field(
+        default_factory=dict,
+        init=False,
+        repr=False,
+        compare=False,
+    )
+    _by_normalized_name: dict[str, Country | StateProvince] = field(
+        default_factory=dict,
+        init=False,
+        repr=False,
+        compare=False,
+    )
+
+    def build_index(self: Locations) -> None:
+        """Index every country and state/province by uid and name.
+
+        The first entry in tree order wins when names collide, matching the scans.
+        """
+        self._by_uid.clear()
+        self._by_name.clear()
+        self._by_normalized_name.clear()
+        for region in self.regions:
+            for country in region.countries:
+                entries: tuple[Country | StateProvince, ...] = (country, *country.states_provinces)
+                for entry in entries:
+                    self._by_uid.setdefault(entry.uid, entry)
+                    self._by_name.setdefault(entry.name, entry)
+                    self._by_normalized_name.setdefault(normalize_name(entry.name), entry)
 
     def find_by_uid(self: Locations, uid: tuple[int, int, int]) -> Country | StateProvince:
         """Find a country by its uid."""
+        try:
+            return self._by_uid[uid]
+        except KeyError:
+            return self._scan_by_uid(uid)
+
+    def find_by_name(self: Locations, name: str) -> Country | StateProvince:
+        """Find a country by its name, falling back to a case-insensitive match."""
+        try:
+            return self._by_name[name]
+        except KeyError:
+            pass
+        try:
+            return self._by_normalized_name[normalize_name(name)]
+        except (AttributeError, KeyError):
+            # a name that is not a string, such as None, reaches the scan's ValueError
+            return self._scan_by_name(name)
+
+    def _scan_by_uid(self: Locations, uid: tuple[int, int, int]) -> Country | StateProvince:
+        """Find a country by its uid, walking the tree."""
         for region in self.regions:
             for country in region.countries:
                 if country.uid == uid:
@@ -23,8 +82,8 @@ class Locations:
         msg = f"Could not find location with uid {uid}"
         raise ValueError(msg)
 
-    def find_by_name(self: Locations, name: str) -> Country | StateProvince:
-        """Find a country by its name."""
+    def _scan_by_name(self: Locations, name: str) -> Country | StateProvince:
+        """Find a country by its name, walking the tree."""
         for region in self.regions:
             for country in region.countries:
                 if country.name == name:
@@ -36,7 +95,7 @@ class Locations:
         raise ValueError(msg)
 
 
-@dataclass
+@dataclass(slots=True)
 class Region:
     """The ParentLocation class."""
 
@@ -48,7 +107,7 @@ class Region:
         return self.name
 
 
-@dataclass
+@dataclass(slots=True)
 class Country:
     """The SubLocation class."""
 
@@ -62,7 +121,7 @@ class Country:
         return f"{self.region}/{self.name}"
 
 
-@dataclass
+@dataclass(slots=True)
 class StateProvince:
     """The StateProvince class."""
 
@@ -0,0 +1,259 @@
+"""Plan the moves needed to reorder favorites on the radio."""
+
+from __future__ import annotations
+
+import bisect
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from .favorites import Favorite
+
+
+@dataclass
+class Move:
+    """A single moveCh.cgi call.
+
+    The radio pops the favorite at `source` and inserts it at `destination`,
+    both zero based.
+    """
+
+    source: int
+    destination: int
+    favorite: Favorite
+
+    def __str__(self: Move) -> str:
+        """Return the string representation."""
+        return f"Moving {self.favorite.name} to {self.destination} from {self.source}"
+
+    @property
+    def params(self: Move) -> dict[str, int]:
+        """Get the moveCh.cgi parameters."""
+        return {"CI": self.source, "DI": self.destination, "EX": 0}
+
+
+@dataclass
+class MovePlan:
+    """The moves that turn the current order into the target order."""
+
+    target: list[Favorite]
+    moves: list[Move] = field(default_factory=list)
+
+    @property
+    def move_count(self: MovePlan) -> int:
+        """Get the number of moveCh.cgi calls."""
+        return len(self.moves)
+
+
+def longest_increasing_subsequence(values: Sequence[int]) -> set[int]:
+    """Find a longest strictly increasing subsequence.
+
+    Args:
+        values: The values.
+
+    Returns:
+        The positions in `values` that form the subsequence.
+    """
+    tails: list[int] = []
+    tail_positions: list[int] = []
+    previous = [-1] * len(values)
+    for position, value in enumerate(values):
+        idx = bisect.bisect_left(tails, value)
+        if idx:
+            previous[position] = tail_positions[idx - 1]
+        if idx == len(tails):
+            tails.append(value)
+            tail_positions.append(position)
+        else:
+            tails[idx] = value
+            tail_positions[idx] = position
+    result = set()
+    position = tail_positions[-1] if tail_positions else -1
+    while position != -1:
+        result.add(position)
+        position = previous[position]
+    return result
+
+
+class _SlotCounts:
+    """Count the occupied slots before a slot, a Fenwick tree."""
+
+    def __init__(self: _SlotCounts, size: int) -> None:
+        """Initialize the counts, every slot empty.
+
+        Args:
+            size: The number of slots.
+        """
+        self._tree = [0] * (size + 1)
+
+    def add(self: _SlotCounts, slot: int, delta: int) -> None:
+        """Occupy or free a slot.
+
+        Args:
+            slot: The slot.
+            delta: 1 to occupy it, -1 to free it.
+        """
+        idx = slot + 1
+        while idx < len(self._tree):
+            self._tree[idx] += delta
+            idx += idx & -idx
+
+    def before(self: _SlotCounts, slot: int) -> int:
+        """Count the occupied slots before a slot.
+
+        Args:
+            slot: The slot.
+
+        Returns:
+            The count, which is the slot's index in the list.
+        """
+        count = 0
+        idx = slot
+        while idx:
+            count += self._tree[idx]
+            idx -= idx & -idx
+        return count
+
+
+def plan_order(order: Sequence[int]) -> list[tuple[int, int, int]]:
+    """Plan the fewest pop/insert moves that produce a target order.
+
+    The items already in target order (a longest increasing subsequence of
+    their current positions) stay put, every other item is moved once, in
+    target order, to just after its target predecessor.
+
+    A moved item always lands in the run of moved items right after the
+    closest stable item before it in the target order, so every item gets
+    a slot for where it starts and, if moved, one for where it lands. The
+    list index of an item is then the number of occupied slots before its
+    own, counted in O(log n).
+
+    Args:
+        order: For each target position, the current position of its item.
+
+    Returns:
+        The (item, source, destination) moves, in the order they must run,
+        where item is the original position of the moved item.
+    """
+    stable = longest_increasing_subsequence(order)
+    # the moved items following each stable item, -1 for those before the first
+    runs: dict[int, list[int]] = {}
+    anchor = -1
+    for position, item in enumerate(order):
+        if position in stable:
+            anchor = item
+        else:
+            runs.setdefault(anchor, []).append(item)
+
+    start = [0] * len(order)
+    landing: dict[int, int] = {}
+    slot = 0
+    for anchor in range(-1, len(order)):
+        if anchor != -1:
+            start[anchor] = slot
+            slot += 1
+        for item in runs.get(anchor, ()):
+            landing[item] = slot
+            slot += 1
+
+    counts = _SlotCounts(slot)
+    for item_slot in start:
+        counts.add(item_slot, 1)
+    moves = []
+    for position, item in enumerate(order):
+        if position in stable:
+            continue
+        source = counts.before(start[item])
+        counts.add(start[item], -1)
+        destination = counts.before(landing[item])
+        counts.add(landing[item], 1)
+        if source != destination:
+            moves.append((item, source, destination))
+    return moves
+
+
+def plan_moves(current: Sequence[Favorite], target: Sequence[Favorite]) -> MovePlan:
+    """Plan the moves that reorder the current favorites into the target.
+
+    Args:
+        current: The favorites in their order on the radio.
+        target: The same favorite objects in the wanted order.
+
+    Returns:
+        The move plan.
+    """
+    positions = {id(favorite): idx for idx, favorite in enumerate(current)}
+    order = [positions[id(favorite)] for favorite in target]
+    moves = [
+        Move(source=source, destination=destination, favorite=current[item])
+        for item, source, destination in plan_order(order)
+    ]
+    return MovePlan(target=list(target), moves=moves)
+
+
+@dataclass
+class SyncPlan:
+    """The deletes, adds and moves that turn the radio into a target list."""
+
+    deletes: list[Favorite] = field(default_factory=list)
+    adds: list[Favorite] = field(default_factory=list)
+    moves: MovePlan = field(default_factory=lambda: MovePlan(target=[]))
+    skipped: list[Favorite] = field(default_factory=list)
+
+    def __str__(self: SyncPlan) -> str:
+        """Return the string representation."""
+        lines = [f"Deleting {fav.uid} {fav.name}" for fav in self.deletes]
+        lines.extend(f"Adding {fav.name} {fav.url}" for fav in self.adds)
+        lines.extend(str(move) for move in self.moves.moves)
+        lines.extend(f"Skipping skytune maintained {fav.name}" for fav in self.skipped)
+        lines.append(
+            f"{len(self.deletes)} delete(s), {len(self.adds)} add(s),"
+            f" {self.moves.move_count} move(s)",
+        )
+        return "\n".join(lines)
+
+    @property
+    def call_count(self: SyncPlan) -> int:
+        """Get the number of requests the sync sends."""
+        return len(self.deletes) + len(self.adds) + self.moves.move_count
+
+
+def plan_sync(current: Sequence[Favorite], target: Sequence[Favorite]) -> SyncPlan:
+    """Plan the changes that turn the current favorites into the target list.
+
+    Favorites are matched by name and URL, duplicates pair up in order.
+    Deletes run from the bottom up, adds are appended to the end and the
+    moves then reorder the result.
+
+    Args:
+        current: The favorites in their order on the radio.
+        target: The wanted favorites in the wanted order.
+
+    Returns:
+        The sync plan.
+    """
+    available: dict[tuple[str, str], list[Favorite]] = {}
+    for favorite in reversed(current):
+        available.setdefault((favorite.name, favorite.url), []).append(favorite)
+
+    plan = SyncPlan()
+    wanted = []
+    for favorite in target:
+        matches = available.get((favorite.name, favorite.url))
+        if matches:
+            wanted.append(matches.pop())
+        elif favorite.skytune_maintained:
+            plan.skipped.append(favorite)
+        else:
+            plan.adds.append(favorite)
+            wanted.append(favorite)
+
+    kept = {id(favorite) for favorite in wanted}
+    plan.deletes = [favorite for favorite in reversed(current) if id(favorite) not in kept]
+    after_adds = [favorite for favorite in current if id(favorite) in kept] + plan.adds
+    plan.moves = plan_moves(after_adds, wanted)
+    return plan
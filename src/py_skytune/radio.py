@@ -2,255 +2,384 @@
 
 from __future__ import annotations
 
-import contextlib
-import json
+import io
+import itertools
 import logging
-import os
-import socket
-import sys
+import math
+import threading
+import time
 
-from pathlib import Path
-from typing import Callable
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable
 
 import requests
+import urllib3
 
-from pyradios import RadioBrowser
+from requests.adapters import HTTPAdapter
 
-from .data import COUNTRY_MAP, US_STATES
-from .favorites import RE_CHANNEL, RE_FAV, FavDetails, Favorite
-from .genre import Genre, Genres, SubGenre
-from .locations import Country, Locations, Region, StateProvince
+from .backup import (
+    ImportReport,
+    RowError,
+    format_for,
+    open_favorites,
+    read_favorites,
+    write_favorites,
+)
+from .base import RadioBase
+from .cache import StationCache
+from .exceptions import RadioResponseError, SkytuneError
+from .favorites import Favorite
+from .genre import Genres
+from .locations import Locations
+from .plan import Move, MovePlan, SyncPlan, plan_sync
+from .resolver import GenreResolver, LocationResolver
+from .stats import RequestEvent
+from .watch import NowPlayingWatcher
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from typing import TextIO
+
+    from pyradios import RadioBrowser
+
+    from .favorites import FavDetails
+    from .genre import Genre, SubGenre
+    from .locations import Country, StateProvince
 
 
 logger = logging.getLogger(__name__)
 
+HTTP_ERROR = 400
+# uuids per RadioBrowser lookup, keeping the query string well under URL limits
+STATION_BATCH = 100
 
-class Radio:
+
+class Radio(RadioBase):
     """The Radio class."""
 
-    def __init__(self: Radio, ip_address: str | None = None) -> None:
+    def __init__(
+        self: Radio,
+        ip_address: str | None = None,
+        rb_base_url: str | None = None,
+        station_ttl: float | None = 24 * 60 * 60,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> None:
         """Initialize the Radio class.
 
         Args:
             ip_address: The IP address of the radio.
+            rb_base_url: The RadioBrowser server, such as "https://de1.api.radio-browser.info/",
+                picked by pyradios when not set.
+            station_ttl: Seconds RadioBrowser stations stay in the on-disk cache,
+                None disables it.
+            **kwargs: Passed to `RadioBase`, such as max_concurrency or catalog_ttl.
         """
-        self.ip_address = ip_address
+        super().__init__(ip_address=ip_address, **kwargs)
+        self.rb_base_url = rb_base_url
+        self.station_ttl = station_ttl
         self.session = requests.Session()
-        self.base_url: str
-        self._favorites: list[Favorite] | None = None
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=self.transport.pool_maxsize,
+            max_retries=0,
+        )
+        self.session.mount("http://", adapter)
         self._countries: dict[tuple[int, int, int], str] | None = None
-        self._genres: Genres = Genres(genres=[])
-        self._locations: Locations = Locations(regions=[])
         self._rb: RadioBrowser | None = None
+        self._watcher: NowPlayingWatcher | None = None
+        # page workers hitting an out of date catalog refetch it once
+        self._catalog_lock = threading.Lock()
 
-    def find(self: Radio) -> bool:
-        """Find a radio."""
-        if self.ip_address:
-            self.base_url = f"http://{self.ip_address}/"
-            return Ture
+    def _send(
+        self: Radio,
+        method: str,
+        url: str,
+        attempt: int,
+        base_url: str | None = None,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> tuple[requests.Response | None, requests.RequestException | None, RequestEvent]:
+        """Send a single request attempt.
 
-        try:
-            self.ip_address = os.environ["SKYTUNE_IP_ADDRESS"]
-            logger.debug("Using SKYTUNE_IP_ADDRESS: %s", self.ip_address)
-        except KeyError:
-            pass
-        else:
-            self.base_url = f"http://{self.ip_address}/"
-            return True
+        Args:
+            method: The HTTP method.
+            url: The URL, relative to the radio.
+            attempt: The attempt number, starting at 1.
+            base_url: The server the URL is relative to, the radio when not set.
+            **kwargs: Passed to the session.
 
+        Returns:
+            The response or the error, and the attempt's request event.
+        """
+        start = time.perf_counter()
         try:
-            self.ip_address = socket.gethostbyname("skytune")
-            logger.debug("Using DNS skytune: %s", self.ip_address)
-        except socket.gaierror:
-            pass
-        else:
-            self.base_url = f"http://{self.ip_address}/"
-            return True
-
-        s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        s.settimeout(1.0)
-        message = (
-            "M-SEARCH * HTTP/1.1\r\n"
-            "HOST:239.255.255.250:1900\r\n"
-            "ST:urn:schemas-upnp-org:device:InternetRadio:1\r\n"
-            "MX:10\r\n"
-            'MAN:"ssdp:discover"\r\n'
-            "\r\n"
+            res = self.session.request(
+                method,
+                f"{base_url or self.base_url}{url}",
+                timeout=(self.transport.connect_timeout, self.transport.read_timeout),
+                **kwargs,
+            )
+        except requests.exceptions.RequestException as exc:
+            event = RequestEvent(
+                endpoint=url,
+                method=method,
+                elapsed=time.perf_counter() - start,
+                attempt=attempt,
+                error=type(exc).__name__,
+            )
+            return None, exc, event
+        body = res.request.body or b""
+        event = RequestEvent(
+            endpoint=url,
+            method=method,
+            elapsed=time.perf_counter() - start,
+            status=res.status_code,
+            bytes_sent=len(res.request.url or "") + len(body),
+            bytes_received=len(res.content),
+            attempt=attempt,
+            error=f"HTTP {res.status_code}" if res.status_code >= HTTP_ERROR else None,
         )
-        s.sendto(message.encode(), ("239.255.255.250", 1900))
-        try:
-            while True:
-                _data, addr = s.recvfrom(8192)
-                self.ip_address = addr[0]
-                break
-        except socket.timeout:
-            pass
-        else:
-            self.base_url = f"http://{self.ip_address}/"
+        return res, None, event
+
+    def _retryable(
+        self: Radio,
+        res: requests.Response | None,
+        exc: requests.RequestException | None,
+        idempotent: bool,
+    ) -> bool:
+        """Check whether a failed attempt may be retried.
+
+        Args:
+            res: The response, if any.
+            exc: The error, if any.
+            idempotent: Whether the request is read-only.
+
+        Returns:
+            Whether to retry.
+        """
+        if exc is None:
+            statuses = self.transport.retry_statuses
+            return idempotent and res is not None and res.status_code in statuses
+        if idempotent:
+            return isinstance(exc, (requests.Timeout, requests.ConnectionError))
+        if isinstance(exc, requests.exceptions.ConnectTimeout):
             return True
+        reason = getattr(exc.args[0], "reason", None) if exc.args else None
+        return isinstance(reason, urllib3.exceptions.NewConnectionError)
 
-        return False
-      
+    def _request(
+        self: Radio,
+        method: str,
+        url: str,
+        idempotent: bool = True,
+        base_url: str | None = None,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> requests.Response:
+        """Send a request, retrying failures as the transport allows.
+
+        Args:
+            method: The HTTP method.
+            url: The URL, relative to the radio.
+            idempotent: Whether the request is read-only and safe to resend.
+            base_url: The server the URL is relative to, the radio when not set.
+            **kwargs: Passed to the session.
 
+        Returns:
+            The response.
 
+        Raises:
+            RadioConnectionError: When the radio could not be reached.
+            RadioTimeoutError: When the radio did not answer in time.
+            RadioResponseError: When the radio answered with an HTTP error.
+        """
+        started = time.monotonic()
+        attempts = 0
+        while True:
+            attempts += 1
+            res, exc, event = self._send(method, url, attempts, base_url, **kwargs)
+            delay = None
+            if event.error is not None and self._retryable(res, exc, idempotent):
+                delay = self.transport.retry_delay(attempts, started)
+            event.retrying = delay is not None
+            self.request_stats.record(event)
+            if delay is None:
+                break
+            logger.warning(
+                "%s %s failed (%s), retrying in %.2fs", method, url, event.error, delay,
+            )
+            time.sleep(delay)
+        # an attempt without a response failed with exc
+        if res is None:
+            raise self._give_up(
+                url,
+                attempts,
+                str(exc) or type(exc).__name__,
+                timeout=isinstance(exc, requests.exceptions.Timeout),
+                idempotent=idempotent,
+            ) from exc
+        if res.status_code >= HTTP_ERROR:
+            if not idempotent:
+                self._favorites = None
+            msg = f"{url} returned HTTP {res.status_code}"
+            raise RadioResponseError(msg, url=url, status=res.status_code)
+        return res
 
-    def _get(self: Radio, url: str, params: dict) -> requests.Response:
+    def _get(self: Radio, url: str, params: dict, idempotent: bool = True) -> requests.Response:
         """Get the URL."""
-        try:
-            res = self.session.get(f"{self.base_url}{url}", params=params, timeout=5)
-        except (requests.exceptions.ReadTimeout, requests.exceptions.ConnectionError):
-            logger.exception("Timeout getting %s, retrying", url)
-            try:
-                res = self.session.get(f"{self.base_url}{url}", params=params, timeout=5)
-            except (requests.exceptions.ReadTimeout, requests.exceptions.ConnectionError):
-                logger.exception("Timeout getting %s, giving up", url)
-                sys.exit(1)
-        return res
+        return self._request("GET", url, idempotent=idempotent, params=params)
 
     def _post(self: Radio, url: str, data: dict, params: dict) -> requests.Response:
         """Post the URL."""
-        return self.session.post(f"{self.base_url}{url}", data=data, params=params)
-
-    def _parse_favorite_page(self: Radio, page: str) -> tuple[list[Favorite], FavDetails]:
-        """Parse the favorite page."""
-        # pylint: disable=too-many-locals
-        lines = page.split("\n")
-        # remove initial favListInfo
-        lines = lines[1:-1]
-        fav_list_line = next(line for line in lines if line.startswith("favListInfo = "))
-        match = RE_FAV.match(fav_list_line)
-        if not match:
-            err = f"Could not parse favListInfo: {fav_list_line}"
-            raise ValueError(err)
-        fav_details = FavDetails(**{k: int(v) for k, v in match.groupdict().items()})
-        favorites = []
-        for line in lines:
-            if line.startswith("myFavChannelList.push"):
-                match = RE_CHANNEL.match(line)
-                if not match:
-                    err = f"Could not parse myFavChannelList: {line}"
-                    raise ValueError(err)
-                favorite = match.groupdict()
-                l1, l2, l3 = tuple(int(x) for x in favorite["location"].split(",", maxsplit=2))
-                location = (l1, l2, l3)
-                location_str = (
-                    "Unknown"
-                    if location == (-1, -1, -1)
-                    else self.locations.find_by_uid(location).name
-                )
-                g1, g2 = tuple(int(x) for x in favorite["genre"].split(",", maxsplit=1))
-                genre = (g1, g2)
-                genre_str = "Unknown" if genre == (-1, -1) else self.genres.find_by_uid(genre).name
-                skytune_maintained = bool(int(favorite["skytune_maintained"]))
-
-                favorites.append(
-                    Favorite(
-                        name=favorite["name"],
-                        url=favorite["url"],
-                        skytune_maintained=skytune_maintained,
-                        location=location_str,
-                        genre=genre_str,
-                    ),
-                )
-        return favorites, fav_details
+        return self._request("POST", url, idempotent=False, data=data, params=params)
+
+    def _get_favorite_page(self: Radio, page: int) -> list[Favorite]:
+        """Get a single page of favorites.
+
+        Args:
+            page: The page number.
+
+        Returns:
+            The favorites on the page.
+        """
+        logger.debug("Getting favorites: page %s", page)
+        params = {"PG": page, "EX": 0}
+        res = self._get(url="php/favList.php", params=params)
+        _locations = self.locations
+        favorites, _ = self._parse_page(res.text)
+        return favorites
 
     def _get_favorites(self: Radio) -> None:
         """Get the favorites."""
+        self._favorites = None
+        for _favorite in self.iter_favorites():
+            pass
+
+    def _get_first_page(self: Radio) -> tuple[list[Favorite], FavDetails]:
+        """Get page 0, which carries the favorites details.
+
+        Returns:
+            The favorites on the page and the details.
+        """
+        # load the catalog once, before the worker threads need it
+        _locations = self.locations
         params = {"PG": 0, "EX": 0}
         logger.debug("Getting favorites: page %s", "0")
         res = self._get(url="php/favList.php", params=params)
-        favorites, fav_details = self._parse_favorite_page(res.text)
-        self._favorites = favorites
-        if len(self._favorites) >= fav_details.total:
-            for idx, favorite in enumerate(self._favorites):
-                favorite.uid = idx + 1
+        return self._parse_page(res.text)
+
+    def iter_favorites(self: Radio) -> Iterator[Favorite]:
+        """Iterate over the favorites as each page arrives.
+
+        Page 0 carries the total and the page size, up to `max_concurrency`
+        further pages are fetched ahead and yielded in page order. Breaking
+        out early cancels the pages not yet requested. The favorites are
+        cached once every page has been read.
+
+        Yields:
+            The favorites, in radio order.
+        """
+        if self._favorites is not None:
+            yield from self._favorites
             return
-        total_pages = int(fav_details.total // fav_details.items_per_page)
-        for page in range(1, total_pages + 1):
-            logger.debug("Getting favorites: page %s", page)
-            params = {"PG": page, "EX": 0}
-            res = self._get(url="php/favList.php", params=params)
-            favorites, _ = self._parse_favorite_page(res.text)
-            self._favorites.extend(favorites)
-        for idx, favorite in enumerate(self._favorites):
-            favorite.uid = idx + 1
-        return
-
-    def _load_locations(self: Radio, locations_str: str) -> None:
-        """Get the locations."""
-        locations_str = locations_str.replace("mCountryList = ", "")
-        locations_loaded = json.loads(locations_str)
-        current_country = None
-        for location in locations_loaded:
-            if location[1:4] == [-1, -1, -1]:
-                pass
-            elif location[2:4] == [-1, -1]:
-                logger.debug("Found region: %s", location[4])
-                self._locations.regions.append(Region(name=location[4], countries=[]))
-            elif location[3] == -1:
-                logger.debug("Found country: %s", location[4])
-                current_country = Country(
-                    name=location[4],
-                    region=self._locations.regions[-1],
-                    states_provinces=[],
-                    uid=tuple(location[1:4]),
-                )
-                self._locations.regions[-1].countries.append(current_country)
-            elif location[3] != -1:
-                logger.debug("Found state/province: %s", location[4])
-                if current_country is None:
-                    msg = f"Found state/province without country: {location}"
-                    raise ValueError(msg)
-                sp = StateProvince(
-                    country=current_country,
-                    name=location[4],
-                    region=self._locations.regions[-1],
-                    uid=tuple(location[1:4]),
-                )
-                current_country.states_provinces.append(sp)
-            else:
-                msg = f"Unknown location type: {location}"
-                raise ValueError(msg)
+        yield from self._iter_pages(*self._get_first_page())
 
-    def _load_genres(self: Radio, genres_str: str) -> None:
-        """Get the genres.
+    def _iter_pages(
+        self: Radio,
+        favorites: list[Favorite],
+        fav_details: FavDetails,
+    ) -> Iterator[Favorite]:
+        """Iterate over page 0 and fetch the other pages, see `iter_favorites`.
 
         Args:
-            genres_str: The genres string.
-        """
-        genres_loaded = json.loads(genres_str)
-        for genre in genres_loaded:
-            if genre[1] == -1:
-                logger.debug("Found genre: %s", genre[2])
-                self._genres.genres.append(
-                    Genre(name=genre[2], uid=tuple(genre[0:2]), subgenres=[]),
-                )
-            elif genre[1] != -1:
-                logger.debug("Found subgenre: %s", genre[2])
-                parent_genre = self._genres.find_by_uid((genre[0], -1))
-                if isinstance(parent_genre, SubGenre):
-                    msg = f"Found subgenre with subgenre parent: {genre}"
-                    raise ValueError(msg)
-                subgenre = SubGenre(
-                    genre=parent_genre,
-                    name=genre[2],
-                    uid=tuple(genre[0:2]),
-                )
-                parent_genre.subgenres.append(subgenre)
-            else:
-                msg = f"Unknown genre type: {genre}"
-                raise ValueError(msg)
+            favorites: The favorites on page 0.
+            fav_details: The page 0 details.
+
+        Yields:
+            The favorites, in radio order.
+        """
+        collected: list[Favorite] = []
+        for favorite in favorites:
+            collected.append(favorite)
+            favorite.uid = len(collected)
+            yield favorite
+        if len(favorites) < fav_details.total:
+            total_pages = math.ceil(fav_details.total / fav_details.items_per_page)
+            pages = iter(range(1, total_pages))
+            workers = max(1, min(self.max_concurrency, total_pages - 1))
+            executor = ThreadPoolExecutor(max_workers=workers)
+            pending = deque(
+                executor.submit(self._get_favorite_page, page)
+                for page in itertools.islice(pages, workers)
+            )
+            try:
+                while pending:
+                    page_favorites = pending.popleft().result()
+                    next_page = next(pages, None)
+                    if next_page is not None:
+                        pending.append(executor.submit(self._get_favorite_page, next_page))
+                    for favorite in page_favorites:
+                        collected.append(favorite)
+                        favorite.uid = len(collected)
+                        yield favorite
+            finally:
+                executor.shutdown(wait=False, cancel_futures=True)
+        self._cache_favorites(collected, fav_details)
+
+    def _verify(self: Radio, index: int | None) -> None:
+        """Refetch the page a change touched when verification is on.
+
+        Args:
+            index: The first index the change touched.
+        """
+        page = self._page_of(index)
+        if page is not None:
+            self._check_page(page, self._get_favorite_page(page))
+
+    def _move_favorite(self: Radio, move: Move) -> None:
+        """Send a single move and apply it to the cached favorites.
+
+        Args:
+            move: The move.
+        """
+        self._post(url="moveCh.cgi", data={}, params=move.params)
+        self._verify(self._apply_move(move.source, move.destination))
 
     def _load_locations_genres(self: Radio) -> None:
-        """Get the countries."""
+        """Get the locations and genres, from the on-disk cache when valid."""
+        if self._load_cached_catalog():
+            return
         res = self._get(url="php/get_CG.php", params={})
-        text = res.text
-        text = text.replace("];", "]").replace("'", '"')
-        parts = text.split("mGenreList = ")
-        self._load_locations(parts[0])
-        self._load_genres(parts[1])
+        self._load_catalog(res.text)
+        self._store_catalog(res.text)
+
+    def _parse_page(self: Radio, page: str) -> tuple[list[Favorite], FavDetails]:
+        """Parse a favorites page, refetching a cached catalog it does not match.
+
+        A firmware or catalog update leaves the on-disk catalog without the
+        locations or genres the favorites now use, so a cached catalog is
+        replaced once and the page parsed again.
+
+        Args:
+            page: The favList.php page.
 
-    def add_favorite(  # noqa: PLR0913
+        Returns:
+            The favorites and the page details.
+        """
+        try:
+            return self._parse_favorite_page(page)
+        except ValueError:
+            if not self._catalog_cached:
+                raise
+        with self._catalog_lock:
+            # another page may have refetched it already
+            if self._catalog_cached:
+                logger.warning("The cached catalog does not match the favorites, refetching")
+                res = self._get(url="php/get_CG.php", params={})
+                self._reload_catalog(res.text)
+        return self._parse_favorite_page(page)
+
+    def add_favorite(
         self: Radio,
         name: str,
         url: str,
@@ -265,26 +394,62 @@ class Radio:
             url: The URL of the channel.
             location: The location of the channel.
             genre: The genre of the channel.
-            refresh: Whether to refresh the favorites.
-
+            refresh: Whether to load the favorites when they are not cached yet.
 
         Returns:
-            The new or updated favorite.
+            The new or updated favorite, None when it is not in the favorites after the add.
         """
         if not self._locations.regions:
             self._load_locations_genres()
-        _location = self.locations.find_by_name(location)
-        _genre = self.genres.find_by_name(genre)
+        return self._add(
+            name=name,
+            url=url,
+            location=self.locations.find_by_name(location),
+            genre=self.genres.find_by_name(genre),
+            refresh=refresh,
+        )
+
+    def _add(
+        self: Radio,
+        name: str,
+        url: str,
+        location: Country | StateProvince,
+        genre: Genre | SubGenre,
+        refresh: bool,
+    ) -> Favorite | None:
+        """Add a channel to an already resolved location and genre.
+
+        Args:
+            name: The name of the channel.
+            url: The URL of the channel.
+            location: The location of the channel.
+            genre: The genre of the channel.
+            refresh: Whether to load the favorites when they are not cached yet.
+
+        Returns:
+            The new or updated favorite, None when it is not in the favorites after the add.
+        """
         data = {
             "EX": 0,
             "chName": name,
             "chUrl": url,
-            "chCountry": f"{_location.uid[0]};{_location.uid[1]};{_location.uid[2]}",
-            "chGenre": f"{_genre.uid[0]};{_genre.uid[1]}",
+            "chCountry": f"{location.uid[0]};{location.uid[1]};{location.uid[2]}",
+            "chGenre": f"{genre.uid[0]};{genre.uid[1]}",
         }
         _res = self._post(url="addCh.cgi", data=data, params={})
+        if self._favorites is not None:
+            favorite = Favorite(
+                name=name,
+                url=url,
+                skytune_maintained=False,
+                location=location.name,
+                genre=genre.name,
+            )
+            index = self._apply_add(favorite)
+            if index is not None:
+                self._verify(index)
+                return favorite
         if refresh:
-            self._favorites = None
             try:
                 return next(fav for fav in self.favorites if fav.name == name and fav.url == url)
             except StopIteration:
@@ -293,125 +458,334 @@ class Radio:
                 return None
         return None
 
-    def add_by_rb_uuid(self: Radio, rb_uuid: str, refresh: bool = True) -> Favorite:
-        """Add a channel from radio browser by uuid.
+    def _rb_base_url(self: Radio) -> str:
+        """Get the RadioBrowser server, picking one on first use."""
+        if self.rb_base_url is None:
+            if self._rb is None:
+                # pyradios pulls in httpx, only pay for it when RadioBrowser is used
+                from pyradios import RadioBrowser  # pylint: disable=import-outside-toplevel
+
+                self._rb = RadioBrowser()
+            self.rb_base_url = self._rb.base_url
+        return self.rb_base_url
+
+    def _fetch_stations(self: Radio, uuids: list[str]) -> list[dict]:
+        """Fetch stations from RadioBrowser in a single request.
 
         Args:
-            rb_uuid: The uuid of the channel.
-            refresh: Whether to refresh the favorites.
+            uuids: The station uuids.
+
+        Returns:
+            The station records found.
+
+        Raises:
+            RadioConnectionError: When RadioBrowser could not be reached.
+            RadioResponseError: When RadioBrowser answered with an HTTP error.
+        """
+        from pyradios import RadioBrowser  # pylint: disable=import-outside-toplevel
+
+        logger.debug("Looking up %s station(s) on RadioBrowser", len(uuids))
+        res = self._request(
+            "GET",
+            "json/stations/byuuid",
+            base_url=self._rb_base_url(),
+            params={"uuids": ",".join(uuids)},
+            headers=RadioBrowser.headers,
+        )
+        return res.json()
+
+    def rb_stations(self: Radio, uuids: list[str]) -> dict[str, dict]:
+        """Look up RadioBrowser stations by uuid.
+
+        Stations in the on-disk station cache are not looked up again, the
+        rest are fetched `STATION_BATCH` at a time.
+
+        Args:
+            uuids: The station uuids.
+
+        Returns:
+            The station records keyed by uuid, unknown uuids are left out.
+        """
+        wanted = list(dict.fromkeys(uuids))
+        cache = StationCache(ttl=self.station_ttl) if self.station_ttl is not None else None
+        stations = cache.load(wanted) if cache is not None else {}
+        missing = [uuid for uuid in wanted if uuid not in stations]
+        fetched: list[dict] = []
+        for idx in range(0, len(missing), STATION_BATCH):
+            fetched.extend(self._fetch_stations(missing[idx : idx + STATION_BATCH]))
+        if cache is not None:
+            cache.save(fetched)
+        stations.update((station["stationuuid"], station) for station in fetched)
+        return stations
+
+    @property
+    def location_resolver(self: Radio) -> LocationResolver:
+        """Get the RadioBrowser station location resolver, built once per catalog."""
+        if self._location_resolver is None:
+            self._location_resolver = LocationResolver(self.locations)
+        return self._location_resolver
+
+    def resolve_locations(self: Radio, stations: list[dict]) -> list[Country | StateProvince]:
+        """Map RadioBrowser stations to radio locations.
+
+        Args:
+            stations: The station records, such as RadioBrowser search results.
+
+        Returns:
+            The locations, in station order, see `LocationResolver.resolve`.
+        """
+        return self.location_resolver.resolve_many(stations)
+
+    @property
+    def genre_resolver(self: Radio) -> GenreResolver:
+        """Get the RadioBrowser station genre resolver, built once per catalog."""
+        if self._genre_resolver is None:
+            self._genre_resolver = GenreResolver(self.genres)
+        return self._genre_resolver
+
+    def resolve_genres(self: Radio, stations: list[dict]) -> list[Genre | SubGenre]:
+        """Infer radio genres for RadioBrowser stations from their tags.
+
+        Args:
+            stations: The station records, such as RadioBrowser search results.
+
+        Returns:
+            The genres, in station order, see `GenreResolver.resolve`.
+        """
+        return self.genre_resolver.resolve_many(stations)
+
+    def _add_station(self: Radio, station: dict, refresh: bool) -> Favorite | None:
+        """Add a RadioBrowser station.
+
+        Args:
+            station: The station record.
+            refresh: Whether to load the favorites when they are not cached yet.
 
         Returns:
             The new or updated favorite.
         """
-        if self._rb is None:
-            self._rb = RadioBrowser()
-        station = self._rb.station_by_uuid(stationuuid=rb_uuid)[0]
-        location = None
-        if station["state"]:
-            try:
-                state = next(
-                    (
-                        name
-                        for name, abbr in US_STATES.items()
-                        if station["state"].lower() == abbr.lower()
-                    ),
-                    None,
-                )
-                location = self.locations.find_by_name(state)
-            except ValueError:
-                try:
-                    state = next(
-                        (
-                            name
-                            for name, abbr in US_STATES.items()
-                            if station["state"].split()[1].lower() == abbr.lower()
-                        ),
-                        None,
-                    )
-                    location = self.locations.find_by_name(state)
-                except (ValueError, IndexError):
-                    with contextlib.suppress(ValueError):
-                        location = self.locations.find_by_name(station["state"])
-        if not location:
-            if station["state"]:
-                logger.error("Could not find state: %s", station["state"])
-            try:
-                country = next(
-                    (
-                        alt
-                        for name, alt in COUNTRY_MAP.items()
-                        if station["country"].lower() == name.lower()
-                    ),
-                    None,
-                )
-                location = self.locations.find_by_name(country)
-            except ValueError:
-                with contextlib.suppress(ValueError):
-                    location = self.locations.find_by_name(station["country"])
-        if not location:
-            logger.error("Could not find country: %s", station["country"])
-            location = self.locations.find_by_name("United States")
-        genre = self.genres.find_by_name("Various")
-        return self.add_favorite(
+        # the resolved entries keep their uids, a name may be in the catalog twice
+        return self._add(
             name=station["name"],
             url=station["url_resolved"],
-            location=location.name,
-            genre=genre.name,
-            refresh=True,
+            location=self.location_resolver.resolve(station),
+            genre=self.genre_resolver.resolve(station),
+            refresh=refresh,
         )
 
+    def add_by_rb_uuid(self: Radio, rb_uuid: str, refresh: bool = True) -> Favorite | None:
+        """Add a channel from radio browser by uuid.
+
+        Args:
+            rb_uuid: The uuid of the channel.
+            refresh: Whether to refresh the favorites.
+
+        Returns:
+            The new or updated favorite, None when it is not in the favorites after the add.
+        """
+        return self.add_by_rb_uuids([rb_uuid], refresh=refresh)[0]
+
+    def add_by_rb_uuids(
+        self: Radio,
+        rb_uuids: list[str],
+        refresh: bool = True,
+    ) -> list[Favorite | None]:
+        """Add channels from radio browser by uuid.
+
+        The stations are looked up together before anything is added, see
+        `rb_stations`. Locations and genres are inferred from the station's
+        state, country and tags, see `location_resolver` and `genre_resolver`.
+
+        Args:
+            rb_uuids: The uuids of the channels, in the order to add them.
+            refresh: Whether to load the favorites when they are not cached yet.
+
+        Returns:
+            The new or updated favorites.
+        """
+        stations = self.rb_stations(rb_uuids)
+        missing = [uuid for uuid in rb_uuids if uuid not in stations]
+        if missing:
+            msg = f"Stations not found on RadioBrowser: {', '.join(missing)}"
+            raise ValueError(msg)
+        if refresh:
+            # load once, each add then updates the cached favorites
+            _favorites = self.favorites
+        return [self._add_station(stations[uuid], refresh=refresh) for uuid in rb_uuids]
+
     def delete_favorite(self: Radio, favorite_id: int, refresh: bool = True) -> list[Favorite]:
         """Delete a channel.
 
+        The cached favorites are updated in place rather than refetched.
+
         Args:
             favorite_id: The favorite to delete.
+            refresh: Whether to load the favorites when they are not cached yet.
+
+        Returns:
+            The favorites.
         """
         data = {"CI": favorite_id - 1}
-        _res = self._get(url="delCh.cgi", params=data)
-        if refresh:
-            self._favorites = None
+        _res = self._get(url="delCh.cgi", params=data, idempotent=False)
+        self._verify(self._apply_delete(favorite_id))
+        if self._watcher is not None:
+            self._watcher.poke()
+        if not refresh and self._favorites is None:
+            return []
         return self.favorites
 
     def delete_all_favorites(self: Radio) -> list[Favorite]:
         """Delete all channels."""
         for fav in reversed(self.favorites):
             self.delete_favorite(fav.uid, refresh=False)
-        self._favorites = None
         return self.favorites
 
     def export_favorites(self: Radio, serialization: str = "json") -> str:
-        """Export favorites."""
-        if serialization != "json":
-            msg = f"Unsupported format: {format}"
-            raise RuntimeError(msg)
-        favorites = [fav.json() for fav in self.favorites]
-        return json.dumps(favorites, indent=4)
-
-    def import_favorites(self: Radio, favorites_file: str) -> list[Favorite]:
+        """Export favorites.
+
+        Args:
+            serialization: The format, "json", "ndjson" or "csv".
+
+        Returns:
+            The exported favorites.
+        """
+        stream = io.StringIO()
+        self.export_to(stream, serialization=serialization)
+        return stream.getvalue()
+
+    def export_to(self: Radio, stream: TextIO, serialization: str = "ndjson") -> int:
+        """Export favorites to a stream, each page is written as it arrives.
+
+        Args:
+            stream: The text stream.
+            serialization: The format, "json", "ndjson" or "csv".
+
+        Returns:
+            The number of favorites written.
+        """
+        return write_favorites(self.iter_favorites(), stream, serialization)
+
+    @staticmethod
+    def _read_favorites_file(favorites_file: str) -> list[dict]:
+        """Read an exported favorites file.
+
+        Args:
+            favorites_file: The file to read, "-" for stdin.
+
+        Returns:
+            The favorites as dictionaries.
+
+        Raises:
+            ValueError: When a favorite cannot be read.
+        """
+        favorites = []
+        with open_favorites(favorites_file) as stream:
+            for _line, row in read_favorites(stream):
+                if isinstance(row, RowError):
+                    msg = f"Invalid favorites file {favorites_file}, {row}"
+                    raise ValueError(msg)
+                favorites.append(row)
+        return favorites
+
+    def import_from(
+        self: Radio,
+        stream: TextIO,
+        serialization: str | None = None,
+    ) -> ImportReport:
+        """Import favorites from a stream, adding each one as it is read.
+
+        A favorite that cannot be read or added is logged and reported, and
+        the import carries on with the next one.
+
+        Args:
+            stream: The text stream.
+            serialization: The format, "json", "ndjson" or "csv", None sniffs it.
+
+        Returns:
+            The import report.
+        """
+        report = ImportReport()
+        for line, row in read_favorites(stream, serialization):
+            if isinstance(row, RowError):
+                logger.error("Could not read favorite: %s", row)
+                report.errors.append(row)
+                continue
+            if row["skytune_maintained"]:
+                logger.error("Skipping skytune maintained favorite: %s", row["name"])
+                report.skipped += 1
+                continue
+            logger.debug("Adding favorite: %s", row)
+            try:
+                self.add_favorite(
+                    name=row["name"],
+                    url=row["url"],
+                    location=row["location"],
+                    genre=row["genre"],
+                    refresh=False,
+                )
+            except (SkytuneError, ValueError) as exc:
+                error = RowError(line, f"{row['name']}: {exc}")
+                logger.error("Could not add favorite: %s", error)  # noqa: TRY400
+                report.errors.append(error)
+                continue
+            report.added += 1
+        return report
+
+    def import_favorites(
+        self: Radio,
+        favorites_file: str,
+        serialization: str | None = None,
+    ) -> list[Favorite]:
         """Import favorites.
 
         Args:
-            favorites_file: The file to import.
+            favorites_file: The file to import, "-" for stdin.
+            serialization: The format, None uses the file suffix or sniffs it.
 
         Returns: The favorites.
         """
-        file = Path(favorites_file)
-        if not file.exists():
-            msg = f"File does not exist: {favorites_file}"
-            raise RuntimeError(msg)
-        with file.open(encoding="utf-8") as f:
-            favorites = json.load(f)
-        for fav in favorites:
-            if fav["skytune_maintained"]:
-                logger.error("Skipping skytune maintained favorite: %s", fav["name"])
-                continue
-            fav.pop("skytune_maintained")
-            logger.debug("Adding favorite: %s", fav)
-            self.add_favorite(**fav, refresh=False)
-        self._favorites = None
+        with open_favorites(favorites_file) as stream:
+            report = self.import_from(stream, serialization or format_for(favorites_file))
+        logger.info("Imported %s: %s", favorites_file, report)
         return self.favorites
 
-    def play_favorite(self: Radio, favorite_id: int) -> Favorite:
+    def sync_favorites(self: Radio, favorites_file: str, dry_run: bool = False) -> SyncPlan:
+        """Bring the favorites in line with an exported favorites file.
+
+        Only the deletes, adds and moves needed to reach the file's order are
+        sent, favorites are matched by name and URL.
+
+        Args:
+            favorites_file: The source of truth file.
+            dry_run: Plan the changes without sending them.
+
+        Returns:
+            The sync plan.
+        """
+        target = [Favorite(**fav) for fav in self._read_favorites_file(favorites_file)]
+        plan = plan_sync(self.favorites, target)
+        if dry_run:
+            return plan
+        for fav in plan.skipped:
+            logger.error("Skipping skytune maintained favorite: %s", fav.name)
+        for fav in plan.deletes:
+            logger.debug("Deleting favorite: %s %s", fav.uid, fav.name)
+            self.delete_favorite(fav.uid, refresh=False)
+        for fav in plan.adds:
+            logger.debug("Adding favorite: %s", fav.name)
+            self.add_favorite(
+                name=fav.name,
+                url=fav.url,
+                location=fav.location,
+                genre=fav.genre,
+                refresh=False,
+            )
+        for move in plan.moves.moves:
+            logger.debug("%s", move)
+            self._move_favorite(move)
+        return plan
+
+    def play_favorite(self: Radio, favorite_id: int) -> dict[str, str]:
         """Play a favorite.
 
         Args:
@@ -419,8 +793,21 @@ class Radio:
         """
         data = {"AI": 16, "CI": favorite_id - 1}
         _res = self._get(url="doApi.cgi", params=data)
+        if self._watcher is not None:
+            self._watcher.poke()
         return self.playing
 
+    def plan_sort(self: Radio, reverse: bool = False) -> MovePlan:
+        """Plan a sort of the favorites without moving anything.
+
+        Args:
+            reverse: Whether to sort in descending order.
+
+        Returns:
+            The moves a sort would send, see `MovePlan.move_count`.
+        """
+        return self._sort_plan(self.favorites, reverse=reverse)
+
     def sort_favorites(
         self: Radio,
         reverse: bool = False,
@@ -428,35 +815,58 @@ class Radio:
     ) -> list[Favorite]:
         """Sort the favorites.
 
+        Only the favorites outside the longest already sorted run are moved.
+
         Args:
-            favorites: The favorites to sort.
+            reverse: Whether to sort in descending order.
+            callback: Called with a status message for every move.
+
+        Returns:
+            The sorted favorites.
         """
-        idx = 0
-        if self._favorites is None:
-            self._get_favorites()
-        if self._favorites is None:
-            msg = "Could not get favorites"
-            raise ValueError(msg)
-        sorted_favorites = sorted(self.favorites, key=lambda fav: fav.name.lower())
-        if reverse:
-            sorted_favorites.reverse()
-        while idx < len(self.favorites):
-            process = sorted_favorites[idx]
-            current_idx = self.favorites.index(process)
-            current = self.favorites[current_idx]
-            if idx == current_idx:
-                logger.debug("Skipping %s %s == %s", current.name, idx, current_idx)
-                idx += 1
-                continue
-            status = f"Moving {current.name} to {idx} from {current_idx}"
+        plan = self.plan_sort(reverse=reverse)
+        for move in plan.moves:
+            status = str(move)
             if callback is not None:
                 callback(status)
             logger.debug(status)
-            params = {"CI": current_idx, "DI": idx, "EX": 0}
-            self._post(url="moveCh.cgi", data={}, params=params)
-            self._favorites.insert(idx, self._favorites.pop(current_idx))
-            idx += 1
+            self._move_favorite(move)
+        return self.favorites
+
+    def check_favorites(self: Radio) -> bool:
+        """Check the cached favorites against page 0, in one request.
+
+        The other pages are only refetched when page 0 shows a change, see
+        `_favorites_current`.
+
+        Returns:
+            Whether the cache was current, False when it was refetched or empty.
+        """
+        if self._favorites is None:
+            self._get_favorites()
+            return False
+        page, details = self._get_first_page()
+        if self._favorites_current(page, details):
+            return True
         self._favorites = None
+        for _favorite in self._iter_pages(page, details):
+            pass
+        return False
+
+    def get_favorites(self: Radio, max_age: float | None = None) -> list[Favorite]:
+        """Get the favorites, checking the cache when it is older than `max_age`.
+
+        Long running processes see edits made on the radio itself at the cost
+        of one page 0 request per check, see `check_favorites`.
+
+        Args:
+            max_age: Seconds since the last fetch or check, None trusts the cache forever.
+
+        Returns:
+            The favorites.
+        """
+        if self._favorites_stale(max_age):
+            self.check_favorites()
         return self.favorites
 
     @property
@@ -484,7 +894,8 @@ class Radio:
         data = {"PG": 0, "EX": 0}
         logger.debug("Getting favorites: page %s", "0")
         res = self._get("php/favList.php", data)
-        _stations, fav_details = self._parse_favorite_page(res.text)
+        _locations = self.locations
+        _stations, fav_details = self._parse_page(res.text)
         return fav_details.capacity_dict
 
     @property
@@ -494,7 +905,7 @@ class Radio:
         Returns:
             The genres.
         """
-        if self._genres is not None:
+        if self._genres.genres:
             return self._genres
         self._load_locations_genres()
         return self._genres
@@ -508,7 +919,14 @@ class Radio:
         return self._locations
 
     @property
-    def playing(self: Radio) -> Favorite:
+    def watcher(self: Radio) -> NowPlayingWatcher:
+        """Get the radio's now playing watcher, created on first use and not started."""
+        if self._watcher is None:
+            self._watcher = NowPlayingWatcher(self)
+        return self._watcher
+
+    @property
+    def playing(self: Radio) -> dict[str, str]:
         """Get the currently playing favorite."""
         res = self._get(url="php/playing.php", params={})
         return res.json()
@@ -0,0 +1,305 @@
+"""Map RadioBrowser stations to radio locations and genres."""
+
+from __future__ import annotations
+
+import logging
+import re
+import unicodedata
+
+from typing import TYPE_CHECKING
+
+from .data import COUNTRY_CODES, COUNTRY_MAP, GENRE_TAGS, US_STATES
+from .genre import SubGenre
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+
+    from .genre import Genre, Genres
+    from .locations import Country, Locations, StateProvince
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_COUNTRY = "United States"
+DEFAULT_GENRE = "Various"
+# tag words too generic to say anything about the genre
+STOP_WORDS = frozenset({"and", "fm", "hd", "music", "radio", "station", "the", "am"})
+# a tag naming a genre outright outweighs genres sharing one of its words
+EXACT_WEIGHT = 3.0
+WORD_WEIGHT = 1.0
+RE_PUNCTUATION = re.compile(r"[^\w\s]")
+
+
+def name_key(name: str) -> str:
+    """Normalize a place or genre name for lookups.
+
+    Case, accents, punctuation, "&" versus "and" and a leading "The" are ignored,
+    so "Côte D'Ivoire" and "cote d ivoire" share a key.
+
+    Args:
+        name: The name.
+
+    Returns:
+        The lookup key.
+    """
+    decomposed = unicodedata.normalize("NFKD", name.replace("&", " and "))
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    words = RE_PUNCTUATION.sub(" ", stripped.casefold()).split()
+    if len(words) > 1 and words[0] == "the":
+        words = words[1:]
+    return " ".join(words)
+
+
+class LocationResolver:
+    """Resolve RadioBrowser state, country and countrycode values to radio locations.
+
+    The indexes are built once from the radio catalog, `COUNTRY_MAP`,
+    `COUNTRY_CODES` and `US_STATES`, and every distinct combination of values
+    is resolved once, so mapping thousands of search results costs a few
+    dictionary lookups each.
+    """
+
+    def __init__(
+        self: LocationResolver,
+        locations: Locations,
+        default: str | None = DEFAULT_COUNTRY,
+    ) -> None:
+        """Build the indexes.
+
+        Args:
+            locations: The radio catalog locations.
+            default: The location used when nothing matches, None raises instead.
+        """
+        self.locations = locations
+        self._countries: dict[str, Country] = {}
+        self._codes: dict[str, Country] = {}
+        self._states: dict[tuple[tuple[int, int, int], str], StateProvince] = {}
+        self._any_state: dict[str, StateProvince] = {}
+        self._memo: dict[tuple[str, str, str], Country | StateProvince] = {}
+        for region in locations.regions:
+            for country in region.countries:
+                self._countries.setdefault(name_key(country.name), country)
+                for state_province in country.states_provinces:
+                    key = name_key(state_province.name)
+                    self._states.setdefault((country.uid, key), state_province)
+                    self._any_state.setdefault(key, state_province)
+        for alias, name in COUNTRY_MAP.items():
+            found = self._countries.get(name_key(name))
+            if found is not None:
+                self._countries.setdefault(name_key(alias), found)
+        for code, name in COUNTRY_CODES.items():
+            found = self._countries.get(name_key(name))
+            if found is not None:
+                self._codes[code] = found
+        united_states = self._countries.get(name_key("United States"))
+        if united_states is not None:
+            for name, abbr in US_STATES.items():
+                state = self._states.get((united_states.uid, name_key(name)))
+                if state is not None:
+                    self._states.setdefault((united_states.uid, abbr.casefold()), state)
+                    self._any_state.setdefault(abbr.casefold(), state)
+        self._default: Country | StateProvince | None = None
+        if default is not None:
+            try:
+                self._default = locations.find_by_name(default)
+            except ValueError:
+                logger.warning("Default location not in the catalog: %s", default)
+
+    def _find_state(
+        self: LocationResolver,
+        state: str,
+        country: Country | None,
+    ) -> StateProvince | None:
+        """Find a state or province.
+
+        The whole value is tried first, then each word from the last, which
+        catches values such as "Seattle WA".
+
+        Args:
+            state: The RadioBrowser state.
+            country: The station's country, when known states are only looked up within it.
+
+        Returns:
+            The state or province, or None.
+        """
+        key = name_key(state)
+        words = key.split()
+        for candidate in (key, *reversed(words)) if len(words) > 1 else (key,):
+            if country is not None:
+                found = self._states.get((country.uid, candidate))
+            else:
+                found = self._any_state.get(candidate)
+            if found is not None:
+                return found
+        return None
+
+    def _resolve(
+        self: LocationResolver,
+        state: str,
+        country_name: str,
+        code: str,
+    ) -> Country | StateProvince:
+        """Resolve a combination of values, see `resolve`."""
+        country = self._codes.get(code.upper()) or self._countries.get(name_key(country_name))
+        if state:
+            found = self._find_state(state, country)
+            if found is not None:
+                return found
+            logger.warning("Could not find state: %s", state)
+        if country is not None:
+            return country
+        logger.warning("Could not find country: %s (%s)", country_name, code)
+        if self._default is None:
+            msg = f"Could not find location for {state or '-'}, {country_name} ({code})"
+            raise ValueError(msg)
+        return self._default
+
+    def resolve(
+        self: LocationResolver,
+        station: Mapping[str, str | None],
+    ) -> Country | StateProvince:
+        """Resolve a station's location.
+
+        Args:
+            station: The RadioBrowser station record.
+
+        Returns:
+            The state or province when one matches, else the country, else the default.
+        """
+        key = (
+            station.get("state") or "",
+            station.get("country") or "",
+            station.get("countrycode") or "",
+        )
+        try:
+            return self._memo[key]
+        except KeyError:
+            pass
+        location = self._memo[key] = self._resolve(*key)
+        return location
+
+    def resolve_many(
+        self: LocationResolver,
+        stations: Iterable[Mapping[str, str | None]],
+    ) -> list[Country | StateProvince]:
+        """Resolve the locations of many stations.
+
+        Args:
+            stations: The RadioBrowser station records.
+
+        Returns:
+            The locations, in station order.
+        """
+        return [self.resolve(station) for station in stations]
+
+
+class GenreResolver:
+    """Infer radio genres from RadioBrowser station tags.
+
+    A tag naming a genre or subgenre, directly or through `GENRE_TAGS`, scores
+    `EXACT_WEIGHT` for its genre, and each tag word found in genre or subgenre
+    names scores `WORD_WEIGHT`, shared between the genres using that word. The
+    best scoring genre wins, narrowed to its best subgenre when a tag named one,
+    and "Various" is used when nothing matches. Every distinct tag list is
+    scored once.
+    """
+
+    def __init__(
+        self: GenreResolver,
+        genres: Genres,
+        default: str | None = DEFAULT_GENRE,
+    ) -> None:
+        """Build the indexes.
+
+        Args:
+            genres: The radio catalog genres.
+            default: The genre used when no tag matches, None raises instead.
+        """
+        self.genres = genres
+        # entries are kept with their genre's catalog position
+        self._names: dict[str, tuple[int, Genre | SubGenre]] = {}
+        self._words: dict[str, list[int]] = {}
+        self._memo: dict[str, Genre | SubGenre] = {}
+        for idx, genre in enumerate(genres.genres):
+            entries: tuple[Genre | SubGenre, ...] = (genre, *genre.subgenres)
+            for entry in entries:
+                key = name_key(entry.name)
+                self._names.setdefault(key, (idx, entry))
+                for word in set(key.split()) - STOP_WORDS:
+                    self._words.setdefault(word, []).append(idx)
+        for tag, name in GENRE_TAGS.items():
+            found = self._names.get(name_key(name))
+            if found is not None:
+                self._names.setdefault(name_key(tag), found)
+        self._default: Genre | SubGenre | None = None
+        if default is not None:
+            try:
+                self._default = genres.find_by_name(default)
+            except ValueError:
+                logger.warning("Default genre not in the catalog: %s", default)
+
+    def _resolve(self: GenreResolver, tags: str) -> Genre | SubGenre:
+        """Score a tag list, see `resolve`."""
+        scores: dict[int, float] = {}
+        first: dict[int, int] = {}
+        named: dict[int, float] = {}
+        subgenres: dict[int, SubGenre] = {}
+        for position, tag in enumerate(tags.split(",")):
+            key = name_key(tag)
+            found = self._names.get(key)
+            if found is not None:
+                idx, entry = found
+                first.setdefault(idx, position)
+                scores[idx] = scores.get(idx, 0.0) + EXACT_WEIGHT
+                if isinstance(entry, SubGenre):
+                    subgenres[id(entry)] = entry
+                    named[id(entry)] = named.get(id(entry), 0.0) + EXACT_WEIGHT
+                continue
+            for word in set(key.split()) - STOP_WORDS:
+                matches = self._words.get(word, ())
+                for idx in matches:
+                    first.setdefault(idx, position)
+                    scores[idx] = scores.get(idx, 0.0) + WORD_WEIGHT / len(matches)
+        if not scores:
+            if self._default is None:
+                msg = f"Could not infer a genre from tags: {tags}"
+                raise ValueError(msg)
+            return self._default
+        # ties go to the genre tagged first, RadioBrowser lists the main tag first
+        best = self.genres.genres[max(scores, key=lambda idx: (scores[idx], -first[idx]))]
+        candidates = [key for key, entry in subgenres.items() if entry.genre is best]
+        if candidates:
+            return subgenres[max(candidates, key=named.__getitem__)]
+        return best
+
+    def resolve(self: GenreResolver, station: Mapping[str, str | None]) -> Genre | SubGenre:
+        """Infer a station's genre.
+
+        Args:
+            station: The RadioBrowser station record, its comma separated tags are used.
+
+        Returns:
+            The best matching genre or subgenre, else the default.
+        """
+        tags = station.get("tags") or ""
+        try:
+            return self._memo[tags]
+        except KeyError:
+            pass
+        genre = self._memo[tags] = self._resolve(tags)
+        return genre
+
+    def resolve_many(
+        self: GenreResolver,
+        stations: Iterable[Mapping[str, str | None]],
+    ) -> list[Genre | SubGenre]:
+        """Infer the genres of many stations.
+
+        Args:
+            stations: The RadioBrowser station records.
+
+        Returns:
+            The genres, in station order.
+        """
+        return [self.resolve(station) for station in stations]
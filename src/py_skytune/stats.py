@@ -0,0 +1,165 @@
+"""Per-endpoint request statistics."""
+
+from __future__ import annotations
+
+import bisect
+import logging
+import threading
+
+from dataclasses import dataclass, field
+from typing import Callable
+
+
+logger = logging.getLogger(__name__)
+
+# Latency bucket upper bounds in seconds, 1ms growing 20% per bucket to ~45s,
+# so percentiles are within a bucket width without keeping every sample.
+BUCKETS = tuple(0.001 * 1.2**idx for idx in range(60))
+
+
+@dataclass
+class RequestEvent:
+    """A single request attempt, as passed to the request hooks."""
+
+    endpoint: str
+    method: str
+    elapsed: float
+    status: int | None = None
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    attempt: int = 1
+    error: str | None = None
+    retrying: bool = False
+
+
+@dataclass
+class EndpointStats:
+    """The counters and latency histogram of one endpoint."""
+
+    requests: int = 0
+    errors: int = 0
+    retries: int = 0
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    total_time: float = 0.0
+    histogram: list[int] = field(default_factory=lambda: [0] * (len(BUCKETS) + 1))
+
+    def add(self: EndpointStats, event: RequestEvent) -> None:
+        """Count a request attempt.
+
+        Args:
+            event: The request attempt.
+        """
+        self.requests += 1
+        self.errors += event.error is not None
+        self.retries += event.retrying
+        self.bytes_sent += event.bytes_sent
+        self.bytes_received += event.bytes_received
+        self.total_time += event.elapsed
+        self.histogram[bisect.bisect_left(BUCKETS, event.elapsed)] += 1
+
+    def percentile(self: EndpointStats, percent: float) -> float:
+        """Get a latency percentile.
+
+        Args:
+            percent: The percentile, 0 to 100.
+
+        Returns:
+            The upper bound of the bucket holding the percentile, in seconds.
+        """
+        if not self.requests:
+            return 0.0
+        rank = max(1, round(self.requests * percent / 100))
+        seen = 0
+        for idx, count in enumerate(self.histogram):
+            seen += count
+            if seen >= rank:
+                return BUCKETS[min(idx, len(BUCKETS) - 1)]
+        return BUCKETS[-1]
+
+    def as_dict(self: EndpointStats) -> dict[str, float]:
+        """Get the statistics as a dictionary."""
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "retries": self.retries,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "total_time": self.total_time,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+        }
+
+
+class RequestStats:
+    """Thread-safe request statistics with pluggable hooks."""
+
+    def __init__(self: RequestStats) -> None:
+        """Initialize the statistics."""
+        self._lock = threading.Lock()
+        self._endpoints: dict[str, EndpointStats] = {}
+        self._hooks: list[Callable[[RequestEvent], None]] = []
+
+    def add_hook(self: RequestStats, hook: Callable[[RequestEvent], None]) -> None:
+        """Call a function after every request attempt.
+
+        Args:
+            hook: Called with the `RequestEvent`.
+        """
+        self._hooks.append(hook)
+
+    def remove_hook(self: RequestStats, hook: Callable[[RequestEvent], None]) -> None:
+        """Stop calling a hook.
+
+        Args:
+            hook: The hook to remove.
+        """
+        self._hooks.remove(hook)
+
+    def record(self: RequestStats, event: RequestEvent) -> None:
+        """Record a request attempt and pass it to the hooks.
+
+        Args:
+            event: The request attempt.
+        """
+        with self._lock:
+            self._endpoints.setdefault(event.endpoint, EndpointStats()).add(event)
+        for hook in self._hooks:
+            try:
+                hook(event)
+            except Exception:
+                logger.exception("Request hook failed: %s", hook)
+
+    def reset(self: RequestStats) -> None:
+        """Clear the statistics, the hooks are kept."""
+        with self._lock:
+            self._endpoints.clear()
+
+    def snapshot(self: RequestStats) -> dict[str, dict[str, float]]:
+        """Get the statistics of every endpoint.
+
+        Returns:
+            The statistics keyed by endpoint.
+        """
+        with self._lock:
+            return {name: stats.as_dict() for name, stats in sorted(self._endpoints.items())}
+
+    def summary(self: RequestStats) -> str:
+        """Get a printable table of the statistics.
+
+        Returns:
+            The table.
+        """
+        lines = [
+            f"{'endpoint':<18} {'reqs':>5} {'errs':>5} {'retry':>5} {'sent':>8} {'recv':>9}"
+            f" {'p50':>8} {'p95':>8} {'p99':>8}",
+        ]
+        for name, stats in self.snapshot().items():
+            lines.append(
+                f"{name:<18} {stats['requests']:>5} {stats['errors']:>5} {stats['retries']:>5}"
+                f" {stats['bytes_sent']:>8} {stats['bytes_received']:>9}"
+                f" {stats['p50'] * 1000:>6.0f}ms {stats['p95'] * 1000:>6.0f}ms"
+                f" {stats['p99'] * 1000:>6.0f}ms",
+            )
+        return "\n".join(lines)
@@ -0,0 +1,73 @@
+"""Timeouts, retries and connection pooling shared by the radio clients."""
+
+from __future__ import annotations
+
+import random
+import time
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class Transport:
+    """How requests to the radio are sent and retried.
+
+    Failed requests are retried with exponential backoff and full jitter
+    until `attempts` is reached or the next attempt would end after
+    `retry_budget` seconds from the first one. Requests that change the
+    radio, such as adds and moves, are only retried when the connection
+    could not be made, since a lost reply does not mean the change was
+    not applied.
+
+    Attributes:
+        connect_timeout: Seconds to wait for the connection.
+        read_timeout: Seconds to wait for the reply once connected.
+        attempts: The maximum number of attempts per request.
+        backoff: The first retry delay ceiling in seconds, doubled per retry.
+        backoff_max: The largest retry delay ceiling in seconds.
+        retry_budget: Seconds a request may take, retries and delays included.
+        retry_statuses: The HTTP statuses retried for read-only requests.
+        pool_maxsize: The number of keep-alive connections kept to the radio.
+        keepalive_expiry: Seconds an idle connection is kept by `AsyncRadio`, the
+            blocking client checks for dropped connections before reuse instead.
+    """
+
+    connect_timeout: float = 3.05
+    read_timeout: float = 10.0
+    attempts: int = 4
+    backoff: float = 0.25
+    backoff_max: float = 4.0
+    retry_budget: float = 30.0
+    retry_statuses: frozenset[int] = frozenset({500, 502, 503, 504})
+    pool_maxsize: int = 8
+    keepalive_expiry: float = 4.0
+
+    def delay(self: Transport, attempt: int) -> float:
+        """Get the delay before the next attempt.
+
+        Args:
+            attempt: The failed attempt, starting at 1.
+
+        Returns:
+            A random delay up to the attempt's backoff ceiling, in seconds.
+        """
+        ceiling = min(self.backoff_max, self.backoff * 2 ** (attempt - 1))
+        return random.uniform(0, ceiling)  # noqa: S311
+
+    def retry_delay(self: Transport, attempt: int, started: float) -> float | None:
+        """Get the delay before the next attempt, if the budget allows one.
+
+        Args:
+            attempt: The failed attempt, starting at 1.
+            started: The `time.monotonic()` of the first attempt.
+
+        Returns:
+            The delay in seconds, or None when the request should not be retried.
+        """
+        if attempt >= self.attempts:
+            return None
+        delay = self.delay(attempt)
+        remaining = self.retry_budget - (time.monotonic() - started) - delay
+        if remaining < self.connect_timeout:
+            return None
+        return delay
@@ -1,15 +1,24 @@
 """A simple Tkinter application for py-skytune."""
 from __future__ import annotations
 
+import itertools
+import queue
 import sys
 import tkinter as tk
 
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
 from tkinter import font, messagebox, ttk
+from typing import TYPE_CHECKING, Any, Callable
 
 from py_skytune.radio import Radio
 
 
+if TYPE_CHECKING:
+    from py_skytune.favorites import Favorite
+
+
 class Ui:
     """Th UI for py-skytune."""
 
@@ -20,6 +29,20 @@ class Ui:
         self._tree: ttk.Treeview
         self._radio: Radio
         self._columns = ("name", "genre", "location")
+        # radio calls run in order on one worker thread, the cached favorites
+        # are not shared between threads; results come back through _tasks
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="skytune-ui")
+        self._tasks: queue.Queue[Callable[[], None]] = queue.Queue()
+        # the rendered rows by iid, in treeview order, see _render_favorites;
+        # favorite uids are positions, so they are kept here and not in the rows
+        self._order: list[str] = []
+        self._rows: dict[str, tuple[str, ...]] = {}
+        self._uids: dict[str, int] = {}
+        self._iids: dict[tuple[str, str, int], str] = {}
+        self._iid_count = itertools.count()
+        self._font: font.Font
+        self._widths: dict[str, int] = {}
+        self._location_names: dict[str, str] = {}
 
     def _setup_ui(self: Ui) -> None:
         """Set up the UI."""
@@ -27,6 +50,7 @@ class Ui:
         icon = tk.PhotoImage(file=Path(__file__).parent / "data" / "icon.png")
         self._root.tk.call("wm", "iconphoto", self._root._w, icon)  # noqa: SLF001
         self._root.title(f"Skytune radio favorites ({self._radio.ip_address})")
+        self._font = font.Font()
 
         self._root.grid_rowconfigure(0, weight=0)
         self._root.grid_rowconfigure(1, weight=1000)
@@ -57,7 +81,10 @@ class Ui:
         self._tree.bind("<Motion>", self._tree_motion)
 
         status_label = ttk.Label(self._root, text="", name="status")
-        status_label.grid(row=3, column=0, columnspan=4, padx=(5, 0), pady=(5, 5), sticky="w")
+        status_label.grid(row=3, column=0, columnspan=2, padx=(5, 0), pady=(5, 5), sticky="w")
+        progress = ttk.Progressbar(self._root, mode="determinate", name="progress")
+        progress.grid(row=3, column=2, columnspan=2, padx=(0, 10), pady=(5, 5), sticky="ew")
+        progress.grid_remove()
 
         self._menu = tk.Menu(self._tree, tearoff=0)
         self._menu.add_command(label="Play", command=self._play)
@@ -69,16 +96,194 @@ class Ui:
         hsb.grid(column=0, row=2, sticky="ew", columnspan=3)
 
         self._tree.heading(0, text="Favorites", command=lambda c=0: self._col_sort(c, 0))
-        self._render_favorites()
+        self.update_status(status="Loading favorites...")
+        self._refresh()
+
+    def _submit(
+        self: Ui,
+        work: Callable[[], Any],
+        done: Callable[[Any], None] | None = None,
+    ) -> None:
+        """Run a radio call on the worker thread.
+
+        Args:
+            work: The radio call.
+            done: Called with the result, on the Tk main loop.
+        """
+        future = self._executor.submit(work)
+        future.add_done_callback(lambda ran: self._tasks.put(partial(self._finish, ran, done)))
+
+    def _finish(self: Ui, future: Future, done: Callable[[Any], None] | None) -> None:
+        """Hand a radio call's result to the UI, on the Tk main loop.
+
+        Args:
+            future: The finished call.
+            done: Called with the result.
+        """
+        try:
+            result = future.result()
+        except Exception as exc:  # noqa: BLE001
+            self._reset_controls()
+            self.update_status(status=f"Error: {exc}")
+            messagebox.showerror("Skytune error", str(exc))
+            return
+        if done is not None:
+            done(result)
+
+    def _drain(self: Ui) -> None:
+        """Run the UI updates queued by the worker and watcher threads."""
+        while True:
+            try:
+                task = self._tasks.get_nowait()
+            except queue.Empty:
+                break
+            task()
+        self._root.after(50, self._drain)
+
+    def _refresh(self: Ui) -> None:
+        """Load the favorites on the worker thread and render them."""
+        self._submit(lambda: self._favorite_rows(self._radio.favorites), self._render_favorites)
+
+    def _reset_controls(self: Ui) -> None:
+        """Enable the add button and hide the progress bar."""
+        self._root.children["add_btn"].configure(state="normal", text="Add")
+        self._root.children["progress"].grid_remove()
+
+    def _show_progress(self: Ui, done: int, total: int, status: str) -> None:
+        """Show the progress of a long operation.
+
+        Args:
+            done: The steps done.
+            total: The number of steps.
+            status: The current step.
+        """
+        progress = self._root.children["progress"]
+        progress.configure(maximum=max(total, 1), value=done)
+        progress.grid()
+        self.update_status(status=f"{status} ({done}/{total})")
+
+    def _measure(self: Ui, text: str) -> int:
+        """Measure the width of a string, once.
+
+        Args:
+            text: The string.
+
+        Returns:
+            The width in pixels.
+        """
+        try:
+            return self._widths[text]
+        except KeyError:
+            width = self._widths[text] = self._font.measure(text)
+            return width
+
+    def _location_name(self: Ui, location: str) -> str:
+        """Get the display name of a favorite's location, once, on the worker thread.
+
+        Args:
+            location: The favorite's location.
+
+        Returns:
+            The display name.
+        """
+        try:
+            return self._location_names[location]
+        except KeyError:
+            name = self._location_names[location] = str(
+                self._radio.locations.find_by_name(location),
+            )
+            return name
 
-    def _render_favorites(self: Ui) -> None:
-        """Add the favorites to the treeview."""
-        self._tree.delete(*self._tree.get_children())
-        favorites = self._radio.favorites
-        for column in self._columns:
+    @staticmethod
+    def _row_keys(favorites: list[Favorite]) -> list[tuple[str, str, int]]:
+        """Key the favorites by station, not position, so rows survive a move.
+
+        Args:
+            favorites: The favorites.
+
+        Returns:
+            A unique key per favorite, in order.
+        """
+        seen: dict[tuple[str, str], int] = {}
+        keys = []
+        for favorite in favorites:
+            station = (favorite.name, favorite.url)
+            seen[station] = seen.get(station, -1) + 1
+            keys.append((*station, seen[station]))
+        return keys
+
+    def _favorite_rows(
+        self: Ui,
+        favorites: list[Favorite],
+    ) -> list[tuple[tuple[str, str, int], int, tuple[str, ...]]]:
+        """Build the rows to show, on the worker thread.
+
+        Location names may need the catalog, which is fetched on first use, and
+        the worker keeps changing the radio's cached favorites, so Tk is only
+        handed these rows.
+
+        Args:
+            favorites: The favorites.
+
+        Returns:
+            The row key, favorite uid and column values of each favorite, in order.
+        """
+        return [
+            (
+                key,
+                favorite.uid,
+                (favorite.name, favorite.genre, self._location_name(favorite.location)),
+            )
+            for key, favorite in zip(self._row_keys(favorites), favorites)
+        ]
+
+    def _render_favorites(
+        self: Ui,
+        favorite_rows: list[tuple[tuple[str, str, int], int, tuple[str, ...]]],
+    ) -> None:
+        """Show the favorites in the treeview.
+
+        The rows are diffed against the ones shown, only rows that were added,
+        removed, moved or changed touch the treeview.
+
+        Args:
+            favorite_rows: The rows, see `_favorite_rows`.
+        """
+        rows: dict[str, tuple[str, ...]] = {}
+        uids: dict[str, int] = {}
+        iids: dict[tuple[str, str, int], str] = {}
+        for key, uid, values in favorite_rows:
+            iid = iids[key] = self._iids.get(key) or f"row{next(self._iid_count)}"
+            rows[iid] = values
+            uids[iid] = uid
+
+        gone = [iid for iid in self._order if iid not in rows]
+        if gone:
+            self._tree.delete(*gone)
+        order = [iid for iid in self._order if iid in rows]
+        for idx, (iid, values) in enumerate(rows.items()):
+            if iid not in self._rows:
+                self._tree.insert("", idx, iid=iid, values=values)
+                order.insert(idx, iid)
+                continue
+            if self._rows[iid] != values:
+                self._tree.item(iid, values=values)
+            if order[idx] != iid:
+                self._tree.move(iid, "", idx)
+                order.remove(iid)
+                order.insert(idx, iid)
+        self._order = order
+        self._rows = rows
+        self._uids = uids
+        self._iids = iids
+
+        for idx, column in enumerate(self._columns):
             max_width = max(
-                [font.Font().measure(favorite.name) for favorite in favorites]
-                + [font.Font().measure(getattr(favorite, column)) for favorite in favorites],
+                (
+                    max(self._measure(values[0]), self._measure(values[idx]))
+                    for values in rows.values()
+                ),
+                default=0,
             )
             self._tree.heading(
                 column,
@@ -87,15 +292,6 @@ class Ui:
             )
             self._tree.column(column, width=max_width, stretch=True)
 
-        for favorite in favorites:
-            values = [
-                favorite.name,
-                favorite.genre,
-                self._radio.locations.find_by_name(favorite.location),
-            ]
-            self._tree.insert("", "end", values=values, tags=(favorite.uid,))
-        self._now_playing()
-
     def _add(self: Ui, event: tk.Event | None = None) -> str:
         """Add a favorite from radio browser.
 
@@ -104,14 +300,18 @@ class Ui:
         """
         add_btn = event.widget.master.children["add_btn"]
         add_box = event.widget.master.children["add_box"]
+        if str(add_btn["state"]) == "disabled":
+            return "break"
         add_btn.configure(state="disabled", text="Adding...")
-        self._root.update()
         uuid = add_box.get()
-        self._radio.add_by_rb_uuid(uuid)
-        self._render_favorites()
-        add_box.delete(0, "end")
-        add_btn.configure(state="normal", text="Add")
-        self._root.update()
+
+        def added(favorite: Favorite) -> None:
+            add_box.delete(0, "end")
+            self._reset_controls()
+            self.update_status(status=f"Added: {favorite.name}")
+            self._refresh()
+
+        self._submit(lambda: self._radio.add_by_rb_uuid(uuid), added)
         return "break"
 
     def _col_sort(self: Ui, col: str, descending: int) -> None:
@@ -130,6 +330,7 @@ class Ui:
         data.sort(reverse=descending)
         for ix, item in enumerate(data):
             self._tree.move(item[1], "", ix)
+        self._order = [item[1] for item in data]
 
         for column in self._tree["columns"]:
             if column != col:
@@ -163,34 +364,38 @@ class Ui:
 
     def _delete(self: Ui) -> None:
         """Delete the selected favorite."""
-        input_id = self._tree.selection()
-        item_id = self._tree.item(input_id, "tag")[0]
-        status = f"Deleting: {self._tree.item(input_id, 'values')[0]}"
-        self.update_status(status=status)
-        self._radio.delete_favorite(int(item_id))
-        self._render_favorites()
-        self._now_playing()
-
-    def _now_playing(self: Ui) -> None:
-        """Show the now playing."""
-        playing = self._radio.playing
-        status = playing["chStatus"].split(": ")[1].capitalize()
-        self.update_status(status=f"{status}: {playing['name']}")
-        self._root.after(3000, self._now_playing)
+        iid = self._tree.selection()[0]
+        uid = self._uids[iid]
+        self.update_status(status=f"Deleting: {self._rows[iid][0]}")
+        self._submit(
+            lambda: self._favorite_rows(self._radio.delete_favorite(uid)),
+            self._render_favorites,
+        )
 
     def _play(self: Ui, event: tk.Event | None = None) -> None:
         """Play the selected favorite."""
-        input_id = self._tree.selection()
-        item_id = self._tree.item(input_id, "tag")[0]
-        self._radio.play_favorite(int(item_id))
-        self._now_playing()
+        uid = self._uids[self._tree.selection()[0]]
+        self._submit(lambda: self._radio.play_favorite(uid))
 
     def _sort(self: Ui, event: tk.Event | None = None) -> None:
-        """Sort the favorites on the radio."""
-        self._radio.sort_favorites(callback=self.update_status)
-        self.update_status(status="Sorted")
-        self._render_favorites()
-        self._now_playing()
+        """Sort the favorites on the radio, showing the progress."""
+        self.update_status(status="Planning the sort...")
+
+        def work() -> list[tuple[tuple[str, str, int], int, tuple[str, ...]]]:
+            total = self._radio.plan_sort().move_count
+            moves = itertools.count(1)
+
+            def moved(status: str) -> None:
+                self._tasks.put(partial(self._show_progress, next(moves), total, status))
+
+            return self._favorite_rows(self._radio.sort_favorites(callback=moved))
+
+        def done(favorite_rows: list[tuple[tuple[str, str, int], int, tuple[str, ...]]]) -> None:
+            self._reset_controls()
+            self.update_status(status="Sorted")
+            self._render_favorites(favorite_rows)
+
+        self._submit(work, done)
 
     def _tree_motion(self: Ui, event: tk.Event) -> None:
         """Highlight the row the mouse is over.
@@ -208,9 +413,7 @@ class Ui:
         Args:
             status: The status to display.
         """
-        self._root.after_cancel(self._now_playing)
         self._root.children["status"].config(text=status)
-        self._root.update()
 
     def run(self: Ui) -> None:
         """Run the UI."""
@@ -221,6 +424,15 @@ class Ui:
                 return
 
         self._setup_ui()
-        self._root.after(3000, self._now_playing)
+        # the watcher polls in its own thread, Tk is only touched from the main loop
+        self._radio.watcher.add_callback(
+            lambda playing: self._tasks.put(partial(self.update_status, status=str(playing))),
+        )
+        self._radio.watcher.start()
+        self._root.after(50, self._drain)
         self._root.minsize(640, 480)
-        self._root.mainloop()
+        try:
+            self._root.mainloop()
+        finally:
+            self._radio.watcher.stop(timeout=1)
+            self._executor.shutdown(wait=False, cancel_futures=True)
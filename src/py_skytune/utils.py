@@ -0,0 +1,15 @@
+"""Small helpers shared across modules."""
+
+from __future__ import annotations
+
+
+def normalize_name(name: str) -> str:
+    """Normalize a name for lookups, ignoring case and repeated whitespace.
+
+    Args:
+        name: The name.
+
+    Returns:
+        The normalized name.
+    """
+    return " ".join(name.casefold().split())
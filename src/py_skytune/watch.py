@@ -0,0 +1,223 @@
+"""Now playing change detection."""
+
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Callable
+
+from .exceptions import SkytuneError
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from types import TracebackType
+
+    from .radio import Radio
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class NowPlaying:
+    """The radio's now playing status, as served by playing.php."""
+
+    status: str
+    name: str
+
+    @classmethod
+    def from_json(cls: type[NowPlaying], playing: dict[str, str]) -> NowPlaying:
+        """Build from the playing.php payload.
+
+        Args:
+            playing: The payload.
+
+        Returns:
+            The now playing status.
+        """
+        return cls(status=playing.get("chStatus", ""), name=playing.get("name", ""))
+
+    @property
+    def state(self: NowPlaying) -> str:
+        """Get the state, such as "Playing", without the "Status: " prefix."""
+        return self.status.partition(": ")[2].capitalize() or self.status
+
+    def __str__(self: NowPlaying) -> str:
+        """Return the string representation."""
+        return f"{self.state}: {self.name}"
+
+
+@dataclass
+class PollInterval:
+    """An adaptive poll interval.
+
+    Polling starts and restarts at `fast` after a change, then slows by
+    `growth` per unchanged poll up to `slow`.
+    """
+
+    fast: float = 1.0
+    slow: float = 15.0
+    growth: float = 1.5
+    current: float = field(init=False)
+
+    def __post_init__(self: PollInterval) -> None:
+        """Start fast."""
+        self.current = self.fast
+
+    def reset(self: PollInterval) -> None:
+        """Poll fast again, after a change."""
+        self.current = self.fast
+
+    def slow_down(self: PollInterval) -> None:
+        """Poll less often, after an unchanged poll or an error."""
+        self.current = min(self.slow, self.current * self.growth)
+
+
+class NowPlayingWatcher:
+    """Poll a radio's now playing status in one background thread.
+
+    Callbacks are called from the watcher thread, only when the status or
+    the name changes. Get the watcher with `Radio.watcher` so a radio is
+    never polled twice.
+    """
+
+    def __init__(
+        self: NowPlayingWatcher,
+        radio: Radio,
+        interval: PollInterval | None = None,
+    ) -> None:
+        """Initialize the watcher.
+
+        Args:
+            radio: The radio to poll.
+            interval: The poll interval, see `PollInterval`.
+        """
+        self.radio = radio
+        self.interval = interval or PollInterval()
+        self.current: NowPlaying | None = None
+        self._callbacks: list[Callable[[NowPlaying], None]] = []
+        # the queues of the running events() iterators, None ends one
+        self._events: set[queue.Queue[NowPlaying | None]] = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def __enter__(self: NowPlayingWatcher) -> NowPlayingWatcher:
+        """Start watching."""
+        self.start()
+        return self
+
+    def __exit__(
+        self: NowPlayingWatcher,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Stop watching."""
+        self.stop()
+
+    def add_callback(self: NowPlayingWatcher, callback: Callable[[NowPlaying], None]) -> None:
+        """Call a function on every change.
+
+        Args:
+            callback: Called with the new `NowPlaying`, from the watcher thread.
+        """
+        with self._lock:
+            self._callbacks.append(callback)
+
+    def remove_callback(self: NowPlayingWatcher, callback: Callable[[NowPlaying], None]) -> None:
+        """Stop calling a callback.
+
+        Args:
+            callback: The callback to remove.
+        """
+        with self._lock:
+            self._callbacks.remove(callback)
+
+    def start(self: NowPlayingWatcher) -> None:
+        """Start the poller thread, unless it is running."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, name="skytune-watch", daemon=True)
+            self._thread.start()
+
+    def stop(self: NowPlayingWatcher, timeout: float | None = None) -> None:
+        """Stop the poller thread and end the `events` iterators.
+
+        Args:
+            timeout: Seconds to wait for a poll in flight to finish.
+        """
+        self._stopping.set()
+        self._wake.set()
+        with self._lock:
+            events = list(self._events)
+        for changes in events:
+            changes.put(None)
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    def poke(self: NowPlayingWatcher) -> None:
+        """Poll now and fast again, such as after playing a favorite."""
+        self.interval.reset()
+        self._wake.set()
+
+    def events(self: NowPlayingWatcher) -> Iterator[NowPlaying]:
+        """Iterate over the changes, starting the watcher if needed.
+
+        The iteration ends when the watcher is stopped.
+
+        Yields:
+            The current status first when known, then every change.
+        """
+        changes: queue.Queue[NowPlaying | None] = queue.Queue()
+        with self._lock:
+            self._events.add(changes)
+        self.add_callback(changes.put)
+        self.start()
+        try:
+            if self.current is not None:
+                yield self.current
+            while True:
+                playing = changes.get()
+                if playing is None:
+                    break
+                yield playing
+        finally:
+            self.remove_callback(changes.put)
+            with self._lock:
+                self._events.discard(changes)
+
+    def _poll(self: NowPlayingWatcher) -> None:
+        """Poll once and report a change."""
+        playing = NowPlaying.from_json(self.radio.playing)
+        if playing == self.current:
+            self.interval.slow_down()
+            return
+        self.current = playing
+        self.interval.reset()
+        with self._lock:
+            callbacks = list(self._callbacks)
+        for callback in callbacks:
+            try:
+                callback(playing)
+            except Exception:
+                logger.exception("Now playing callback failed: %s", callback)
+
+    def _run(self: NowPlayingWatcher) -> None:
+        """Poll until stopped."""
+        while not self._stopping.is_set():
+            self._wake.clear()
+            try:
+                self._poll()
+            except (SkytuneError, ValueError) as exc:
+                logger.warning("Could not get now playing: %s", exc)
+                self.interval.slow_down()
+            self._wake.wait(self.interval.current)
@@ -0,0 +1 @@
+"""Tests for py-skytune."""
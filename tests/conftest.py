@@ -0,0 +1,24 @@
+"""Shared fixtures for the py-skytune tests."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Keep the catalog, station and address caches out of the user's cache.
+
+    Args:
+        tmp_path: The test's temporary directory.
+        monkeypatch: The pytest monkeypatch fixture.
+    """
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    monkeypatch.delenv("SKYTUNE_IP_ADDRESS", raising=False)
+    monkeypatch.delenv("SKYTUNE_SOCKET", raising=False)
@@ -0,0 +1,68 @@
+"""Test the asyncio client against the emulator."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from py_skytune.async_radio import AsyncRadio
+from py_skytune.emulator import Emulator, EmulatorConfig
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+@pytest.fixture(name="emulator")
+def fixture_emulator() -> Iterator[Emulator]:
+    """Serve an emulated radio with slow pages.
+
+    Yields:
+        The running emulator.
+    """
+    with Emulator(EmulatorConfig(favorites=100, latency=0.05)) as emulator:
+        yield emulator
+
+
+def test_iter_favorites(emulator: Emulator) -> None:
+    """Test every page is read in order and cached.
+
+    Args:
+        emulator: The running emulator.
+    """
+
+    async def read() -> tuple[list[str], list[str]]:
+        async with AsyncRadio(emulator.ip_address) as radio:
+            streamed = [favorite.name async for favorite in radio.iter_favorites()]
+            return streamed, [favorite.name for favorite in await radio.favorites()]
+
+    streamed, cached = asyncio.run(read())
+    assert streamed == [favorite.name for favorite in emulator.favorites]
+    assert cached == streamed
+    assert emulator.requests["php/favList.php"] == 10
+
+
+def test_iter_favorites_early_exit(emulator: Emulator) -> None:
+    """Test breaking out early leaves no page task behind.
+
+    Args:
+        emulator: The running emulator.
+    """
+
+    async def first() -> tuple[list[str], set[asyncio.Task]]:
+        names = []
+        async with AsyncRadio(emulator.ip_address, max_concurrency=4) as radio:
+            async with contextlib.aclosing(radio.iter_favorites()) as favorites:
+                async for favorite in favorites:
+                    names.append(favorite.name)
+                    if favorite.uid == 11:
+                        break
+            return names, asyncio.all_tasks() - {asyncio.current_task()}
+
+    names, tasks = asyncio.run(first())
+    assert names == [favorite.name for favorite in emulator.favorites[:11]]
+    assert not tasks
@@ -0,0 +1,65 @@
+"""Test reading and writing exported favorites files."""
+
+from __future__ import annotations
+
+import io
+
+import pytest
+
+from py_skytune.backup import FORMATS, RowError, read_favorites, write_favorites
+from py_skytune.favorites import Favorite
+
+
+FAVORITES = [
+    Favorite(
+        name="Jazz, Live",
+        url="http://stream.example.com/0",
+        skytune_maintained=False,
+        location="Switzerland",
+        genre="Jazz",
+    ),
+    Favorite(
+        name='Say "hi"',
+        url="http://stream.example.com/1",
+        skytune_maintained=True,
+        location="Ontario",
+        genre="Various",
+    ),
+]
+
+
+@pytest.mark.parametrize("serialization", FORMATS)
+def test_round_trip(serialization: str) -> None:
+    """Test every format reads back what it wrote, the format sniffed.
+
+    Args:
+        serialization: The format.
+    """
+    stream = io.StringIO()
+    assert write_favorites(FAVORITES, stream, serialization) == len(FAVORITES)
+    stream.seek(0)
+    rows = [row for _line, row in read_favorites(stream)]
+    assert rows == [favorite.json() for favorite in FAVORITES]
+
+
+def test_row_errors() -> None:
+    """Test bad rows are reported by line and the rest still read."""
+    text = (
+        '{"name": "", "url": "http://a", "skytune_maintained": false,'
+        ' "location": "x", "genre": "y"}\n'
+        "\n"
+        "not json\n"
+        '{"name": "b", "url": "http://b", "skytune_maintained": "no",'
+        ' "location": "x", "genre": "y"}\n'
+    )
+    rows = list(read_favorites(io.StringIO(text)))
+    assert [line for line, _row in rows] == [1, 3, 4]
+    assert isinstance(rows[0][1], RowError)
+    assert isinstance(rows[1][1], RowError)
+    assert rows[2][1] == {
+        "name": "b",
+        "url": "http://b",
+        "skytune_maintained": False,
+        "location": "x",
+        "genre": "y",
+    }
@@ -0,0 +1,151 @@
+"""Test the on-disk catalog cache is replaced when the radio's catalog changes."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from py_skytune.async_radio import AsyncRadio
+from py_skytune.cache import CatalogCache
+from py_skytune.emulator import Emulator, EmulatorConfig
+from py_skytune.radio import Radio
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+CATALOG = "php/get_CG.php"
+
+
+@pytest.fixture(name="emulator")
+def fixture_emulator() -> Iterator[Emulator]:
+    """Serve an emulated radio with three pages of favorites.
+
+    Yields:
+        The running emulator.
+    """
+    with Emulator(EmulatorConfig(favorites=25)) as emulator:
+        yield emulator
+
+
+def add_genre(emulator: Emulator, name: str) -> tuple[int, int]:
+    """Add a genre to the emulated radio's catalog, as a firmware update would.
+
+    Args:
+        emulator: The running emulator.
+        name: The genre name.
+
+    Returns:
+        The genre uid.
+    """
+    uid = (100, -1)
+    head, _sep, tail = emulator.catalog.rpartition("]];")
+    emulator.catalog = f"{head}],[{uid[0]},{uid[1]},'{name}']];{tail}"
+    return uid
+
+
+def make_radio(emulator: Emulator) -> Radio:
+    """Point a radio at the emulator.
+
+    Args:
+        emulator: The running emulator.
+
+    Returns:
+        The radio.
+    """
+    radio = Radio(ip_address=emulator.ip_address)
+    assert radio.find()
+    return radio
+
+
+def test_refetch(emulator: Emulator) -> None:
+    """Test a cached catalog missing a genre is refetched once.
+
+    Args:
+        emulator: The running emulator.
+    """
+    assert {favorite.genre for favorite in make_radio(emulator).favorites} == {"Various"}
+    assert emulator.requests[CATALOG] == 1
+
+    emulator.favorites[-1].genre = add_genre(emulator, "Podcasts")
+    favorites = make_radio(emulator).favorites
+    assert favorites[-1].genre == "Podcasts"
+    assert emulator.requests[CATALOG] == 2
+
+    # the refetched catalog was cached
+    assert make_radio(emulator).favorites[-1].genre == "Podcasts"
+    assert emulator.requests[CATALOG] == 2
+
+
+def test_unknown_uid(emulator: Emulator) -> None:
+    """Test a uid missing from a fresh catalog raises rather than refetching.
+
+    Args:
+        emulator: The running emulator.
+    """
+    emulator.favorites[0].genre = (100, -1)
+    with pytest.raises(ValueError, match="uid"):
+        _favorites = make_radio(emulator).favorites
+    assert emulator.requests[CATALOG] == 1
+
+    # a cached catalog is refetched once, then the miss raises
+    emulator.favorites[0].genre = (1, -1)
+    _favorites = make_radio(emulator).favorites
+    emulator.favorites[0].genre = (100, -1)
+    with pytest.raises(ValueError, match="uid"):
+        _favorites = make_radio(emulator).favorites
+    assert emulator.requests[CATALOG] == 2
+
+
+def test_refetch_async(emulator: Emulator) -> None:
+    """Test the asyncio client refetches a cached catalog missing a genre.
+
+    Args:
+        emulator: The running emulator.
+    """
+
+    async def genres() -> list[str]:
+        async with AsyncRadio(emulator.ip_address) as radio:
+            return [favorite.genre for favorite in await radio.favorites()]
+
+    asyncio.run(genres())
+    emulator.favorites[-1].genre = add_genre(emulator, "Podcasts")
+    assert asyncio.run(genres())[-1] == "Podcasts"
+    assert emulator.requests[CATALOG] == 2
+
+
+def test_renamed_until_refresh(emulator: Emulator) -> None:
+    """Test a renamed entry is only picked up once the cache is bypassed.
+
+    Args:
+        emulator: The running emulator.
+    """
+    _favorites = make_radio(emulator).favorites
+    emulator.catalog = emulator.catalog.replace("'Various'", "'Miscellaneous'")
+    assert make_radio(emulator).favorites[0].genre == "Various"
+    assert emulator.requests[CATALOG] == 1
+
+    radio = Radio(ip_address=emulator.ip_address, refresh_catalog=True)
+    assert radio.find()
+    assert radio.favorites[0].genre == "Miscellaneous"
+    assert emulator.requests[CATALOG] == 2
+
+
+def test_checksum_mismatch(emulator: Emulator) -> None:
+    """Test an edited cache file is refetched rather than parsed.
+
+    Args:
+        emulator: The running emulator.
+    """
+    _favorites = make_radio(emulator).favorites
+    path = CatalogCache(key=emulator.ip_address).path
+    entry = json.loads(path.read_text(encoding="utf-8"))
+    entry["catalog"] = entry["catalog"].replace("'Various'", "'Edited'")
+    path.write_text(json.dumps(entry), encoding="utf-8")
+    assert make_radio(emulator).favorites[0].genre == "Various"
+    assert emulator.requests[CATALOG] == 2
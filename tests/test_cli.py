@@ -0,0 +1,53 @@
+"""Test the CLI in a subprocess against the emulator."""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from py_skytune.emulator import Emulator, EmulatorConfig
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+@pytest.fixture(name="emulator")
+def fixture_emulator() -> Iterator[Emulator]:
+    """Serve an emulated radio with more favorites than a pipe buffers.
+
+    Yields:
+        The running emulator.
+    """
+    with Emulator(EmulatorConfig(favorites=1000, capacity=1000)) as emulator:
+        yield emulator
+
+
+@pytest.mark.parametrize("command", ("favorites", "export -", "export --format csv -"))
+def test_broken_pipe(emulator: Emulator, command: str) -> None:
+    """Test piping into head stops quietly.
+
+    Args:
+        emulator: The running emulator.
+        command: The CLI command.
+    """
+    env = {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join(sys.path),
+        "SKYTUNE_IP_ADDRESS": emulator.ip_address,
+    }
+    result = subprocess.run(
+        f"{sys.executable} -m py_skytune.cli {command} | head -n 1",
+        shell=True,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert len(result.stdout.splitlines()) == 1
+    assert result.stderr == ""
@@ -0,0 +1,142 @@
+"""Test the daemon in a subprocess against the emulator."""
+
+from __future__ import annotations
+
+import os
+import stat
+import subprocess
+import sys
+import time
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from py_skytune.daemon import Daemon, DaemonClient
+from py_skytune.emulator import Emulator, EmulatorConfig
+from py_skytune.exceptions import SkytuneError
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+
+PAGES = "php/favList.php"
+
+
+@pytest.fixture(name="emulator")
+def fixture_emulator() -> Iterator[Emulator]:
+    """Serve an emulated radio with two pages of favorites.
+
+    Yields:
+        The running emulator.
+    """
+    with Emulator(EmulatorConfig(favorites=15)) as emulator:
+        yield emulator
+
+
+@pytest.fixture(name="daemon")
+def fixture_daemon(emulator: Emulator, tmp_path: Path) -> Iterator[subprocess.Popen]:
+    """Run `skytune daemon` for the emulated radio.
+
+    Args:
+        emulator: The running emulator.
+        tmp_path: The test's temporary directory.
+
+    Yields:
+        The daemon process, listening on tmp_path / "skytune.sock".
+    """
+    path = tmp_path / "skytune.sock"
+    env = {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join(sys.path),
+        "SKYTUNE_IP_ADDRESS": emulator.ip_address,
+        "SKYTUNE_SOCKET": str(path),
+    }
+    with subprocess.Popen([sys.executable, "-m", "py_skytune.cli", "daemon"], env=env) as process:
+        deadline = time.monotonic() + 10
+        client = DaemonClient.connect(path)
+        while client is None:
+            assert process.poll() is None
+            assert time.monotonic() < deadline
+            time.sleep(0.05)
+            client = DaemonClient.connect(path)
+        client.close()
+        yield process
+        process.terminate()
+
+
+def test_round_trip(emulator: Emulator, daemon: subprocess.Popen, tmp_path: Path) -> None:
+    """Test commands run in the daemon on a warm radio.
+
+    Args:
+        emulator: The running emulator.
+        daemon: The daemon process.
+        tmp_path: The test's temporary directory.
+    """
+    path = tmp_path / "skytune.sock"
+    assert stat.S_IMODE(path.stat().st_mode) == 0o600
+    client = DaemonClient(path)
+    try:
+        assert client.call("ping") == "pong"
+        rows = client.call("favorites")
+        assert [row[:2] for row in rows] == [
+            [idx, favorite.name] for idx, favorite in enumerate(emulator.favorites, start=1)
+        ]
+        pages = emulator.requests[PAGES]
+        # the favorites are cached in the daemon
+        assert client.call("favorites") == rows
+        assert emulator.requests[PAGES] == pages
+        assert client.call("play", favorite=2)["name"] == "Station 0001"
+        # the watcher was poked and catches up in the background
+        deadline = time.monotonic() + 5
+        while "Station 0001" not in client.call("playing"):
+            assert time.monotonic() < deadline
+            time.sleep(0.05)
+    finally:
+        client.close()
+    assert daemon.poll() is None
+
+
+def test_failed_command(daemon: subprocess.Popen, tmp_path: Path) -> None:
+    """Test a failing command raises in the client and leaves the daemon running.
+
+    Args:
+        daemon: The daemon process.
+        tmp_path: The test's temporary directory.
+    """
+    client = DaemonClient(tmp_path / "skytune.sock")
+    try:
+        with pytest.raises(SkytuneError, match="Unknown command"):
+            client.call("reboot")
+        assert client.call("ping") == "pong"
+    finally:
+        client.close()
+    assert daemon.poll() is None
+
+
+def test_single_daemon(daemon: subprocess.Popen, tmp_path: Path) -> None:
+    """Test a second daemon refuses to take over the socket.
+
+    Args:
+        daemon: The daemon process.
+        tmp_path: The test's temporary directory.
+    """
+    with pytest.raises(SkytuneError, match="already running"):
+        Daemon(tmp_path / "skytune.sock").serve()
+    client = DaemonClient.connect(tmp_path / "skytune.sock")
+    assert client is not None
+    client.close()
+
+
+def test_terminate(daemon: subprocess.Popen, tmp_path: Path) -> None:
+    """Test a terminated daemon removes its socket.
+
+    Args:
+        daemon: The daemon process.
+        tmp_path: The test's temporary directory.
+    """
+    daemon.terminate()
+    assert daemon.wait(10) == 0
+    assert not (tmp_path / "skytune.sock").exists()
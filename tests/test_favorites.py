@@ -0,0 +1,96 @@
+"""Test local changes keep the cached favorites in step with the radio."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from py_skytune.emulator import Emulator, EmulatorConfig
+from py_skytune.radio import Radio
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+@pytest.fixture(name="emulator")
+def fixture_emulator() -> Iterator[Emulator]:
+    """Serve an emulated radio with a full favorites list.
+
+    Yields:
+        The running emulator.
+    """
+    with Emulator(EmulatorConfig(favorites=12, capacity=12)) as emulator:
+        yield emulator
+
+
+def make_radio(emulator: Emulator) -> Radio:
+    """Point a radio at the emulator.
+
+    Args:
+        emulator: The running emulator.
+
+    Returns:
+        The radio.
+    """
+    radio = Radio(ip_address=emulator.ip_address)
+    assert radio.find()
+    return radio
+
+
+def names(favorites: list) -> list[str]:
+    """Get the names of favorites.
+
+    Args:
+        favorites: The favorites, cached or emulated.
+
+    Returns:
+        The names, in order.
+    """
+    return [favorite.name for favorite in favorites]
+
+
+def test_add_to_full(emulator: Emulator) -> None:
+    """Test an add the full radio ignores is not cached.
+
+    Args:
+        emulator: The running emulator.
+    """
+    radio = make_radio(emulator)
+    _favorites = radio.favorites
+    assert radio.add_favorite("Extra", "http://extra", "Switzerland", "Various") is None
+    assert names(radio.favorites) == names(emulator.favorites)
+    assert len(radio.favorites) == 12
+
+
+def test_add_to_stale_full(emulator: Emulator) -> None:
+    """Test an add is found when the radio had room the cache did not know of.
+
+    Args:
+        emulator: The running emulator.
+    """
+    radio = make_radio(emulator)
+    _favorites = radio.favorites
+    # deleted on the front panel
+    emulator.favorites.pop(0)
+    favorite = radio.add_favorite("Extra", "http://extra", "Switzerland", "Various")
+    assert favorite is not None
+    assert favorite.uid == 12
+    assert names(radio.favorites) == names(emulator.favorites)
+
+
+def test_add_with_room(emulator: Emulator) -> None:
+    """Test an add is appended to the cache without a refetch.
+
+    Args:
+        emulator: The running emulator.
+    """
+    radio = make_radio(emulator)
+    radio.delete_favorite(1)
+    pages = emulator.requests["php/favList.php"]
+    favorite = radio.add_favorite("Extra", "http://extra", "Switzerland", "Various")
+    assert favorite is not None
+    assert favorite.uid == 12
+    assert names(radio.favorites) == names(emulator.favorites)
+    assert emulator.requests["php/favList.php"] == pages
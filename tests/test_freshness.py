@@ -0,0 +1,125 @@
+"""Test the cached favorites notice edits made on the radio itself."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from py_skytune.emulator import Emulator, EmulatorConfig
+from py_skytune.radio import Radio
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+PAGES = "php/favList.php"
+
+
+@pytest.fixture(name="emulator")
+def fixture_emulator() -> Iterator[Emulator]:
+    """Serve an emulated radio with three pages of favorites.
+
+    Yields:
+        The running emulator.
+    """
+    with Emulator(EmulatorConfig(favorites=25)) as emulator:
+        yield emulator
+
+
+def make_radio(emulator: Emulator, verify_changes: bool = False) -> Radio:
+    """Point a radio at the emulator and load the favorites.
+
+    Args:
+        emulator: The running emulator.
+        verify_changes: Whether to refetch the page a change touched.
+
+    Returns:
+        The radio.
+    """
+    radio = Radio(ip_address=emulator.ip_address, verify_changes=verify_changes)
+    assert radio.find()
+    _favorites = radio.favorites
+    assert emulator.requests[PAGES] == 3
+    return radio
+
+
+def test_unchanged(emulator: Emulator) -> None:
+    """Test a check of unchanged favorites costs a single page 0 request.
+
+    Args:
+        emulator: The running emulator.
+    """
+    radio = make_radio(emulator)
+    _favorites = radio.get_favorites()
+    assert emulator.requests[PAGES] == 3
+    _favorites = radio.get_favorites(max_age=0)
+    assert emulator.requests[PAGES] == 4
+    # a check resets the age
+    _favorites = radio.get_favorites(max_age=60)
+    assert emulator.requests[PAGES] == 4
+
+
+def test_page_zero_edit(emulator: Emulator) -> None:
+    """Test an edit on page 0 makes a check fetch the other pages again.
+
+    Args:
+        emulator: The running emulator.
+    """
+    radio = make_radio(emulator)
+    emulator.favorites[3].name = "Renamed"
+    assert radio.get_favorites(max_age=60)[3].name == "Station 0003"
+    assert radio.get_favorites(max_age=0)[3].name == "Renamed"
+    assert emulator.requests[PAGES] == 6
+
+
+def test_total_change(emulator: Emulator) -> None:
+    """Test a favorite deleted on a later page changes the total and is noticed.
+
+    Args:
+        emulator: The running emulator.
+    """
+    radio = make_radio(emulator)
+    emulator.favorites.pop(-1)
+    assert len(radio.get_favorites(max_age=0)) == 24
+    assert emulator.requests[PAGES] == 6
+
+
+def test_later_page_edit(emulator: Emulator) -> None:
+    """Test a rename on a later page is not noticed by the page 0 check.
+
+    Args:
+        emulator: The running emulator.
+    """
+    radio = make_radio(emulator)
+    emulator.favorites[-1].name = "Renamed"
+    assert radio.check_favorites()
+    assert radio.favorites[-1].name == "Station 0024"
+
+
+def test_verify_changes(emulator: Emulator) -> None:
+    """Test a verified change drops a cache that differs from the radio.
+
+    Args:
+        emulator: The running emulator.
+    """
+    radio = make_radio(emulator, verify_changes=True)
+    emulator.favorites[0].name = "Renamed"
+    # the page the delete touched did not match, so every page was refetched
+    assert radio.delete_favorite(5)[0].name == "Renamed"
+    assert emulator.requests[PAGES] == 7
+
+
+def test_verify_matching_change(emulator: Emulator) -> None:
+    """Test a verified change that matches the radio keeps the cache.
+
+    Args:
+        emulator: The running emulator.
+    """
+    radio = make_radio(emulator, verify_changes=True)
+    favorites = radio.delete_favorite(15)
+    assert [favorite.name for favorite in favorites] == [
+        favorite.name for favorite in emulator.favorites
+    ]
+    assert emulator.requests[PAGES] == 4
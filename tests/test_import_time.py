@@ -0,0 +1,49 @@
+"""Test the CLI's startup stays within budget, see benchmarks/import_time.py."""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+
+
+# milliseconds importing py_skytune.cli may take, about 40 ms on a laptop
+BUDGET = 100
+# a busy test machine only ever adds time, so the best of a few runs counts
+RUNS = 3
+
+
+def import_cli() -> tuple[float, list[str]]:
+    """Import the CLI in a fresh interpreter with ``-X importtime``.
+
+    Returns:
+        The milliseconds spent importing py_skytune and the modules loaded.
+    """
+    code = "import py_skytune.cli, sys; print(__import__('json').dumps(sorted(sys.modules)))"
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        check=True,
+        env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)},
+        text=True,
+    )
+    total = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _own, cumulative, name = line.removeprefix("import time:").split("|")
+        # nested imports are indented, their time is in their importer's
+        if name.startswith(" py_skytune"):
+            total += int(cumulative)
+    return total / 1000, json.loads(result.stdout)
+
+
+def test_import_time() -> None:
+    """Test the CLI loads neither the HTTP clients nor tkinter, in budget."""
+    runs = [import_cli() for _ in range(RUNS)]
+    for _total, modules in runs:
+        loaded = {"requests", "tkinter", "pyradios"}.intersection(modules)
+        assert not loaded
+    best = min(total for total, _modules in runs)
+    assert best < BUDGET, f"importing py_skytune.cli took {best:.1f} ms"
@@ -0,0 +1,60 @@
+"""Test the move planner."""
+
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from py_skytune.plan import longest_increasing_subsequence, plan_order
+
+
+def apply(order: list[int], moves: list[tuple[int, int, int]]) -> list[int]:
+    """Run moves as the radio's moveCh.cgi does.
+
+    Args:
+        order: For each target position, the current position of its item.
+        moves: The planned moves.
+
+    Returns:
+        The items in their final order.
+    """
+    items = list(range(len(order)))
+    for item, source, destination in moves:
+        assert items[source] == item
+        items.insert(destination, items.pop(source))
+    return items
+
+
+@pytest.mark.parametrize(
+    "order",
+    (
+        [],
+        [0],
+        [0, 1, 2, 3],
+        [3, 2, 1, 0],
+        [1, 2, 3, 0],
+        [3, 0, 1, 2],
+        [0, 3, 1, 4, 2],
+    ),
+)
+def test_plan_order(order: list[int]) -> None:
+    """Test the moves produce the target order, moving each misplaced item once.
+
+    Args:
+        order: For each target position, the current position of its item.
+    """
+    moves = plan_order(order)
+    assert apply(order, moves) == order
+    assert len(moves) == len(order) - len(longest_increasing_subsequence(order))
+
+
+def test_plan_order_random() -> None:
+    """Test shuffles of every size up to a few pages of favorites."""
+    rng = random.Random(0)  # noqa: S311
+    for size in range(60):
+        order = list(range(size))
+        rng.shuffle(order)
+        moves = plan_order(order)
+        assert apply(order, moves) == order
+        assert len(moves) == size - len(longest_increasing_subsequence(order))
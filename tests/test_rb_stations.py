@@ -0,0 +1,226 @@
+"""Test the batched RadioBrowser station lookups against the emulator."""
+
+from __future__ import annotations
+
+import socket
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from py_skytune.emulator import Emulator, EmulatorConfig
+from py_skytune.exceptions import RadioConnectionError, RadioResponseError
+from py_skytune.radio import STATION_BATCH, Radio
+from py_skytune.transport import Transport
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+BYUUID = "json/stations/byuuid"
+
+
+@pytest.fixture(name="emulator")
+def fixture_emulator() -> Iterator[Emulator]:
+    """Serve an emulated radio with 250 RadioBrowser stations.
+
+    Yields:
+        The running emulator.
+    """
+    with Emulator(EmulatorConfig(favorites=5, stations=250, seed=1)) as emulator:
+        yield emulator
+
+
+def make_radio(emulator: Emulator) -> Radio:
+    """Point a radio and its RadioBrowser lookups at the emulator.
+
+    Args:
+        emulator: The running emulator.
+
+    Returns:
+        The radio.
+    """
+    radio = Radio(
+        ip_address=emulator.ip_address,
+        rb_base_url=f"http://{emulator.ip_address}/",
+    )
+    assert radio.find()
+    return radio
+
+
+def test_batches(emulator: Emulator) -> None:
+    """Test uuids are looked up STATION_BATCH at a time.
+
+    Args:
+        emulator: The running emulator.
+    """
+    uuids = list(emulator.stations)
+    stations = make_radio(emulator).rb_stations(uuids)
+    assert list(stations) == uuids
+    assert emulator.requests[BYUUID] == -(-len(uuids) // STATION_BATCH)
+
+
+def test_duplicates(emulator: Emulator) -> None:
+    """Test a repeated uuid is looked up once.
+
+    Args:
+        emulator: The running emulator.
+    """
+    uuid = next(iter(emulator.stations))
+    stations = make_radio(emulator).rb_stations([uuid] * 3)
+    assert list(stations) == [uuid]
+    assert emulator.requests[BYUUID] == 1
+
+
+def test_station_cache(emulator: Emulator) -> None:
+    """Test cached stations are not looked up again, by any radio.
+
+    Args:
+        emulator: The running emulator.
+    """
+    uuids = list(emulator.stations)
+    make_radio(emulator).rb_stations(uuids[:150])
+    assert emulator.requests[BYUUID] == 2
+    stations = make_radio(emulator).rb_stations(uuids[:150])
+    assert len(stations) == 150
+    assert emulator.requests[BYUUID] == 2
+    # only the 100 new stations are fetched, in one batch
+    make_radio(emulator).rb_stations(uuids)
+    assert emulator.requests[BYUUID] == 3
+
+
+def test_station_cache_disabled(emulator: Emulator) -> None:
+    """Test a radio without a station cache looks up every time.
+
+    Args:
+        emulator: The running emulator.
+    """
+    uuids = list(emulator.stations)[:10]
+    radio = Radio(
+        ip_address=emulator.ip_address,
+        rb_base_url=f"http://{emulator.ip_address}/",
+        station_ttl=None,
+    )
+    radio.rb_stations(uuids)
+    radio.rb_stations(uuids)
+    assert emulator.requests[BYUUID] == 2
+
+
+def test_unknown_uuids(emulator: Emulator) -> None:
+    """Test unknown uuids are left out of the lookup and not cached.
+
+    Args:
+        emulator: The running emulator.
+    """
+    known = next(iter(emulator.stations))
+    unknown = "00000000-0000-4000-8000-000000000000"
+    radio = make_radio(emulator)
+    assert list(radio.rb_stations([unknown, known])) == [known]
+    radio.rb_stations([unknown])
+    assert emulator.requests[BYUUID] == 2
+
+
+def test_add_unknown_uuid(emulator: Emulator) -> None:
+    """Test nothing is added when a uuid is unknown.
+
+    Args:
+        emulator: The running emulator.
+    """
+    known = next(iter(emulator.stations))
+    unknown = "00000000-0000-4000-8000-000000000000"
+    with pytest.raises(ValueError, match=unknown):
+        make_radio(emulator).add_by_rb_uuids([known, unknown])
+    assert len(emulator.favorites) == 5
+    assert emulator.requests["addCh.cgi"] == 0
+
+
+def test_add_by_rb_uuids(emulator: Emulator) -> None:
+    """Test stations are added in order after one lookup.
+
+    Args:
+        emulator: The running emulator.
+    """
+    uuids = list(emulator.stations)[:3]
+    radio = make_radio(emulator)
+    favorites = radio.add_by_rb_uuids(uuids)
+    names = [emulator.stations[uuid]["name"] for uuid in uuids]
+    assert [favorite.name for favorite in favorites if favorite] == names
+    assert [favorite.name for favorite in emulator.favorites[-3:]] == names
+    assert emulator.requests[BYUUID] == 1
+    favorite = radio.add_by_rb_uuid(uuids[0])
+    assert favorite is not None
+    assert favorite.name == names[0]
+    # the station came from the cache
+    assert emulator.requests[BYUUID] == 1
+
+
+def test_lookup_unreachable(emulator: Emulator) -> None:
+    """Test an unreachable RadioBrowser is retried and raises a radio error.
+
+    Args:
+        emulator: The running emulator.
+    """
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        host, port = sock.getsockname()
+    radio = Radio(
+        ip_address=emulator.ip_address,
+        rb_base_url=f"http://{host}:{port}/",
+        transport=Transport(attempts=3, backoff=0.01),
+    )
+    with pytest.raises(RadioConnectionError) as exc_info:
+        radio.rb_stations(list(emulator.stations)[:1])
+    assert exc_info.value.attempts == 3
+    stats = radio.stats()[BYUUID]
+    assert stats["requests"] == 3
+    assert stats["retries"] == 2
+
+
+def test_lookup_http_error(emulator: Emulator) -> None:
+    """Test a RadioBrowser HTTP error is retried and raises a radio error.
+
+    Args:
+        emulator: The running emulator.
+    """
+    config = EmulatorConfig(favorites=0, error_rate=1.0, error_status=503)
+    with Emulator(config) as failing:
+        radio = Radio(
+            ip_address=emulator.ip_address,
+            rb_base_url=f"http://{failing.ip_address}/",
+            transport=Transport(attempts=2, backoff=0.01),
+        )
+        with pytest.raises(RadioResponseError) as exc_info:
+            radio.rb_stations(list(emulator.stations)[:1])
+    assert exc_info.value.status == 503
+    assert failing.requests[BYUUID] == 2
+    assert emulator.requests[BYUUID] == 0
+
+
+def test_add_ambiguous_location(emulator: Emulator) -> None:
+    """Test a resolved location keeps its uid when another one shares its name.
+
+    Args:
+        emulator: The running emulator.
+    """
+    uuid = "00000000-0000-4000-8000-000000000001"
+    emulator.stations[uuid] = {
+        "stationuuid": uuid,
+        "name": "Atlanta Radio",
+        "url": "http://stream.example.com/atlanta",
+        "url_resolved": "http://stream.example.com/atlanta",
+        "country": "United States",
+        "countrycode": "US",
+        "state": "Georgia",
+        "tags": "jazz",
+    }
+    radio = make_radio(emulator)
+    country = radio.locations.find_by_name("Georgia")
+    favorite = radio.add_by_rb_uuid(uuid)
+    assert favorite is not None
+    assert favorite.location == "Georgia"
+    # the US state, not the country found first by name
+    state = emulator.favorites[-1].location
+    assert state != country.uid
+    assert radio.locations.find_by_uid(state).name == "Georgia"
+    assert state[:2] == radio.locations.find_by_name("United States").uid[:2]
@@ -0,0 +1,122 @@
+"""Test syncing the favorites with an exported file against the emulator."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from py_skytune.emulator import Emulator, EmulatorConfig
+from py_skytune.radio import Radio
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+
+CHANGES = ("addCh.cgi", "delCh.cgi", "moveCh.cgi")
+
+
+@pytest.fixture(name="emulator")
+def fixture_emulator() -> Iterator[Emulator]:
+    """Serve an emulated radio with three pages of favorites.
+
+    Yields:
+        The running emulator.
+    """
+    with Emulator(EmulatorConfig(favorites=25)) as emulator:
+        yield emulator
+
+
+def make_radio(emulator: Emulator) -> Radio:
+    """Point a radio at the emulator.
+
+    Args:
+        emulator: The running emulator.
+
+    Returns:
+        The radio.
+    """
+    radio = Radio(ip_address=emulator.ip_address)
+    assert radio.find()
+    return radio
+
+
+def export(emulator: Emulator, tmp_path: Path) -> str:
+    """Export the emulated favorites to a file.
+
+    Args:
+        emulator: The running emulator.
+        tmp_path: The test's temporary directory.
+
+    Returns:
+        The file.
+    """
+    path = tmp_path / "favorites.json"
+    path.write_text(make_radio(emulator).export_favorites("json"), encoding="utf-8")
+    return str(path)
+
+
+def changes(emulator: Emulator) -> int:
+    """Count the changes sent to the emulated radio.
+
+    Args:
+        emulator: The running emulator.
+
+    Returns:
+        The number of add, delete and move requests.
+    """
+    return sum(emulator.requests[endpoint] for endpoint in CHANGES)
+
+
+def test_no_drift(emulator: Emulator, tmp_path: Path) -> None:
+    """Test a radio matching the file is left alone.
+
+    Args:
+        emulator: The running emulator.
+        tmp_path: The test's temporary directory.
+    """
+    plan = make_radio(emulator).sync_favorites(export(emulator, tmp_path))
+    assert plan.call_count == 0
+    assert changes(emulator) == 0
+
+
+def test_drift(emulator: Emulator, tmp_path: Path) -> None:
+    """Test a drift of two edits is undone with the planned calls only.
+
+    Args:
+        emulator: The running emulator.
+        tmp_path: The test's temporary directory.
+    """
+    favorites_file = export(emulator, tmp_path)
+    wanted = [favorite.name for favorite in emulator.favorites]
+    # deleted on the front panel, and one moved from the bottom to the top
+    emulator.favorites.pop(3)
+    emulator.favorites.insert(0, emulator.favorites.pop())
+    radio = make_radio(emulator)
+    dry_run = radio.sync_favorites(favorites_file, dry_run=True)
+    assert changes(emulator) == 0
+    plan = radio.sync_favorites(favorites_file)
+    # the add lands at the end, one move puts it back and one fixes the top
+    assert (len(plan.deletes), len(plan.adds), plan.moves.move_count) == (0, 1, 2)
+    assert plan.call_count == dry_run.call_count == 3
+    assert changes(emulator) == 3
+    assert [favorite.name for favorite in emulator.favorites] == wanted
+    assert [favorite.name for favorite in radio.favorites] == wanted
+
+
+def test_extra_and_missing(emulator: Emulator, tmp_path: Path) -> None:
+    """Test favorites missing from the file are deleted and missing ones added.
+
+    Args:
+        emulator: The running emulator.
+        tmp_path: The test's temporary directory.
+    """
+    favorites_file = export(emulator, tmp_path)
+    wanted = [favorite.name for favorite in emulator.favorites]
+    emulator.favorites[10].name = "Renamed"
+    plan = make_radio(emulator).sync_favorites(favorites_file)
+    assert (len(plan.deletes), len(plan.adds), plan.moves.move_count) == (1, 1, 1)
+    assert changes(emulator) == plan.call_count == 3
+    assert [favorite.name for favorite in emulator.favorites] == wanted
@@ -0,0 +1,173 @@
+"""Test requests are retried and fail with typed errors against a faulty emulator."""
+
+from __future__ import annotations
+
+import socket
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from py_skytune.emulator import Emulator, EmulatorConfig
+from py_skytune.exceptions import RadioConnectionError, RadioResponseError, RadioTimeoutError
+from py_skytune.radio import Radio
+from py_skytune.transport import Transport
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+PLAYING = "php/playing.php"
+ADD = "addCh.cgi"
+TRANSPORT = Transport(attempts=3, backoff=0.01, read_timeout=0.5)
+
+
+@pytest.fixture(name="emulator")
+def fixture_emulator() -> Iterator[Emulator]:
+    """Serve an emulated radio.
+
+    Yields:
+        The running emulator.
+    """
+    with Emulator(EmulatorConfig(favorites=3, seed=1)) as emulator:
+        yield emulator
+
+
+def make_radio(emulator: Emulator) -> Radio:
+    """Point a radio at the emulator.
+
+    Args:
+        emulator: The running emulator.
+
+    Returns:
+        The radio.
+    """
+    radio = Radio(ip_address=emulator.ip_address, transport=TRANSPORT)
+    assert radio.find()
+    return radio
+
+
+def test_server_error(emulator: Emulator) -> None:
+    """Test a read is retried on a 5xx until the attempts run out.
+
+    Args:
+        emulator: The running emulator.
+    """
+    radio = make_radio(emulator)
+    emulator.config.error_rate = 1.0
+    with pytest.raises(RadioResponseError) as exc_info:
+        _playing = radio.playing
+    assert exc_info.value.status == 500
+    assert emulator.requests[PLAYING] == 3
+    stats = radio.stats()[PLAYING]
+    assert stats["errors"] == 3
+    assert stats["retries"] == 2
+
+
+def test_recovers(emulator: Emulator) -> None:
+    """Test a read that fails some attempts succeeds on a retry.
+
+    Args:
+        emulator: The running emulator.
+    """
+    radio = Radio(ip_address=emulator.ip_address, transport=Transport(attempts=10, backoff=0.01))
+    assert radio.find()
+    emulator.config.error_rate = 0.5
+    for _ in range(10):
+        assert "chStatus" in radio.playing
+    stats = radio.stats()[PLAYING]
+    assert stats["retries"] > 0
+    assert stats["requests"] == 10 + stats["retries"]
+
+
+def test_client_error(emulator: Emulator) -> None:
+    """Test an HTTP status outside `retry_statuses` is not retried.
+
+    Args:
+        emulator: The running emulator.
+    """
+    radio = make_radio(emulator)
+    emulator.config.error_rate = 1.0
+    emulator.config.error_status = 404
+    with pytest.raises(RadioResponseError):
+        _playing = radio.playing
+    assert emulator.requests[PLAYING] == 1
+
+
+def test_change_not_resent(emulator: Emulator) -> None:
+    """Test a change is not resent after a 5xx and the cached favorites are dropped.
+
+    Args:
+        emulator: The running emulator.
+    """
+    radio = make_radio(emulator)
+    _favorites = radio.favorites
+    emulator.config.error_rate = 1.0
+    with pytest.raises(RadioResponseError):
+        radio.add_favorite("Extra", "http://extra", "Switzerland", "Various")
+    assert emulator.requests[ADD] == 1
+    emulator.config.error_rate = 0.0
+    pages = emulator.requests["php/favList.php"]
+    _favorites = radio.favorites
+    assert emulator.requests["php/favList.php"] > pages
+
+
+def test_dropped_read(emulator: Emulator) -> None:
+    """Test a read whose connection is dropped is retried, then raises.
+
+    Args:
+        emulator: The running emulator.
+    """
+    radio = make_radio(emulator)
+    emulator.config.drop_rate = 1.0
+    with pytest.raises(RadioConnectionError) as exc_info:
+        _playing = radio.playing
+    assert exc_info.value.attempts == 3
+    assert emulator.requests[PLAYING] == 3
+
+
+def test_dropped_change(emulator: Emulator) -> None:
+    """Test a change whose connection is dropped after sending is not resent.
+
+    Args:
+        emulator: The running emulator.
+    """
+    radio = make_radio(emulator)
+    _favorites = radio.favorites
+    emulator.config.drop_rate = 1.0
+    with pytest.raises(RadioConnectionError) as exc_info:
+        radio.add_favorite("Extra", "http://extra", "Switzerland", "Various")
+    assert exc_info.value.attempts == 1
+    assert emulator.requests[ADD] == 1
+
+
+def test_unreachable() -> None:
+    """Test a radio that refuses connections is retried, then raises."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        host, port = sock.getsockname()
+    radio = Radio(ip_address=f"{host}:{port}", transport=TRANSPORT)
+    assert radio.find()
+    with pytest.raises(RadioConnectionError) as exc_info:
+        _playing = radio.playing
+    assert not isinstance(exc_info.value, RadioTimeoutError)
+    assert exc_info.value.attempts == 3
+    assert radio.stats()[PLAYING]["requests"] == 3
+
+
+def test_timeout(emulator: Emulator) -> None:
+    """Test a radio answering too slowly raises a timeout error.
+
+    Args:
+        emulator: The running emulator.
+    """
+    radio = Radio(
+        ip_address=emulator.ip_address,
+        transport=Transport(attempts=2, backoff=0.01, read_timeout=0.05),
+    )
+    assert radio.find()
+    emulator.config.latency = 0.3
+    with pytest.raises(RadioTimeoutError) as exc_info:
+        _playing = radio.playing
+    assert exc_info.value.attempts == 2
@@ -0,0 +1,69 @@
+"""Test the now playing watcher against the emulator."""
+
+from __future__ import annotations
+
+import threading
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from py_skytune.emulator import Emulator, EmulatorConfig
+from py_skytune.radio import Radio
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from py_skytune.watch import NowPlaying
+
+
+@pytest.fixture(name="radio")
+def fixture_radio() -> Iterator[Radio]:
+    """Point a radio at an emulated one.
+
+    Yields:
+        The radio.
+    """
+    with Emulator(EmulatorConfig(favorites=3)) as emulator:
+        radio = Radio(ip_address=emulator.ip_address)
+        assert radio.find()
+        yield radio
+        radio.watcher.stop(timeout=1)
+
+
+def test_events_end_on_stop(radio: Radio) -> None:
+    """Test stopping the watcher ends an iteration blocked on the next change.
+
+    Args:
+        radio: The radio.
+    """
+    seen: list[NowPlaying] = []
+    first = threading.Event()
+
+    def consume() -> None:
+        for playing in radio.watcher.events():
+            seen.append(playing)
+            first.set()
+
+    consumer = threading.Thread(target=consume, daemon=True)
+    consumer.start()
+    assert first.wait(5)
+    radio.watcher.stop(timeout=1)
+    consumer.join(5)
+    assert not consumer.is_alive()
+    assert len(seen) == 1
+
+
+def test_events_report_changes(radio: Radio) -> None:
+    """Test a played favorite shows up as a change.
+
+    Args:
+        radio: The radio.
+    """
+    events = radio.watcher.events()
+    assert "Stopped" in str(next(events))
+    radio.play_favorite(2)
+    assert "Station 0001" in str(next(events))
+    radio.watcher.stop(timeout=1)
+    assert next(events, None) is None